@@ -21,13 +21,11 @@ class RegisterSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        user = User.objects.create(
+        return User.objects.create_user(
             username=validated_data['username'],
             email=validated_data.get('email', ''),
+            password=validated_data['password'],
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', ''),
         )
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
 
@@ -9,7 +9,12 @@ from api.models import (
     BonusQuestion,
     BonusQuestionChoices,
     BonusChoices,
+    BonusQuestionCrowdStats,
     Competition,
+    GameCrowdStats,
+    League,
+    Standing,
+    StandingSnapshot,
     UserBonusAnswer,
 )
 
@@ -22,6 +27,11 @@ admin.site.register(BonusQuestionChoices)
 admin.site.register(BonusChoices)
 admin.site.register(Competition)
 admin.site.register(UserBonusAnswer)
+admin.site.register(Standing)
+admin.site.register(StandingSnapshot)
+admin.site.register(League)
+admin.site.register(GameCrowdStats)
+admin.site.register(BonusQuestionCrowdStats)
 
 @admin.register(Game)
 class GameAdmin(ImportExportModelAdmin):
@@ -0,0 +1,172 @@
+"""
+Async versions of the busiest read endpoints, routed in place of the DRF
+views by the ASGI profile (see peyjabankinn/asgi_urls.py).
+
+Under an ASGI server every sync view runs on the one thread Django keeps
+for sync code, so a slow leaderboard query would hold up every other
+request of that worker. These views answer from process memory and the
+cache on the event loop and reach the database only through the async
+ORM. Queries themselves still run on that sync thread (the async ORM
+wraps it), but memory and cache hits no longer wait behind them.
+
+Only the common cases are handled here: the full leaderboard, the
+schedule, the competitions and the caller. Anything else (pages,
+?since=, ?fields=, leagues, malformed or unknown competitions, writes,
+MessagePack or the browsable API, bad credentials) is passed on to the regular DRF view, so both profiles
+give the same responses.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from accounts.serializers import UserSerializer
+from accounts.views import MeView
+from api import views
+from api.cache import acached_leaderboard, acurrent_version, acurrent_versions
+from api.conditional import etag_matches, make_etag
+from api.reference import acompetition_payload, aschedule_payload
+from api.renderers import ORJSONRenderer
+from api.standings import aleaderboard_rows
+
+User = get_user_model()
+
+INVALID = object()  # credentials were sent but don't authenticate
+
+_renderer = ORJSONRenderer()
+_jwt = JWTAuthentication()
+
+
+def _fallback(view):
+    def call(request):
+        response = view(request)
+        response.render()
+        return response
+
+    return sync_to_async(call)
+
+
+_drf_leaderboard = _fallback(views.leaderboard)
+_drf_matches = _fallback(views.GameViewSet.as_view({"get": "list", "post": "create"}))
+_drf_competitions = _fallback(views.CompetitionViewSet.as_view({"get": "list"}))
+_drf_me = _fallback(MeView.as_view())
+
+
+def _handles(request, params=()):
+    # GET for JSON with no query parameters beyond `params`
+    accept = request.headers.get("Accept", "")
+    return (
+        request.method == "GET"
+        and "msgpack" not in accept
+        and "text/html" not in accept
+        and set(request.GET) <= set(params)
+    )
+
+
+async def _user(request):
+    """
+    The user of the request's bearer token, None without one, or INVALID.
+    """
+    header = request.headers.get("Authorization")
+    if not header:
+        return None
+    raw = _jwt.get_raw_token(header.encode())
+    if raw is None:
+        return None
+    try:
+        token = _jwt.get_validated_token(raw)
+    except AuthenticationFailed:
+        return INVALID
+    user = await User.objects.filter(pk=token.get(jwt_settings.USER_ID_CLAIM), is_active=True).afirst()
+    return user if user is not None else INVALID
+
+
+def _json(data):
+    return HttpResponse(_renderer.render(data), content_type=_renderer.media_type)
+
+
+async def _known_competition(competition_id):
+    # Malformed and unknown ids are answered (400/404) by the DRF view
+    return competition_id.isdigit() and int(competition_id) in (await acompetition_payload()).by_id
+
+
+async def _conditional(request, versions, build):
+    # api.conditional.conditional_response for async views, with the same
+    # ETags as the DRF views produce
+    request.accepted_renderer = _renderer
+    etag = make_etag(request, *versions)
+    if etag_matches(request, etag):
+        response = HttpResponse(status=304)
+    else:
+        response = await build()
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+# --------------------------
+# Views
+# --------------------------
+@csrf_exempt  # like the DRF views they stand in for
+async def leaderboard(request):
+    competition_id = request.GET.get("competition")
+    if (
+        not _handles(request, ("competition",))
+        or (competition_id is not None and not await _known_competition(competition_id))
+        or await _user(request) is INVALID
+    ):
+        return await _drf_leaderboard(request)
+
+    competition_id = int(competition_id) if competition_id is not None else None
+
+    async def build():
+        data, status = await acached_leaderboard(competition_id, aleaderboard_rows)
+        response = _json(data)
+        response["X-Cache"] = status.name
+        response["Server-Timing"] = status.server_timing()
+        return response
+
+    return await _conditional(request, [await acurrent_version(competition_id)], build)
+
+
+@csrf_exempt
+async def matches(request):
+    competition_id = request.GET.get("competition")
+    if (
+        not _handles(request, ("competition",))
+        or (competition_id is not None and not await _known_competition(competition_id))
+        or await _user(request) is INVALID
+    ):
+        return await _drf_matches(request)
+
+    async def build():
+        payload = await aschedule_payload(int(competition_id) if competition_id else None)
+        return _json(payload.items)
+
+    versions = await acurrent_versions(None, views.GameViewSet.etag_scopes)
+    return await _conditional(request, versions, build)
+
+
+@csrf_exempt
+async def competitions(request):
+    if not _handles(request) or await _user(request) in (None, INVALID):
+        return await _drf_competitions(request)
+
+    async def build():
+        return _json((await acompetition_payload()).items)
+
+    versions = await acurrent_versions(None, views.CompetitionViewSet.etag_scopes)
+    return await _conditional(request, versions, build)
+
+
+@csrf_exempt
+async def me(request):
+    user = await _user(request) if _handles(request) else INVALID
+    if user in (None, INVALID):
+        return await _drf_me(request)
+    return _json(UserSerializer(user).data)
@@ -0,0 +1,137 @@
+"""
+Batch upserts for a user's guesses and bonus answers.
+
+A whole group stage is validated against the in-memory lock index
+(api.locks) and written with a single INSERT ... ON CONFLICT (user, match|question)
+DO UPDATE, so double-submits update the existing row instead of raising
+IntegrityError. bulk_create doesn't send post_save, so the standing
+refresh and cache bumps the signals would do happen here, once per
+competition instead of once per item.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from api.cache import bump_version
+from api.locks import get_lock_index
+from api.models import BonusQuestionChoices, UserBonusAnswer, UserGuess
+from api.standings import refresh_user_standing
+
+SAVED = "saved"
+LOCKED = "locked"
+NOT_FOUND = "not_found"
+INVALID = "invalid"
+
+
+def _refresh(user_id, competition_ids):
+    for competition_id in competition_ids - {None}:
+        if refresh_user_standing(user_id, competition_id):
+            transaction.on_commit(lambda cid=competition_id: bump_version(cid))
+        transaction.on_commit(lambda cid=competition_id: bump_version(cid, "guesses"))
+
+
+def _is_open(lock_datetime, now):
+    # Fail open like BeforeObjectDatePermission when no lock is configured
+    return lock_datetime is None or now < lock_datetime
+
+
+def upsert_guesses(user, items):
+    """
+    `items` is a list of {match, guess_home, guess_away} with distinct
+    matches. Returns one {match, status[, guess | error]} per item.
+    """
+    now = timezone.now()
+    locks = get_lock_index().matches
+
+    results, guesses, competition_ids = [], [], set()
+    for item in items:
+        lock = locks.get(item["match"])
+        if lock is None:
+            results.append({"match": item["match"], "status": NOT_FOUND, "error": "Unknown match"})
+        elif not _is_open(lock.at, now):
+            results.append({"match": item["match"], "status": LOCKED, "error": "Guesses are locked for this match"})
+        else:
+            results.append({"match": item["match"], "status": SAVED})
+            guesses.append(UserGuess(
+                user=user,
+                match_id=item["match"],
+                guess_home=item["guess_home"],
+                guess_away=item["guess_away"],
+            ))
+            competition_ids.add(lock.competition_id)
+
+    with transaction.atomic():
+        if guesses:
+            UserGuess.objects.bulk_create(
+                guesses,
+                update_conflicts=True,
+                unique_fields=["user", "match"],
+                update_fields=["guess_home", "guess_away", "updated_at"],
+            )
+        _refresh(user.id, competition_ids)
+
+    saved = {guess.match_id: guess for guess in guesses}
+    for result in results:
+        guess = saved.get(result["match"])
+        if guess is not None:
+            result["guess"] = {
+                "id": guess.id,
+                "match": guess.match_id,
+                "guess_home": guess.guess_home,
+                "guess_away": guess.guess_away,
+            }
+    return results
+
+
+def upsert_bonus_answers(user, items):
+    """
+    `items` is a list of {question, answer} with distinct questions, where
+    answer is a BonusQuestionChoices id of that question (or null).
+    Returns one {question, status[, answer | error]} per item.
+    """
+    now = timezone.now()
+    locks = get_lock_index().questions
+    choices = dict(
+        BonusQuestionChoices.objects.filter(
+            id__in=[item["answer"] for item in items if item["answer"] is not None]
+        ).values_list("id", "question_id")
+    )
+
+    results, answers, competition_ids = [], [], set()
+    for item in items:
+        lock = locks.get(item["question"])
+        if lock is None:
+            results.append({"question": item["question"], "status": NOT_FOUND, "error": "Unknown question"})
+        elif not _is_open(lock.at, now):
+            results.append({
+                "question": item["question"],
+                "status": LOCKED,
+                "error": "Bonus answers are locked once the competition starts.",
+            })
+        elif item["answer"] is not None and choices.get(item["answer"]) != item["question"]:
+            results.append({"question": item["question"], "status": INVALID, "error": "Invalid choice for this question"})
+        else:
+            results.append({"question": item["question"], "status": SAVED})
+            answers.append(UserBonusAnswer(user=user, question_id=item["question"], answer_id=item["answer"]))
+            competition_ids.add(lock.competition_id)
+
+    with transaction.atomic():
+        if answers:
+            UserBonusAnswer.objects.bulk_create(
+                answers,
+                update_conflicts=True,
+                unique_fields=["user", "question"],
+                update_fields=["answer", "updated_at"],
+            )
+        _refresh(user.id, competition_ids)
+
+    saved = {answer.question_id: answer for answer in answers}
+    for result in results:
+        answer = saved.get(result["question"])
+        if answer is not None:
+            result["answer"] = {
+                "id": answer.id,
+                "user": user.id,
+                "question": answer.question_id,
+                "answer": answer.answer_id,
+            }
+    return results
@@ -0,0 +1,230 @@
+"""
+Versioned leaderboard cache with stale-while-revalidate.
+
+Each competition has a version counter in Django's cache that is bumped
+(see api.signals) whenever its standings change. The cached payload
+remembers the version it was built from; when they differ, one worker
+takes a short lock and recomputes while every other request keeps getting
+the previous payload. Works with locmem or file caches locally; across
+gunicorn workers it needs redis or memcached, whose incr and add are
+atomic (settings refuse anything else outside DEBUG).
+"""
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from api.routers import primary_reads
+
+LOCK_TIMEOUT = 30  # seconds a recompute may hold the lock
+
+STAT_NAMES = ("hit", "stale", "miss", "recompute_ms")
+
+
+def _key(kind, competition_id, scope="leaderboard"):
+    return f"{scope}:{kind}:{competition_id or 'all'}"
+
+
+def _incr(key, delta=1, initial=0):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, initial, timeout=None)
+        return cache.incr(key, delta)
+
+
+async def _aincr(key, delta=1, initial=0):
+    try:
+        return await cache.aincr(key, delta)
+    except ValueError:
+        await cache.aadd(key, initial, timeout=None)
+        return await cache.aincr(key, delta)
+
+
+def _incr_version(competition_id, delta, scope):
+    # A missing or evicted counter restarts from a value never used before,
+    # so an old payload can't be mistaken for a fresh one
+    return _incr(_key("version", competition_id, scope), delta, initial=time.time_ns())
+
+
+def current_version(competition_id, scope="leaderboard"):
+    """
+    `scope` is "leaderboard" (standings changed) or "guesses" (any guess
+    or bonus answer changed).
+    """
+    version = cache.get(_key("version", competition_id, scope))
+    if version is None:
+        version = _incr_version(competition_id, 0, scope)
+    return version
+
+
+async def acurrent_versions(competition_id, scopes):
+    """
+    `current_version` of several scopes in one cache round trip.
+    """
+    keys = [_key("version", competition_id, scope) for scope in scopes]
+    found = await cache.aget_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            version = await _aincr(key, 0, initial=time.time_ns())
+        versions.append(version)
+    return versions
+
+
+async def acurrent_version(competition_id, scope="leaderboard"):
+    return (await acurrent_versions(competition_id, [scope]))[0]
+
+
+def bump_version(competition_id, scope="leaderboard"):
+    """
+    Marks data cached for a competition (and for all competitions) as stale.
+    """
+    for cid in {competition_id, None}:
+        _incr_version(cid, 1, scope)
+
+
+@dataclass
+class CacheStatus:
+    name: str
+    version: int
+    lookup_ms: float
+    recompute_ms: float = 0.0
+
+    def server_timing(self):
+        timing = f"cache;desc={self.name};dur={self.lookup_ms:.1f}"
+        if self.recompute_ms:
+            timing += f", recompute;dur={self.recompute_ms:.1f}"
+        return timing
+
+
+def store_payload(competition_id, version, data, scope="leaderboard"):
+    """
+    Stores a payload computed from `version` of the standings, as
+    `cached_leaderboard` does (e.g. one precomputed by a command).
+    """
+    cache.set(_key("payload", competition_id, scope), {"version": version, "data": data}, timeout=None)
+
+
+def stored_payload(competition_id, scope):
+    """
+    Returns (data, CacheStatus) of the stored payload without computing
+    anything, for payloads too slow to build in a request (e.g. one
+    precomputed by a command).
+
+    HIT: the payload matches the current version.
+    STALE: the payload is outdated.
+    MISS: nothing is stored (data is None).
+    """
+    started = time.perf_counter()
+    version = current_version(competition_id)
+    entry = cache.get(_key("payload", competition_id, scope))
+    lookup_ms = (time.perf_counter() - started) * 1000
+
+    if entry is None:
+        _incr(_key("stats:miss", None, scope))
+        return None, CacheStatus("MISS", version, lookup_ms)
+    if entry["version"] == version:
+        _incr(_key("stats:hit", None, scope))
+        return entry["data"], CacheStatus("HIT", version, lookup_ms)
+    _incr(_key("stats:stale", None, scope))
+    return entry["data"], CacheStatus("STALE", entry["version"], lookup_ms)
+
+
+def cached_leaderboard(competition_id, compute, scope="leaderboard"):
+    """
+    Returns (data, CacheStatus) for `compute(competition_id)`.
+
+    HIT: the payload matches the current version.
+    STALE: the payload is outdated but another worker is recomputing it.
+    MISS: this request recomputed the payload.
+
+    `scope` keeps other payloads derived from the standings apart from the
+    leaderboard's, with their own lock and stats. They are all invalidated
+    by the standings version.
+    """
+    started = time.perf_counter()
+    version = current_version(competition_id)
+    payload_key = _key("payload", competition_id, scope)
+    lock_key = _key("lock", competition_id, scope)
+
+    entry = cache.get(payload_key)
+    lookup_ms = (time.perf_counter() - started) * 1000
+
+    if entry is not None and entry["version"] == version:
+        _incr(_key("stats:hit", None, scope))
+        return entry["data"], CacheStatus("HIT", version, lookup_ms)
+
+    locked = cache.add(lock_key, version, timeout=LOCK_TIMEOUT)
+    if entry is not None and not locked:
+        _incr(_key("stats:stale", None, scope))
+        return entry["data"], CacheStatus("STALE", entry["version"], lookup_ms)
+
+    try:
+        compute_started = time.perf_counter()
+        with primary_reads():
+            data = compute(competition_id)
+        recompute_ms = (time.perf_counter() - compute_started) * 1000
+        store_payload(competition_id, version, data, scope)
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+    _incr(_key("stats:miss", None, scope))
+    _incr(_key("stats:recompute_ms", None, scope), round(recompute_ms))
+    cache.set(_key("stats:last_recompute_ms", None, scope), round(recompute_ms, 1), timeout=None)
+
+    return data, CacheStatus("MISS", version, lookup_ms, recompute_ms)
+
+
+async def acached_leaderboard(competition_id, compute):
+    """
+    `cached_leaderboard` for async views: the same entries, lock and
+    counters through the async cache API, with `compute` a coroutine
+    function.
+    """
+    started = time.perf_counter()
+    version = await acurrent_version(competition_id)
+    payload_key = _key("payload", competition_id)
+    lock_key = _key("lock", competition_id)
+
+    entry = await cache.aget(payload_key)
+    lookup_ms = (time.perf_counter() - started) * 1000
+
+    if entry is not None and entry["version"] == version:
+        await _aincr(_key("stats:hit", None))
+        return entry["data"], CacheStatus("HIT", version, lookup_ms)
+
+    locked = await cache.aadd(lock_key, version, timeout=LOCK_TIMEOUT)
+    if entry is not None and not locked:
+        await _aincr(_key("stats:stale", None))
+        return entry["data"], CacheStatus("STALE", entry["version"], lookup_ms)
+
+    try:
+        compute_started = time.perf_counter()
+        with primary_reads():
+            data = await compute(competition_id)
+        recompute_ms = (time.perf_counter() - compute_started) * 1000
+        await cache.aset(payload_key, {"version": version, "data": data}, timeout=None)
+    finally:
+        if locked:
+            await cache.adelete(lock_key)
+
+    await _aincr(_key("stats:miss", None))
+    await _aincr(_key("stats:recompute_ms", None), round(recompute_ms))
+    await cache.aset(_key("stats:last_recompute_ms", None), round(recompute_ms, 1), timeout=None)
+
+    return data, CacheStatus("MISS", version, lookup_ms, recompute_ms)
+
+
+def cache_stats():
+    """
+    Counters shared by every worker using the same cache backend.
+    """
+    stats = {name: cache.get(_key(f"stats:{name}", None)) or 0 for name in STAT_NAMES}
+    stats["last_recompute_ms"] = cache.get(_key("stats:last_recompute_ms", None))
+    lookups = stats["hit"] + stats["stale"] + stats["miss"]
+    stats["hit_ratio"] = round((stats["hit"] + stats["stale"]) / lookups, 3) if lookups else None
+    stats["avg_recompute_ms"] = round(stats["recompute_ms"] / stats["miss"], 1) if stats["miss"] else None
+    return stats
@@ -0,0 +1,41 @@
+"""
+Precompiled bonus-question catalog.
+
+A competition's questions, their choices and correct answers only change
+when staff edit them, so the serialised list is compiled once and stored
+in the cache under the "bonus-questions" version (bumped by api.signals
+on any BonusQuestion, BonusQuestionChoices or BonusChoices change,
+including set_correct and the admin). Reads are a single cache get.
+"""
+from django.core.cache import cache
+
+from api.cache import current_version
+from api.models import BonusQuestion
+from api.routers import primary_reads
+from api.serializers import BonusQuestionSerializer
+
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+
+def compile_catalog(competition_id):
+    questions = (
+        BonusQuestion.objects.filter(competition_id=competition_id)
+        .select_related("correct_choice__choice")
+        .prefetch_related("available_question_choices__choice")
+        .order_by("id")
+    )
+    return list(BonusQuestionSerializer(questions, many=True).data)
+
+
+def bonus_catalog(competition_id):
+    """
+    The serialised questions of a competition, as `bonus-questions/?competition=`
+    returns them.
+    """
+    key = "bonus-catalog:{}:{}".format(competition_id, current_version(None, "bonus-questions"))
+    catalog = cache.get(key)
+    if catalog is None:
+        with primary_reads():
+            catalog = compile_catalog(competition_id)
+        cache.set(key, catalog, timeout=CATALOG_TIMEOUT)
+    return catalog
@@ -0,0 +1,74 @@
+"""
+Conditional GET for read-mostly endpoints.
+
+ETags are derived from cheap version counters kept in the cache (see
+api.cache), bumped by api.signals whenever the underlying models change,
+never from the response body. A request whose If-None-Match matches gets
+a 304 before any query or serializer runs.
+"""
+import hashlib
+
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+from api.cache import current_version
+
+SAFE_CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+def make_etag(request, *versions):
+    """
+    A strong ETag for this URL (path, query and negotiated format) at the
+    given versions.
+    """
+    renderer = getattr(request, "accepted_renderer", None)
+    raw = "|".join(
+        [request.get_full_path(), getattr(renderer, "format", "") or ""] + [str(v) for v in versions]
+    )
+    return '"{}"'.format(hashlib.sha1(raw.encode()).hexdigest())
+
+
+def etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH", "")
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_response(request, etag, build_response):
+    """
+    Returns a 304 if the client already has `etag`, otherwise the result
+    of `build_response()` with the ETag attached.
+    """
+    if request.method not in SAFE_CONDITIONAL_METHODS:
+        return build_response()
+
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build_response()
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    patch_vary_headers(response, ("Accept",))
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag/If-None-Match handling to list and retrieve, versioned by
+    the cache scopes in `etag_scopes`.
+    """
+    etag_scopes = ()
+
+    def get_etag(self, request):
+        return make_etag(request, *(current_version(None, scope) for scope in self.etag_scopes))
+
+    def list(self, request, *args, **kwargs):
+        return conditional_response(
+            request, self.get_etag(request), lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return conditional_response(
+            request, self.get_etag(request), lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
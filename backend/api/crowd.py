@@ -0,0 +1,101 @@
+"""
+Crowd prediction statistics.
+
+Guesses and bonus answers can't change once their lock time has passed
+(BeforeObjectDatePermission), so their aggregates are computed a single
+time after the lock, stored, and served from the stored row afterwards.
+`compute_crowd_stats` precomputes them; otherwise the first request after
+the lock does.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+
+from api.models import (
+    BonusQuestionChoices,
+    BonusQuestionCrowdStats,
+    GameCrowdStats,
+    UserBonusAnswer,
+    UserGuess,
+)
+
+TOP_SCORES = 5
+
+
+def is_locked(lock_datetime):
+    return lock_datetime is not None and timezone.now() >= lock_datetime
+
+
+def compute_game_stats(game):
+    guesses = UserGuess.objects.filter(match=game)
+    complete = guesses.filter(guess_home__isnull=False, guess_away__isnull=False)
+
+    totals = guesses.aggregate(
+        guess_count=Count("id"),
+        avg_home=Avg("guess_home"),
+        avg_away=Avg("guess_away"),
+    )
+    outcomes = complete.aggregate(
+        home_wins=Count("id", filter=Q(guess_home__gt=F("guess_away"))),
+        draws=Count("id", filter=Q(guess_home=F("guess_away"))),
+        away_wins=Count("id", filter=Q(guess_home__lt=F("guess_away"))),
+    )
+    top_scores = [
+        {"score_home": row["guess_home"], "score_away": row["guess_away"], "count": row["count"]}
+        for row in complete.values("guess_home", "guess_away")
+        .annotate(count=Count("id"))
+        .order_by("-count", "guess_home", "guess_away")[:TOP_SCORES]
+    ]
+
+    stats, _ = GameCrowdStats.objects.update_or_create(
+        game=game,
+        defaults={**totals, **outcomes, "top_scores": top_scores},
+    )
+    return stats
+
+
+def compute_question_stats(question):
+    answers = UserBonusAnswer.objects.filter(question=question, answer__isnull=False)
+    counts = dict(answers.values_list("answer_id").annotate(count=Count("id")))
+
+    choices = BonusQuestionChoices.objects.filter(question=question).values_list("id", "choice__choice")
+    distribution = sorted(
+        ({"id": choice_id, "choice": text, "count": counts.get(choice_id, 0)} for choice_id, text in choices),
+        key=lambda row: (-row["count"], row["choice"]),
+    )
+
+    stats, _ = BonusQuestionCrowdStats.objects.update_or_create(
+        question=question,
+        defaults={"answer_count": sum(counts.values()), "distribution": distribution},
+    )
+    return stats
+
+
+def _stored_or_compute(model, lookup, compute, obj):
+    stats = model.objects.filter(**lookup).first()
+    if stats is not None:
+        return stats
+    try:
+        with transaction.atomic():
+            return compute(obj)
+    except IntegrityError:
+        # Another request computed it at the same time
+        return model.objects.get(**lookup)
+
+
+def game_stats(game):
+    """
+    Stored stats for a locked game, or None if it hasn't locked yet.
+    """
+    if not is_locked(game.match_date):
+        return None
+    return _stored_or_compute(GameCrowdStats, {"game": game}, compute_game_stats, game)
+
+
+def question_stats(question):
+    """
+    Stored stats for a locked bonus question, or None if it hasn't locked yet.
+    """
+    if question.competition is None or not is_locked(question.competition.start_date):
+        return None
+    return _stored_or_compute(BonusQuestionCrowdStats, {"question": question}, compute_question_stats, question)
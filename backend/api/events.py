@@ -0,0 +1,183 @@
+"""
+Live events per competition over Server-Sent Events.
+
+`GET competitions/<id>/events/` (served by the ASGI app, see
+peyjabankinn/asgi.py) streams
+
+    event: score      data: {"match": 12, "score_home": 30, "score_away": 28, "leaderboard_version": 7}
+    event: standings  data: {"competition": 3, "leaderboard_version": 7}
+
+Nothing here touches the database per client. Each process runs one
+watcher task per event loop that checks the version counters of the
+competitions someone is listening to (api.cache, bumped by api.signals
+in whichever process saved the result). When the games version moves on,
+the new scores come from the process-local schedule (api.reference,
+patched with one narrow query), so a result costs one query per process.
+Each event is encoded once and the same bytes are queued for every
+subscriber of that competition.
+
+Subscribers that fall SUBSCRIBER_BUFFER events behind are disconnected;
+EventSource reconnects on its own and the page reloads its data.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+
+from api.cache import current_version
+from api.reference import competition_payload, schedule_payload
+
+POLL_INTERVAL = 1.0  # seconds between version checks
+HEARTBEAT_INTERVAL = 15.0  # seconds of silence before a keepalive comment
+RETRY_MS = 3000  # EventSource reconnect delay
+SUBSCRIBER_BUFFER = 64
+
+logger = logging.getLogger(__name__)
+
+
+def encode_event(name, data):
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, competition_id):
+        self.competition_id = competition_id
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+        self.overflowed = False
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Broker:
+    """
+    In-process fan-out from one watcher to every open stream. Used from a
+    single event loop; the watcher restarts if it finds itself on a new one.
+    """
+
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self._watcher = None
+        self._loop = None
+
+    def subscribe(self, competition_id):
+        subscription = Subscription(competition_id)
+        self.subscriptions[competition_id].add(subscription)
+        self._ensure_watcher()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscribers = self.subscriptions.get(subscription.competition_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscriptions[subscription.competition_id]
+
+    def publish(self, competition_id, event):
+        """
+        Queues the encoded `event` for every subscriber of the competition.
+        Returns the number of subscribers it reached.
+        """
+        subscribers = self.subscriptions.get(competition_id, ())
+        for subscription in subscribers:
+            subscription.offer(event)
+        return len(subscribers)
+
+    def _ensure_watcher(self):
+        loop = asyncio.get_running_loop()
+        if self._watcher is None or self._watcher.done() or self._loop is not loop:
+            self._loop = loop
+            self._watcher = loop.create_task(self._watch())
+
+    async def _watch(self):
+        seen = {}
+        while self.subscriptions:
+            for competition_id in list(self.subscriptions):
+                try:
+                    events = await sync_to_async(_changes)(competition_id, seen)
+                except Exception:
+                    # A cache or database hiccup mustn't end the watcher for
+                    # everyone already subscribed; try again next poll
+                    logger.exception("Checking competition %s for events failed", competition_id)
+                    continue
+                for event in events:
+                    self.publish(competition_id, event)
+            for competition_id in set(seen) - set(self.subscriptions):
+                del seen[competition_id]
+            await asyncio.sleep(POLL_INTERVAL)
+
+
+def _changes(competition_id, seen):
+    """
+    Events for what changed in a competition since the previous call,
+    remembering the current state in `seen`.
+    """
+    leaderboard_version = current_version(competition_id)
+    scores = {
+        item["id"]: (item["score_home"], item["score_away"]) for item in schedule_payload(competition_id).items
+    }
+    previous = seen.get(competition_id)
+    seen[competition_id] = (leaderboard_version, scores)
+    if previous is None:
+        return []
+
+    previous_version, previous_scores = previous
+    events = [
+        encode_event("score", {
+            "match": match_id,
+            "score_home": score[0],
+            "score_away": score[1],
+            "leaderboard_version": leaderboard_version,
+        })
+        for match_id, score in scores.items()
+        if previous_scores.get(match_id, score) != score
+    ]
+    if leaderboard_version != previous_version:
+        events.append(encode_event("standings", {
+            "competition": competition_id,
+            "leaderboard_version": leaderboard_version,
+        }))
+    return events
+
+
+broker = Broker()
+
+
+async def _stream(competition_id):
+    # Subscribe once the server starts streaming, so the finally below
+    # always runs for it
+    subscription = broker.subscribe(competition_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n".encode()
+        yield encode_event("hello", {
+            "competition": subscription.competition_id,
+            "leaderboard_version": await sync_to_async(current_version)(subscription.competition_id),
+        })
+        while not subscription.overflowed:
+            try:
+                yield await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+async def competition_events(request, competition_id):
+    """
+    Server-Sent Events stream of score and standings changes for a
+    competition. Public, like the schedule and the leaderboard.
+    """
+    competitions = await sync_to_async(competition_payload)()
+    if competition_id not in competitions.by_id:
+        return JsonResponse({"error": "Unknown competition"}, status=404)
+
+    response = StreamingHttpResponse(_stream(competition_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # let nginx pass events through as they come
+    return response
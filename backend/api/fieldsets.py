@@ -0,0 +1,77 @@
+"""
+Sparse fieldsets for the viewsets: `?fields=id,match,guess_home` keeps
+only those keys and `?expand=match` nests a related object instead of
+its id.
+
+Without either parameter every endpoint returns exactly what it always
+has (relations that were nested stay nested). As soon as a client sends
+one of them, a relation is an id unless named in `expand`. Which
+relations can collapse is up to the read serializers: those that call
+`fieldset.expands(name)` (through api.read_serializers._expands), today
+a guess's `match` and a bonus question choice's `choice`. Other nested
+objects, such as a game's teams, are always nested.
+"""
+
+
+def _names(request, param):
+    raw = request.query_params.get(param)
+    if raw is None:
+        return None
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
+
+class Fieldset:
+    def __init__(self, request):
+        self.fields = _names(request, "fields")
+        self.expand = _names(request, "expand") or set()
+        self.sparse = self.fields is not None or "expand" in request.query_params
+
+    def expands(self, name):
+        return not self.sparse or name in self.expand
+
+    def select(self, data):
+        if not self.fields:
+            return data
+        if isinstance(data, list):
+            return [self.select(item) for item in data]
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if key in self.fields}
+        return data
+
+
+class SparseFieldsetMixin:
+    """
+    Adds ?fields= and ?expand= to a viewset's GET responses. Serializers
+    find the request's Fieldset in their context under "fieldset".
+    """
+
+    @property
+    def fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = Fieldset(self.request)
+        return self._fieldset
+
+    def get_serializer_context(self):
+        return {**super().get_serializer_context(), "fieldset": self.fieldset}
+
+    def select_fields(self, data):
+        """
+        Applies ?fields= to `data` now, for responses that wrap the rows
+        in an envelope (pages, delta sync) the filter must not touch.
+        """
+        self._fields_selected = True
+        return self.fieldset.select(data)
+
+    def get_paginated_response(self, data):
+        return super().get_paginated_response(self.select_fields(data))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.data is not None
+            and not getattr(self, "_fields_selected", False)
+        ):
+            response.data = self.fieldset.select(response.data)
+        return response
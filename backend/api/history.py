@@ -0,0 +1,187 @@
+"""
+Rank history.
+
+After the last result of a matchday is entered, the competition's
+standings are frozen into a StandingSnapshot: two packed little-endian
+int32 arrays (points and ranks) indexed by Standing.snapshot_slot. A
+user's timeline then reads 8 bytes per snapshot via SUBSTR instead of
+re-aggregating guesses for every past date.
+"""
+import sys
+from array import array
+
+from django.db import transaction
+from django.db.models import BinaryField, F, Func, Max, Value
+from django.utils import timezone
+
+from api.models import Game, Standing, StandingSnapshot
+from api.standings import assign_ranks
+
+ITEM_SIZE = 4  # int32
+
+
+def _pack(values):
+    packed = array("i", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(blob):
+    packed = array("i")
+    packed.frombytes(bytes(blob))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed
+
+
+def _unpack_one(blob):
+    if blob is None or len(blob) < ITEM_SIZE:
+        return None
+    return int.from_bytes(bytes(blob), "little", signed=True)
+
+
+def _item_at(field, slot):
+    # SUBSTR works on bytea (Postgres) and BLOB (SQLite) alike
+    return Func(
+        F(field), Value(slot * ITEM_SIZE + 1), Value(ITEM_SIZE),
+        function="SUBSTR", output_field=BinaryField(),
+    )
+
+
+def matchday_of(game):
+    return timezone.localtime(game.match_date).date()
+
+
+def latest_result_matchday(competition_id):
+    """
+    Date of the most recent game in the competition that has a result.
+    """
+    latest = Game.objects.filter(
+        competition_id=competition_id, score_home__isnull=False, score_away__isnull=False
+    ).aggregate(latest=Max("match_date"))["latest"]
+    return timezone.localtime(latest).date() if latest else None
+
+
+def ranked_standings(competition_id):
+    """
+    Current standings as (rank, row) pairs, best first.
+    """
+    rows = Standing.objects.filter(competition_id=competition_id).order_by(
+        "-points", "-exact", "user_id"
+    ).values("id", "user_id", "user__username", "points", "exact", "snapshot_slot")
+    return list(assign_ranks(rows))
+
+
+@transaction.atomic
+def take_snapshot(competition_id, matchday):
+    """
+    Freezes the current standings of a competition as the state after `matchday`.
+    """
+    # Serialise slot assignment per competition
+    list(Standing.objects.select_for_update().filter(competition_id=competition_id).values_list("id"))
+
+    ranked = ranked_standings(competition_id)
+
+    next_slot = max((row["snapshot_slot"] for _, row in ranked if row["snapshot_slot"] is not None), default=-1) + 1
+    new_slots = []
+    for _, row in ranked:
+        if row["snapshot_slot"] is None:
+            row["snapshot_slot"] = next_slot
+            new_slots.append(Standing(id=row["id"], snapshot_slot=next_slot))
+            next_slot += 1
+    Standing.objects.bulk_update(new_slots, ["snapshot_slot"], batch_size=1000)
+
+    # Rank 0 marks a slot whose user has no standing at this point
+    points, ranks = [0] * next_slot, [0] * next_slot
+    for rank, row in ranked:
+        points[row["snapshot_slot"]] = row["points"]
+        ranks[row["snapshot_slot"]] = rank
+
+    snapshot, _ = StandingSnapshot.objects.update_or_create(
+        competition_id=competition_id,
+        matchday=matchday,
+        defaults={"points": _pack(points), "ranks": _pack(ranks)},
+    )
+    return snapshot
+
+
+def snapshot_if_matchday_complete(competition_id, matchday):
+    """
+    Takes the snapshot for `matchday` once every game on it has a result.
+
+    Corrections to an older matchday are skipped: the current standings
+    already include later results and would overwrite its history.
+    """
+    if competition_id is None:
+        return None
+
+    day_games = Game.objects.filter(competition_id=competition_id, match_date__date=matchday)
+    if day_games.filter(score_home__isnull=True).exists() or day_games.filter(score_away__isnull=True).exists():
+        return None
+    if latest_result_matchday(competition_id) != matchday:
+        return None
+
+    return take_snapshot(competition_id, matchday)
+
+
+def user_timeline(competition_id, user_id):
+    """
+    [{"matchday", "points", "rank"}] for one user, oldest first.
+    """
+    slot = Standing.objects.filter(
+        competition_id=competition_id, user_id=user_id
+    ).values_list("snapshot_slot", flat=True).first()
+    if slot is None:
+        return []
+
+    snapshots = StandingSnapshot.objects.filter(competition_id=competition_id).order_by("matchday").annotate(
+        user_points=_item_at("points", slot),
+        user_rank=_item_at("ranks", slot),
+    ).values("matchday", "user_points", "user_rank")
+
+    timeline = []
+    for snap in snapshots:
+        rank = _unpack_one(snap["user_rank"])
+        if not rank:
+            continue
+        timeline.append({
+            "matchday": snap["matchday"],
+            "points": _unpack_one(snap["user_points"]),
+            "rank": rank,
+        })
+    return timeline
+
+
+def movement(competition_id):
+    """
+    Current table with each user's move since the last snapshot taken
+    before the most recent matchday with results.
+    """
+    ranked = ranked_standings(competition_id)
+
+    baseline = None
+    current_matchday = latest_result_matchday(competition_id)
+    if current_matchday is not None:
+        baseline = StandingSnapshot.objects.filter(
+            competition_id=competition_id, matchday__lt=current_matchday
+        ).order_by("-matchday").values("matchday", "ranks").first()
+
+    previous_ranks = _unpack(baseline["ranks"]) if baseline else array("i")
+
+    table = []
+    for rank, row in ranked:
+        slot = row["snapshot_slot"]
+        previous = previous_ranks[slot] if slot is not None and slot < len(previous_ranks) else 0
+        table.append({
+            "user": row["user__username"],
+            "rank": rank,
+            "points": row["points"],
+            "previous_rank": previous or None,
+            "movement": previous - rank if previous else None,
+        })
+
+    return {
+        "since": baseline["matchday"] if baseline else None,
+        "table": table,
+    }
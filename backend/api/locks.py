@@ -0,0 +1,90 @@
+"""
+Process-local lock-time index.
+
+Guesses lock at their match's kick-off and bonus answers at their
+competition's start. Instead of loading the match or question.competition
+on every write, each process keeps match id -> (match_date, competition_id)
+and question id -> (start_date, competition_id) in memory. The index is
+rebuilt when the "games", "competitions" or "bonus-questions" versions
+(bumped by api.signals on any change) move on, so checking a lock costs
+a cache lookup and no queries.
+"""
+import threading
+from dataclasses import dataclass
+
+from api.cache import current_version
+from api.models import BonusQuestion, Game, UserBonusAnswer, UserGuess
+from api.routers import primary_reads
+
+SCOPES = ("games", "competitions", "bonus-questions")
+
+
+@dataclass(frozen=True)
+class Lock:
+    at: object  # datetime, or None when not configured
+    competition_id: int
+
+
+class LockIndex:
+    def __init__(self, version):
+        self.version = version
+        self.matches = {
+            game_id: Lock(match_date, competition_id)
+            for game_id, match_date, competition_id in Game.objects.values_list(
+                "id", "match_date", "competition_id"
+            )
+        }
+        self.questions = {
+            question_id: Lock(start_date, competition_id)
+            for question_id, start_date, competition_id in BonusQuestion.objects.values_list(
+                "id", "competition__start_date", "competition_id"
+            )
+        }
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_lock_index():
+    """
+    The process-local index, rebuilt when a game, competition or bonus
+    question has changed since it was loaded.
+    """
+    global _index
+    version = tuple(current_version(None, scope) for scope in SCOPES)
+
+    index = _index
+    if index is not None and index.version == version:
+        return index
+
+    with _lock:
+        if _index is None or _index.version != version:
+            with primary_reads():
+                _index = LockIndex(version)
+        return _index
+
+
+def match_lock(match_id):
+    return get_lock_index().matches.get(match_id)
+
+
+def question_lock(question_id):
+    return get_lock_index().questions.get(question_id)
+
+
+def lock_datetime_of(obj):
+    """
+    When `obj` (a guess or bonus answer) stops accepting changes, without
+    touching the database. Other objects fall back to their own
+    `lock_datetime`.
+    """
+    lock = None
+    if isinstance(obj, UserGuess):
+        lock = match_lock(obj.match_id)
+    elif isinstance(obj, UserBonusAnswer):
+        lock = question_lock(obj.question_id)
+
+    if lock is not None:
+        return lock.at
+    return getattr(obj, "lock_datetime", None)
@@ -0,0 +1,183 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import (
+    BonusChoices,
+    BonusQuestion,
+    BonusQuestionChoices,
+    Competition,
+    Game,
+    Team,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.standings import (
+    STAT_FIELDS,
+    assign_ranks,
+    compute_standings_orm,
+    leaderboard_rows,
+    ranked_leaderboard,
+    rebuild_standings,
+)
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic guesses, check that the single-query ranked leaderboard matches "
+        "the ORM aggregation and report latency. All seeded data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[10_000, 100_000, 1_000_000],
+            help='Numbers of guesses to benchmark',
+        )
+        parser.add_argument(
+            '--matches',
+            type=int,
+            default=60,
+            help='Matches per competition (users = guesses / matches)',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Timed runs per implementation',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(2026)
+        results = []
+
+        for size in options['sizes']:
+            try:
+                with transaction.atomic():
+                    competition = self._seed(size, options['matches'])
+                    results.append((size, self._measure(competition.id, options['repeat'])))
+                    raise Rollback
+            except Rollback:
+                pass
+
+        self.stdout.write("")
+        self.stdout.write(f"{'guesses':>10} {'orm + python':>14} {'ranked sql':>12} {'standings':>11}  (median ms)")
+        for size, timings in results:
+            self.stdout.write(
+                f"{size:>10} {timings['orm']:>14.1f} {timings['sql']:>12.1f} {timings['standings']:>11.1f}"
+            )
+
+    def _seed(self, size, num_matches):
+        num_users = max(1, size // num_matches)
+        tag = f"bench{size}-{time.time_ns()}"
+        self.stdout.write(f"Seeding {num_users} users x {num_matches} matches ...")
+
+        now = timezone.now()
+        competition = Competition.objects.create(short_name=tag[:20], name=tag, start_date=now)
+        teams = Team.objects.bulk_create([Team(name=f"{tag}-team{i}") for i in range(16)])
+        games = Game.objects.bulk_create([
+            Game(
+                team_home=teams[i % 16],
+                team_away=teams[(i + 1) % 16],
+                match_date=now - timedelta(hours=i),
+                score_home=random.randint(20, 35),
+                score_away=random.randint(20, 35),
+                group="A",
+                competition=competition,
+            )
+            for i in range(num_matches)
+        ])
+        users = User.objects.bulk_create(
+            [User(username=f"{tag}-user{i}") for i in range(num_users)], batch_size=5000
+        )
+
+        guesses = (
+            UserGuess(
+                user=user,
+                match=game,
+                guess_home=random.randint(20, 35),
+                guess_away=random.choice([None] + list(range(20, 36))),
+            )
+            for user in users
+            for game in games
+        )
+        UserGuess.objects.bulk_create(guesses, batch_size=5000)
+
+        choice = BonusChoices.objects.create(choice=tag)
+        questions = []
+        for i in range(3):
+            question = BonusQuestion.objects.create(question=f"{tag}-q{i}", competition=competition)
+            options = BonusQuestionChoices.objects.bulk_create(
+                [BonusQuestionChoices(question=question, choice=choice) for _ in range(8)]
+            )
+            question.correct_choice = options[0]
+            question.save()
+            questions.append((question, options))
+
+        # Some users only answer bonus questions
+        bonus_only = User.objects.bulk_create(
+            [User(username=f"{tag}-bonus{i}") for i in range(max(1, num_users // 20))]
+        )
+        UserBonusAnswer.objects.bulk_create(
+            (
+                UserBonusAnswer(user=user, question=question, answer=random.choice(options))
+                for user in users[::2] + bonus_only
+                for question, options in questions
+            ),
+            batch_size=5000,
+        )
+        return competition
+
+    def _time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), result
+
+    def _measure(self, competition_id, repeat):
+        def orm():
+            stats = compute_standings_orm(competition_id)
+            rows = [
+                {"user_id": user_id, "points": s["match_points"] + s["bonus_points"], **s}
+                for user_id, s in stats.items()
+            ]
+            rows.sort(key=lambda x: (-x["points"], -x["exact"], x["user_id"]))
+            return rows
+
+        orm_ms, expected = self._time(orm, repeat)
+        sql_ms, actual = self._time(lambda: ranked_leaderboard(competition_id), repeat)
+
+        self._check_equivalent(expected, actual)
+
+        rebuild_standings(competition_id)
+        standings_ms, _ = self._time(lambda: leaderboard_rows(competition_id), repeat)
+
+        self.stdout.write(self.style.SUCCESS(f"  {len(actual)} ranked rows match the ORM aggregation"))
+        return {"orm": orm_ms, "sql": sql_ms, "standings": standings_ms}
+
+    def _check_equivalent(self, expected, actual):
+        if len(expected) != len(actual):
+            raise CommandError(f"Row count differs: orm={len(expected)} sql={len(actual)}")
+
+        for (rank, want), got in zip(assign_ranks(expected), actual):
+            for field in ("user_id", "points") + STAT_FIELDS:
+                if want[field] != got[field]:
+                    raise CommandError(f"{field} differs for user {want['user_id']}: {want[field]} != {got[field]}")
+            if rank != got["rank"]:
+                raise CommandError(f"rank differs for user {want['user_id']}: {rank} != {got['rank']}")
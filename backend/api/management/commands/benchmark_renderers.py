@@ -0,0 +1,147 @@
+import decimal
+import io
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+
+import msgpack
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Game, Team
+from api.parsers import MessagePackParser, ORJSONParser
+from api.renderers import MessagePackRenderer, ORJSONRenderer
+from api.serializers import GameSerializer
+from api.standings import LEADERBOARD_FIELDS, leaderboard_row
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that ORJSONRenderer output is identical to DRF's JSONRenderer and compare "
+        "render time and size of JSON, orjson and MessagePack on leaderboard and schedule payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=10_000,
+            help='Rows in the leaderboard payload',
+        )
+        parser.add_argument(
+            '--matches',
+            type=int,
+            default=51,
+            help='Games in the schedule payload',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed renders per renderer and payload',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(2026)
+        payloads = {
+            "leaderboard": self._leaderboard(options['users']),
+            "schedule": self._schedule(options['matches']),
+            "edge cases": self._edge_cases(),
+        }
+        renderers = {
+            "drf json": JSONRenderer(),
+            "orjson": ORJSONRenderer(),
+            "msgpack": MessagePackRenderer(),
+        }
+
+        for name, data in payloads.items():
+            self._check_equivalent(name, data)
+
+        self.stdout.write("")
+        self.stdout.write(f"{'payload':<12} {'renderer':<9} {'median ms':>10} {'bytes':>10}")
+        for name, data in payloads.items():
+            for renderer_name, renderer in renderers.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    body = renderer.render(data)
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"{name:<12} {renderer_name:<9} {statistics.median(timings):>10.2f} {len(body):>10}"
+                )
+
+    # --------------------------
+    # Payloads
+    # --------------------------
+    def _leaderboard(self, num_users):
+        rows = []
+        for i in range(num_users):
+            row = {field: random.randint(0, 300) for field in LEADERBOARD_FIELDS}
+            row["user__username"] = f"user-{i}-þórður"
+            rows.append(row)
+        rows.sort(key=lambda r: (-r["points"], -r["exact"]))
+        return {"count": num_users, "results": [{"rank": i + 1, **leaderboard_row(r)} for i, r in enumerate(rows)]}
+
+    def _schedule(self, num_matches):
+        now = timezone.now()
+        teams = [Team(id=i, name=f"Team {i}", country_code="IS") for i in range(24)]
+        games = [
+            Game(
+                id=i,
+                team_home=teams[i % 24],
+                team_away=teams[(i + 5) % 24],
+                match_date=now + timedelta(hours=i, microseconds=random.randint(0, 999_999)),
+                score_home=random.randint(20, 35) if i % 2 else None,
+                score_away=random.randint(20, 35) if i % 2 else None,
+                group="A",
+                venue="Laugardalshöll",
+                competition_id=1,
+            )
+            for i in range(num_matches)
+        ]
+        return list(GameSerializer(games, many=True).data)
+
+    def _edge_cases(self):
+        now = timezone.now()
+        return {
+            "server_time": now,
+            "naive": now.replace(tzinfo=None),
+            "date": now.date(),
+            "duration": timedelta(minutes=90),
+            "decimal": decimal.Decimal("27.35"),
+            "guesses": {1: {"match": 1}, 2: {"match": 2}},
+            "separators": "line\u2028paragraph\u2029end",
+            "unicode": "Ísland – Danmörk",
+            "nothing": None,
+            "floats": [0.1, 1.5, 27.24],
+        }
+
+    # --------------------------
+    # Equivalence
+    # --------------------------
+    def _check_equivalent(self, name, data):
+        expected = JSONRenderer().render(data)
+        actual = ORJSONRenderer().render(data)
+        if expected != actual:
+            raise CommandError(f"{name}: orjson output differs from DRF's JSONRenderer")
+
+        packed = MessagePackRenderer().render(data)
+        if msgpack.unpackb(packed, raw=False, strict_map_key=False) != self._json_keys(json.loads(expected), data):
+            raise CommandError(f"{name}: MessagePack output doesn't decode to the JSON values")
+
+        if ORJSONParser().parse(io.BytesIO(actual)) != json.loads(expected):
+            raise CommandError(f"{name}: ORJSONParser doesn't read back the rendered JSON")
+        MessagePackParser().parse(io.BytesIO(packed))
+
+        self.stdout.write(self.style.SUCCESS(f"  {name}: orjson output is identical to JSONRenderer"))
+
+    def _json_keys(self, decoded, original):
+        # JSON turns integer keys into strings; MessagePack keeps them
+        if isinstance(original, dict) and isinstance(decoded, dict):
+            return {key: self._json_keys(decoded[str(key)], value) for key, value in original.items()}
+        if isinstance(original, list) and isinstance(decoded, list):
+            return [self._json_keys(d, o) for d, o in zip(decoded, original)]
+        return decoded
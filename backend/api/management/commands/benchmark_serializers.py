@@ -0,0 +1,120 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import (
+    BonusChoices,
+    BonusQuestionChoices,
+    Game,
+    Team,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.read_serializers import (
+    BonusAnswerReadSerializer,
+    BonusQuestionChoiceReadSerializer,
+    GameReadSerializer,
+    GuessReadSerializer,
+    TeamReadSerializer,
+)
+from api.renderers import ORJSONRenderer
+from api.serializers import (
+    BonusQuestionChoicesSerializer,
+    GameSerializer,
+    TeamSerializer,
+    UserBonusAnswerSerializer,
+    UserGuessSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the hand-written read serializers render byte-for-byte the same as the "
+        "ModelSerializers they replace, and compare their speed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--matches',
+            type=int,
+            default=51,
+            help='Games (and guesses per user) in the payloads',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed runs per serializer',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(2026)
+        now = timezone.now()
+
+        teams = [Team(id=i, name=f"Team {i}", country_code="IS" if i % 3 else None) for i in range(24)]
+        games = [
+            Game(
+                id=i,
+                team_home=teams[i % 24],
+                team_away=teams[(i + 5) % 24],
+                match_date=now + timedelta(hours=i, microseconds=random.randint(0, 999_999)),
+                score_home=random.randint(20, 35) if i % 2 else None,
+                score_away=random.randint(20, 35) if i % 2 else None,
+                group="A",
+                venue="Laugardalshöll" if i % 4 else None,
+                competition_id=1,
+            )
+            for i in range(options['matches'])
+        ]
+        guesses = [
+            UserGuess(
+                id=i,
+                user_id=7,
+                match=game,
+                guess_home=random.randint(20, 35),
+                guess_away=random.choice([None, random.randint(20, 35)]),
+                created_at=now - timedelta(days=1, microseconds=random.randint(0, 999_999)),
+            )
+            for i, game in enumerate(games)
+        ]
+        choices = [BonusChoices(id=i, choice=f"Choice {i}") for i in range(24)]
+        question_choices = [BonusQuestionChoices(id=i, choice=choice, question_id=3) for i, choice in enumerate(choices)]
+        answers = [
+            UserBonusAnswer(id=i, user_id=7, question_id=i, answer_id=random.choice([None, i]))
+            for i in range(10)
+        ]
+        matches = {row["id"]: row for row in GameSerializer(games, many=True).data}
+
+        cases = [
+            ("teams", teams, TeamSerializer, TeamReadSerializer, {}),
+            ("matches", games, GameSerializer, GameReadSerializer, {}),
+            ("guesses", guesses, UserGuessSerializer, GuessReadSerializer, {"matches": matches}),
+            ("bonus answers", answers, UserBonusAnswerSerializer, BonusAnswerReadSerializer, {}),
+            ("question choices", question_choices, BonusQuestionChoicesSerializer, BonusQuestionChoiceReadSerializer, {}),
+        ]
+
+        renderer = ORJSONRenderer()
+        self.stdout.write(f"{'payload':<17} {'model ms':>9} {'read ms':>9} {'bytes':>8}")
+        for name, objects, model_serializer, read_serializer, context in cases:
+            expected = renderer.render(model_serializer(objects, many=True).data)
+            actual = renderer.render(read_serializer(objects, many=True, context=context).data)
+            if expected != actual:
+                raise CommandError(f"{name}: {read_serializer.__name__} output differs from {model_serializer.__name__}")
+
+            model_ms = self._time(lambda: model_serializer(objects, many=True).data, options['repeat'])
+            read_ms = self._time(lambda: read_serializer(objects, many=True, context=context).data, options['repeat'])
+            self.stdout.write(f"{name:<17} {model_ms:>9.3f} {read_ms:>9.3f} {len(actual):>8}")
+
+        self.stdout.write(self.style.SUCCESS("All read serializers match their ModelSerializer byte for byte."))
+
+    def _time(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
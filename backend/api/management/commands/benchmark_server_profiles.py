@@ -0,0 +1,221 @@
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Competition
+
+User = get_user_model()
+
+PROFILES = ("wsgi", "asgi")
+STARTUP_TIMEOUT = 30  # seconds for a server to answer its first request
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the API under gunicorn in the WSGI (sync workers) and ASGI (uvicorn workers) "
+        "profiles and compare throughput and latency of the read endpoints at several "
+        "numbers of concurrent clients. Uses the configured database as it is; run it "
+        "against a local Postgres with data (e.g. after generate_test_data)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            nargs='+',
+            default=[50, 200, 1000],
+            help='Numbers of concurrent keep-alive clients',
+        )
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=10.0,
+            help='Seconds of load per profile and concurrency',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=3,
+            help='Gunicorn workers per profile',
+        )
+        parser.add_argument(
+            '--profiles',
+            nargs='+',
+            choices=PROFILES,
+            default=list(PROFILES),
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8100,
+            help='Port for the server under test',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"Database is {connection.vendor}, not Postgres; numbers won't reflect production."
+            ))
+
+        user = User.objects.filter(is_active=True).order_by("id").first()
+        competition = Competition.objects.order_by("id").first()
+        if user is None or competition is None:
+            raise CommandError("Needs at least one active user and one competition")
+
+        token = str(RefreshToken.for_user(user).access_token)
+        paths = [
+            (f"/api/scores/?competition={competition.id}", False),
+            (f"/api/matches/?competition={competition.id}", False),
+            ("/api/competitions/", True),
+            ("/api/auth/me/", True),
+        ]
+        host = "127.0.0.1"
+        requests = [_request(host, path, token if authenticated else None) for path, authenticated in paths]
+
+        self.stdout.write(
+            f"{'profile':<8} {'clients':>8} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>8}"
+        )
+        for profile in options['profiles']:
+            server = self._start(profile, host, options['port'], options['workers'])
+            try:
+                asyncio.run(_wait_until_up(host, options['port'], requests[1]))
+                for clients in options['concurrency']:
+                    result = asyncio.run(_load(host, options['port'], requests, clients, options['duration']))
+                    self._report(profile, clients, result)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+    def _start(self, profile, host, port, workers):
+        env = {
+            **os.environ,
+            "GUNICORN_PROFILE": profile,
+            "GUNICORN_BIND": f"{host}:{port}",
+            "GUNICORN_WORKERS": str(workers),
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "peyjabankinn.settings"),
+        }
+        return subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "--backlog", "4096"],
+            cwd=Path(settings.BASE_DIR),
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def _report(self, profile, clients, result):
+        latencies, errors, elapsed = result
+        if not latencies:
+            self.stdout.write(f"{profile:<8} {clients:>8} {'-':>9} {'-':>9} {'-':>9} {errors:>8}")
+            return
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{profile:<8} {clients:>8} {len(latencies) / elapsed:>9.0f} "
+            f"{statistics.median(latencies):>9.1f} {p99:>9.1f} {errors:>8}"
+        )
+
+
+# --------------------------
+# Load generator
+# --------------------------
+def _request(host, path, token):
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}", "Accept: application/json"]
+    if token:
+        lines.append(f"Authorization: Bearer {token}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+
+async def _read_response(reader):
+    """
+    Reads one response. Returns (status, keep_alive).
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    status = int(status_line.split(" ", 2)[1])
+    headers = {}
+    for line in header_lines:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+
+    if headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("connection") != "close"
+
+
+async def _client(host, port, requests, offset, deadline, latencies):
+    errors = 0
+    reader = writer = None
+    i = offset
+    while time.perf_counter() < deadline:
+        if writer is None:
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+            except OSError:
+                errors += 1
+                await asyncio.sleep(0.05)
+                continue
+
+        started = time.perf_counter()
+        try:
+            writer.write(requests[i % len(requests)])
+            status, keep_alive = await _read_response(reader)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            errors += 1
+            writer.close()
+            reader = writer = None
+            continue
+        i += 1
+
+        latencies.append((time.perf_counter() - started) * 1000)
+        if status >= 400:
+            errors += 1
+        if not keep_alive:
+            writer.close()
+            reader = writer = None
+
+    if writer is not None:
+        writer.close()
+    return errors
+
+
+async def _load(host, port, requests, clients, duration):
+    latencies = []
+    started = time.perf_counter()
+    deadline = started + duration
+    errors = await asyncio.gather(*(
+        _client(host, port, requests, n, deadline, latencies) for n in range(clients)
+    ))
+    return latencies, sum(errors), time.perf_counter() - started
+
+
+async def _wait_until_up(host, port, request):
+    deadline = time.perf_counter() + STARTUP_TIMEOUT
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            status, _ = await _read_response(reader)
+            writer.close()
+            if status < 500:
+                return
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        await asyncio.sleep(0.2)
+    raise CommandError(f"Server on {host}:{port} didn't come up within {STARTUP_TIMEOUT}s")
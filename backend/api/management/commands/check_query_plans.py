@@ -0,0 +1,216 @@
+import random
+import re
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from api.models import (
+    BonusChoices,
+    BonusQuestion,
+    BonusQuestionChoices,
+    Competition,
+    Game,
+    Standing,
+    Team,
+    Tombstone,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.standings import ranked_leaderboard_query, rebuild_standings
+
+User = get_user_model()
+
+# A full scan of a table in a plan, by backend
+FULL_SCAN = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"^(?:\d+ \d+ \d+ )?SCAN (\w+)\b(?! USING)", re.MULTILINE),
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed two competitions, EXPLAIN the hot queries (standings, schedule, guesses, "
+        "crowd stats, delta sync, email lookups) and fail if any of them reads one of its "
+        "tables with a sequential scan. On Postgres sequential scans are disabled for the "
+        "check, so a scan in a plan means no index can serve the query at all. All seeded "
+        "data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=500,
+            help='Users with a full set of guesses and bonus answers per competition',
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print every plan, not just failing ones',
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN:
+            raise CommandError(f"Don't know how to read {vendor} query plans")
+        if vendor != "postgresql":
+            self.stdout.write(self.style.WARNING(
+                f"Database is {vendor}, not Postgres; plans won't match production."
+            ))
+
+        random.seed(2026)
+        failures = []
+
+        try:
+            with transaction.atomic():
+                data = self._seed(options['users'])
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE")
+                    if vendor == "postgresql":
+                        cursor.execute("SET LOCAL enable_seqscan = off")
+
+                for name, vendors, tables, explain in self._queries(data):
+                    if vendors and vendor not in vendors:
+                        self.stdout.write(f"{'skip':<5} {name} (only on {', '.join(vendors)})")
+                        continue
+                    plan = explain()
+                    scanned = sorted({table for table in FULL_SCAN[vendor].findall(plan) if table in tables})
+                    ok = not scanned
+                    style = self.style.SUCCESS if ok else self.style.ERROR
+                    detail = "" if ok else f": sequential scan of {', '.join(scanned)}"
+                    self.stdout.write(style(f"{'ok' if ok else 'FAIL':<5} {name}{detail}"))
+                    if not ok or options['verbose_plans']:
+                        for line in plan.splitlines():
+                            self.stdout.write(f"      {line}")
+                    if not ok:
+                        failures.append(name)
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries fall back to sequential scans: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Every hot query is served by an index."))
+
+    # --------------------------
+    # Data
+    # --------------------------
+    def _seed(self, num_users):
+        now = timezone.now()
+        teams = Team.objects.bulk_create([Team(name=f"plan-team-{i}", country_code="IS") for i in range(24)])
+        choices = BonusChoices.objects.bulk_create([BonusChoices(choice=f"plan-choice-{i}") for i in range(24)])
+        users = User.objects.bulk_create(
+            [User(username=f"plan-user-{i}", email=f"plan-user-{i}@example.com") for i in range(num_users)]
+        )
+
+        competitions = []
+        for c in range(2):
+            competition = Competition.objects.create(
+                short_name=f"Plan{c}", name=f"Query plans {c}", start_date=now - timedelta(days=10)
+            )
+            games = Game.objects.bulk_create([
+                Game(
+                    team_home=teams[i % 24],
+                    team_away=teams[(i + 5) % 24],
+                    match_date=now + timedelta(hours=i - 30),
+                    score_home=random.randint(20, 35) if i < 30 else None,
+                    score_away=random.randint(20, 35) if i < 30 else None,
+                    group="A",
+                    competition=competition,
+                )
+                for i in range(60)
+            ])
+            questions = []
+            for i in range(7):
+                question = BonusQuestion.objects.create(question=f"plan-question-{c}-{i}", competition=competition)
+                options = BonusQuestionChoices.objects.bulk_create(
+                    [BonusQuestionChoices(question=question, choice=choice) for choice in choices]
+                )
+                question.correct_choice = options[0]
+                question.save()
+                questions.append((question, options))
+
+            UserGuess.objects.bulk_create(
+                (
+                    UserGuess(user=user, match=game, guess_home=random.randint(20, 35), guess_away=random.randint(20, 35))
+                    for user in users
+                    for game in games
+                ),
+                batch_size=5000,
+            )
+            UserBonusAnswer.objects.bulk_create(
+                (
+                    UserBonusAnswer(user=user, question=question, answer=random.choice(options))
+                    for user in users
+                    for question, options in questions
+                ),
+                batch_size=5000,
+            )
+            rebuild_standings(competition.id)
+            competitions.append((competition, games, questions))
+
+        competition, games, questions = competitions[0]
+        return {
+            "competition": competition,
+            "game": games[0],
+            "question": questions[0][0],
+            "me": users[0],
+            "since": now - timedelta(minutes=5),
+        }
+
+    # --------------------------
+    # Queries
+    # --------------------------
+    def _queries(self, d):
+        """
+        (name, vendors or None for all, tables that mustn't be scanned, explain)
+        """
+        c = d["competition"].id
+        guess, game, answer = UserGuess._meta.db_table, Game._meta.db_table, UserBonusAnswer._meta.db_table
+
+        def qs(queryset):
+            return queryset.explain
+
+        def raw(sql, params):
+            def explain():
+                prefix = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{prefix} {sql}", params)
+                    rows = cursor.fetchall()
+                # SQLite rows are (id, parent, notused, detail)
+                return "\n".join(str(row[-1]) for row in rows)
+
+            return explain
+
+        return [
+            # SQLite names the tables of the raw query by their aliases
+            ("ranked leaderboard", None, {guess, game, answer, BonusQuestion._meta.db_table, "g", "m", "a", "q"},
+             raw(*ranked_leaderboard_query(c))),
+            ("standings table", None, {Standing._meta.db_table},
+             qs(Standing.objects.filter(competition_id=c).order_by("-points", "-exact"))),
+            ("schedule", None, {game},
+             qs(Game.objects.filter(competition_id=c).order_by("match_date", "id"))),
+            ("competition guesses", None, {guess, game},
+             qs(UserGuess.objects.filter(match__competition_id=c).values_list("user_id", "guess_home", "guess_away"))),
+            ("match guesses (crowd stats)", None, {guess},
+             qs(UserGuess.objects.filter(match=d["game"]).values_list("guess_home", "guess_away"))),
+            ("user's guesses", None, {guess},
+             qs(UserGuess.objects.filter(user=d["me"], match__competition_id=c))),
+            ("guesses delta sync", None, {guess},
+             qs(UserGuess.objects.filter(user=d["me"], updated_at__gt=d["since"]))),
+            ("question answers (crowd stats)", None, {answer},
+             qs(UserBonusAnswer.objects.filter(question=d["question"]).values("answer_id").annotate(count=Count("id")))),
+            ("tombstones since", None, {Tombstone._meta.db_table},
+             qs(Tombstone.objects.filter(kind=Tombstone.GUESS, deleted_at__gt=d["since"]))),
+            # SQLite compiles iexact to LIKE, which no index serves
+            ("email lookup", ("postgresql",), {User._meta.db_table},
+             qs(User.objects.filter(email__iexact="Plan-User-7@example.com"))),
+        ]
@@ -0,0 +1,106 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Competition, League
+from api.routers import PRIMARY, REPLICA, replica_configured
+
+User = get_user_model()
+
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Send requests through the full middleware stack and report which database alias "
+        "their queries ran on: anonymous and authenticated reads of the routed endpoints "
+        "should reach the replica, writes and a user's reads right after their own write "
+        "the primary. Needs a \"replica\" alias (POSTGRES_REPLICA_HOST); it may point at "
+        "the primary itself. Uses existing data; the one write is rolled back."
+    )
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError('No "replica" database is configured; set POSTGRES_REPLICA_HOST')
+
+        user = User.objects.filter(is_active=True).order_by("id").first()
+        competition = Competition.objects.order_by("id").first()
+        if user is None or competition is None:
+            raise CommandError("Needs at least one active user and one competition")
+
+        overrides = {
+            "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                                   "LOCATION": "replica-routing"}},
+            "ALLOWED_HOSTS": ["testserver"],
+            "SECURE_SSL_REDIRECT": False,
+        }
+        # The plain leaderboard, schedule and catalog come from version-keyed
+        # caches that are always built on the primary, so these are the
+        # reads that actually reach the replica
+        reads = [
+            ("matches page", f"/api/matches/?competition={competition.id}&page_size=20"),
+            ("bonus questions", "/api/bonus-questions/"),
+        ]
+        user_reads = list(reads)
+        league = League.objects.filter(members=user).order_by("id").first()
+        if league is not None:
+            user_reads.append(("league leaderboard", f"/api/scores/?competition={competition.id}&league={league.id}"))
+
+        failures = []
+        with override_settings(**overrides):
+            self.stdout.write(f"{'primary':>8} {'replica':>8} {'status':>7}  request")
+            for name, url in reads:
+                failures += self._check(f"anonymous {name}", "GET", url, None, expect=REPLICA)
+            for name, url in user_reads:
+                failures += self._check(f"user {name}", "GET", url, user, expect=REPLICA)
+
+            try:
+                with transaction.atomic():
+                    failures += self._check(
+                        "user writes", "POST", "/api/leagues/", user, expect=PRIMARY, payload={"name": "Replica check"}
+                    )
+                    raise Rollback
+            except Rollback:
+                pass
+
+            for name, url in user_reads:
+                failures += self._check(f"user {name} after write", "GET", url, user, expect=PRIMARY)
+            for name, url in reads:
+                failures += self._check(f"anonymous {name} after write", "GET", url, None, expect=REPLICA)
+
+        if failures:
+            raise CommandError(f"{len(failures)} requests used the wrong database: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Reads and writes went to the expected databases."))
+
+    def _check(self, name, method, url, user, expect, payload=None):
+        client = APIClient()
+        if user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+        with CaptureQueriesContext(connections[PRIMARY]) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(client, method.lower())(url, payload, format="json")
+
+        counts = {
+            alias: sum(not q["sql"].startswith(IGNORED_PREFIXES) for q in captured.captured_queries)
+            for alias, captured in ((PRIMARY, primary), (REPLICA, replica))
+        }
+        # Reads that may use the replica still look the user up on the
+        # primary; the replica must serve at least one query. Writes and
+        # pinned reads must not touch it.
+        if expect == REPLICA:
+            ok = counts[REPLICA] > 0
+        else:
+            ok = counts[REPLICA] == 0
+        ok = ok and response.status_code < 400
+
+        style = self.style.SUCCESS if ok else self.style.ERROR
+        self.stdout.write(style(f"{counts[PRIMARY]:>8} {counts[REPLICA]:>8} {response.status_code:>7}  {method} {name}"))
+        return [] if ok else [name]
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.crowd import compute_game_stats, compute_question_stats
+from api.models import BonusQuestion, Game
+
+
+class Command(BaseCommand):
+    help = "Store crowd prediction stats for every locked game and bonus question that doesn't have them yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--competition_id',
+            type=int,
+            default=None,
+            help='Only this competition (default: all competitions)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Recompute stats that already exist',
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+
+        games = Game.objects.filter(match_date__lte=now)
+        questions = BonusQuestion.objects.filter(competition__start_date__lte=now)
+        if options['competition_id']:
+            games = games.filter(competition_id=options['competition_id'])
+            questions = questions.filter(competition_id=options['competition_id'])
+        if not options['force']:
+            games = games.filter(crowd_stats__isnull=True)
+            questions = questions.filter(crowd_stats__isnull=True)
+
+        for game in games:
+            compute_game_stats(game)
+        for question in questions:
+            compute_question_stats(question)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Crowd stats stored for {len(games)} games and {len(questions)} bonus questions."
+        ))
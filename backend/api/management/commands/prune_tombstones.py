@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.models import Tombstone
+from api.sync import SYNC_RETENTION
+
+
+class Command(BaseCommand):
+    help = "Delete delta-sync tombstones older than the sync token retention"
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - SYNC_RETENTION
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones older than {cutoff:%Y-%m-%d %H:%M}."))
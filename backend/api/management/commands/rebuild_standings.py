@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Competition
+from api.standings import compute_standings, diff_standings, rebuild_standings
+
+
+class Command(BaseCommand):
+    help = "Recompute standings from scratch, report drift against the stored rows and rewrite them"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--competition_id',
+            type=int,
+            default=None,
+            help='Only rebuild this competition (default: all competitions)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only compare stored rows against a fresh computation; exit non-zero on drift',
+        )
+
+    def handle(self, *args, **options):
+        competitions = Competition.objects.order_by("id")
+        if options['competition_id']:
+            competitions = competitions.filter(id=options['competition_id'])
+            if not competitions.exists():
+                raise CommandError(f"Competition {options['competition_id']} not found")
+
+        drifted = 0
+
+        for competition in competitions:
+            computed = compute_standings(competition.id)
+            mismatches = diff_standings(competition.id, computed)
+            drifted += len(mismatches)
+
+            for user_id, stored, expected in mismatches:
+                self.stdout.write(self.style.WARNING(
+                    f"[{competition}] user {user_id}: stored={stored} expected={expected}"
+                ))
+
+            if options['check']:
+                self.stdout.write(f"{competition}: {len(computed)} users, {len(mismatches)} mismatched")
+                continue
+
+            created, updated, deleted = rebuild_standings(competition.id, computed)
+            self.stdout.write(self.style.SUCCESS(
+                f"{competition}: {created} created, {updated} updated, {deleted} deleted "
+                f"({len(mismatches)} were out of sync)"
+            ))
+
+        if options['check'] and drifted:
+            raise CommandError(f"{drifted} standing rows are out of sync")
@@ -0,0 +1,100 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PROFILES = ("full", "api")
+
+# Runs in a fresh interpreter: loads the app the way a gunicorn worker
+# does, imports the view modules and reports what that cost
+CHILD = """
+import json, resource, sys, time
+
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+
+application = get_wsgi_application()
+from django.urls import get_resolver
+
+for path in ("/api/matches/", "/api/auth/me/"):
+    get_resolver().resolve(path)
+startup_ms = (time.perf_counter() - started) * 1000
+
+try:
+    with open("/proc/self/status") as status:
+        rss_kib = next(int(line.split()[1]) for line in status if line.startswith("VmRSS:"))
+except OSError:
+    rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # peak; bytes on macOS
+
+from django.conf import settings
+
+print(json.dumps({
+    "startup_ms": startup_ms,
+    "rss_kib": rss_kib,
+    "modules": len(sys.modules),
+    "apps": len(settings.INSTALLED_APPS),
+    "middleware": len(settings.MIDDLEWARE),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare worker startup time (app load and view imports) and resident memory "
+        "between the full and the API-only (DJANGO_PROFILE=api) settings profiles, "
+        "each measured in fresh interpreters."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Fresh interpreters per profile',
+        )
+        parser.add_argument(
+            '--memory-mib',
+            type=int,
+            default=2048,
+            help='Memory to size the workers-per-box estimate for',
+        )
+
+    def handle(self, *args, **options):
+        results = {profile: self._measure(profile, options['repeat']) for profile in PROFILES}
+
+        self.stdout.write(
+            f"{'profile':<8} {'startup ms':>11} {'RSS MiB':>9} {'modules':>8} {'apps':>5} "
+            f"{'middleware':>11} {'workers/' + str(options['memory_mib']) + ' MiB':>16}"
+        )
+        for profile, runs in results.items():
+            rss_mib = statistics.median(run["rss_kib"] for run in runs) / 1024
+            self.stdout.write(
+                f"{profile:<8} {statistics.median(run['startup_ms'] for run in runs):>11.0f} {rss_mib:>9.1f} "
+                f"{runs[0]['modules']:>8} {runs[0]['apps']:>5} {runs[0]['middleware']:>11} "
+                f"{int(options['memory_mib'] // rss_mib):>16}"
+            )
+
+    def _measure(self, profile, repeat):
+        env = {
+            **os.environ,
+            "DJANGO_PROFILE": profile,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "peyjabankinn.settings"),
+        }
+        runs = []
+        for _ in range(repeat):
+            child = subprocess.run(
+                [sys.executable, "-c", CHILD],
+                cwd=Path(settings.BASE_DIR),
+                env=env,
+                capture_output=True,
+                text=True,
+            )
+            if child.returncode != 0:
+                raise CommandError(f"{profile} profile failed to load:\n{child.stderr}")
+            runs.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        return runs
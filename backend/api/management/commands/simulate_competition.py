@@ -0,0 +1,105 @@
+import os
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.cache import current_version
+from api.models import Competition, Game
+from api.simulation import cached_probabilities, simulate, store_probabilities
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate the remaining games of a competition and cache each user's chance of finishing "
+        "1st / top 3 / top 10. The win-probability endpoint only serves what this stores, so run it "
+        "on a schedule (--all --max-age) in production."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument(
+            '--competition_id',
+            type=int,
+            help='ID of the competition to simulate',
+        )
+        target.add_argument(
+            '--all',
+            action='store_true',
+            help='Every competition with games left to play',
+        )
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=None,
+            help='Skip competitions whose stored probabilities are current and at most this many seconds old',
+        )
+        parser.add_argument(
+            '--simulations',
+            type=int,
+            default=20_000,
+            help='Number of simulated tournaments',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Worker processes (simulations are split into chunks)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help='Random seed for reproducible runs',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Number of users to print',
+        )
+
+    def handle(self, *args, **options):
+        if options['all']:
+            competitions = Competition.objects.filter(
+                id__in=Game.objects.filter(score_home__isnull=True).values("competition_id")
+            ).order_by("id")
+        else:
+            try:
+                competitions = [Competition.objects.get(id=options['competition_id'])]
+            except Competition.DoesNotExist:
+                raise CommandError(f"Competition {options['competition_id']} not found")
+
+        for competition in competitions:
+            if options['max_age'] is not None and self._fresh(competition, options['max_age']):
+                self.stdout.write(f"{competition}: up to date")
+                continue
+            self._simulate(competition, options)
+
+    def _fresh(self, competition, max_age):
+        payload, status = cached_probabilities(competition.id)
+        if payload is None or status.name != "HIT":
+            return False
+        return parse_datetime(payload['computed_at']) > timezone.now() - timedelta(seconds=max_age)
+
+    def _simulate(self, competition, options):
+        # Taken before simulating so a result entered meanwhile isn't masked
+        version = current_version(competition.id)
+        payload = simulate(
+            competition.id,
+            options['simulations'],
+            processes=options['processes'],
+            seed=options['seed'],
+        )
+        store_probabilities(competition.id, version, payload)
+
+        self.stdout.write(
+            f"{competition}: {payload['simulations']} simulations of {payload['remaining_games']} games "
+            f"and {payload['open_bonus_questions']} bonus questions in {payload['duration_ms']} ms"
+        )
+        for row in payload['results'][:options['top']]:
+            self.stdout.write(
+                f"  {row['user']:<20} 1st {row['p_first']:.1%}  top3 {row['p_top3']:.1%}  top10 {row['p_top10']:.1%}"
+            )
+        self.stdout.write(self.style.SUCCESS("Probabilities cached."))
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncRequestFactory
+
+from api.cache import bump_version
+from api.events import POLL_INTERVAL, broker, competition_events, encode_event
+from api.models import Competition
+
+
+class Command(BaseCommand):
+    help = (
+        "Open thousands of in-process SSE subscribers on a competition's event stream, "
+        "publish score events to them and report fan-out latency and memory. The last round "
+        "bumps the competition's leaderboard version and waits for the watcher to notice it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--subscribers',
+            type=int,
+            default=5000,
+            help='Number of simulated EventSource clients',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help='Score events to publish',
+        )
+        parser.add_argument(
+            '--competition_id',
+            type=int,
+            help='Competition to subscribe to (default: the first one)',
+        )
+
+    def handle(self, *args, **options):
+        competition = Competition.objects.order_by("id")
+        if options['competition_id']:
+            competition = competition.filter(id=options['competition_id'])
+        competition = competition.first()
+        if competition is None:
+            raise CommandError("No competition to subscribe to")
+
+        asyncio.run(self._simulate(competition.id, options['subscribers'], options['rounds']))
+
+    async def _simulate(self, competition_id, num_subscribers, rounds):
+        factory = AsyncRequestFactory()
+        tally = Tally(num_subscribers)
+
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        listeners = [
+            asyncio.create_task(self._listen(factory, competition_id, tally)) for _ in range(num_subscribers)
+        ]
+        await tally.wait("hello")
+        connect_ms = (time.perf_counter() - started) * 1000
+        memory_per_subscriber = (tracemalloc.get_traced_memory()[0] - memory_before) / num_subscribers
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"{num_subscribers} subscribers connected in {connect_ms:.0f} ms, "
+            f"~{memory_per_subscriber / 1024:.1f} KiB each"
+        )
+        self.stdout.write(f"{'round':<10} {'publish ms':>11} {'p50 ms':>8} {'p99 ms':>8} {'all ms':>8}")
+
+        for round_number in range(1, rounds + 1):
+            event = encode_event("score", {"match": 0, "score_home": round_number, "score_away": 0, "round": round_number})
+            published = time.perf_counter()
+            reached = broker.publish(competition_id, event)
+            publish_ms = (time.perf_counter() - published) * 1000
+            if reached != num_subscribers:
+                raise CommandError(f"Round {round_number} reached {reached} of {num_subscribers} subscribers")
+            await tally.wait(round_number)
+            self._report(f"score {round_number}", publish_ms, tally.latencies(round_number, published))
+
+        # End to end: a version bump picked up by the watcher
+        published = time.perf_counter()
+        await asyncio.to_thread(bump_version, competition_id)
+        try:
+            await asyncio.wait_for(tally.wait("standings"), POLL_INTERVAL * 5)
+        except asyncio.TimeoutError:
+            raise CommandError(f"Only {tally.count('standings')} subscribers got the standings event")
+        self._report("standings", 0.0, tally.latencies("standings", published))
+
+        for listener in listeners:
+            listener.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+        if broker.subscriptions:
+            raise CommandError("Subscriptions were left behind after the clients disconnected")
+        self.stdout.write(self.style.SUCCESS("Every subscriber got every event."))
+
+    async def _listen(self, factory, competition_id, tally):
+        response = await competition_events(factory.get(f"/api/competitions/{competition_id}/events/"), competition_id)
+        async for chunk in response.streaming_content:
+            name, _, data = chunk.decode().partition("\ndata: ")
+            if name == "event: hello":
+                tally.add("hello")
+            elif name == "event: score":
+                tally.add(json.loads(data).get("round"))
+            elif name == "event: standings":
+                tally.add("standings")
+
+    def _report(self, label, publish_ms, latencies):
+        latencies = sorted(latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{label:<10} {publish_ms:>11.2f} {statistics.median(latencies):>8.2f} {p99:>8.2f} {latencies[-1]:>8.2f}"
+        )
+
+
+class Tally:
+    """
+    Receipt times per event key, with a way to wait until every subscriber
+    has one.
+    """
+
+    def __init__(self, expected):
+        self.expected = expected
+        self.received = {}
+        self.done = {}
+
+    def _done(self, key):
+        return self.done.setdefault(key, asyncio.Event())
+
+    def add(self, key):
+        times = self.received.setdefault(key, [])
+        times.append(time.perf_counter())
+        if len(times) == self.expected:
+            self._done(key).set()
+
+    def count(self, key):
+        return len(self.received.get(key, ()))
+
+    async def wait(self, key):
+        await self._done(key).wait()
+
+    def latencies(self, key, since):
+        return [(at - since) * 1000 for at in self.received[key]]
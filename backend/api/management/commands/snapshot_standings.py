@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.history import latest_result_matchday, take_snapshot
+from api.models import Competition
+
+
+class Command(BaseCommand):
+    help = "Store a rank/points snapshot of the current standings for a competition"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--competition_id',
+            type=int,
+            required=True,
+            help='ID of the competition to snapshot',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            competition = Competition.objects.get(id=options['competition_id'])
+        except Competition.DoesNotExist:
+            raise CommandError(f"Competition {options['competition_id']} not found")
+
+        matchday = latest_result_matchday(competition.id)
+        if matchday is None:
+            raise CommandError(f"{competition} has no results yet")
+
+        take_snapshot(competition.id, matchday)
+        self.stdout.write(self.style.SUCCESS(f"Snapshot of {competition} after {matchday} saved."))
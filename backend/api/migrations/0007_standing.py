@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from api.scoring import score_bonus, score_guess
+
+
+def backfill_standings(apps, schema_editor):
+    Standing = apps.get_model('api', 'Standing')
+    UserGuess = apps.get_model('api', 'UserGuess')
+    UserBonusAnswer = apps.get_model('api', 'UserBonusAnswer')
+
+    rows = {}
+
+    def row(user_id, competition_id):
+        key = (user_id, competition_id)
+        if key not in rows:
+            rows[key] = Standing(user_id=user_id, competition_id=competition_id)
+        return rows[key]
+
+    guesses = UserGuess.objects.filter(match__competition__isnull=False).values_list(
+        'user_id', 'match__competition_id', 'guess_home', 'guess_away', 'match__score_home', 'match__score_away'
+    )
+    for user_id, competition_id, guess_home, guess_away, score_home, score_away in guesses.iterator():
+        standing = row(user_id, competition_id)
+        for field, value in score_guess(guess_home, guess_away, score_home, score_away).items():
+            setattr(standing, field, getattr(standing, field) + value)
+        standing.total_guesses += 1
+
+    answers = UserBonusAnswer.objects.filter(question__competition__isnull=False).values_list(
+        'user_id', 'question__competition_id', 'answer_id', 'question__correct_choice_id'
+    )
+    for user_id, competition_id, answer_id, correct_choice_id in answers.iterator():
+        standing = row(user_id, competition_id)
+        for field, value in score_bonus(answer_id, correct_choice_id).items():
+            setattr(standing, field, getattr(standing, field) + value)
+        standing.total_bonus += 1
+
+    for standing in rows.values():
+        standing.points = standing.match_points + standing.bonus_points
+    Standing.objects.bulk_create(rows.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_alter_competition_start_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Standing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(default=0)),
+                ('match_points', models.IntegerField(default=0)),
+                ('bonus_points', models.IntegerField(default=0)),
+                ('exact', models.IntegerField(default=0)),
+                ('one_score', models.IntegerField(default=0)),
+                ('correct_results', models.IntegerField(default=0)),
+                ('total_guesses', models.IntegerField(default=0)),
+                ('correct_bonus', models.IntegerField(default=0)),
+                ('total_bonus', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='api.competition')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['competition', '-points', '-exact'], name='standing_rank_idx')],
+                'unique_together': {('user', 'competition')},
+            },
+        ),
+        migrations.RunPython(backfill_standings, migrations.RunPython.noop),
+    ]
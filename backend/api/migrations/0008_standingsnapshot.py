@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_standing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='standing',
+            name='snapshot_slot',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='StandingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matchday', models.DateField()),
+                ('taken_at', models.DateTimeField(auto_now=True)),
+                ('points', models.BinaryField()),
+                ('ranks', models.BinaryField()),
+                ('competition', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='api.competition')),
+            ],
+            options={
+                'unique_together': {('competition', 'matchday')},
+            },
+        ),
+    ]
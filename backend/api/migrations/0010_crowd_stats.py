@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_league'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BonusQuestionCrowdStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answer_count', models.PositiveIntegerField(default=0)),
+                ('distribution', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='crowd_stats', to='api.bonusquestion')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='GameCrowdStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('guess_count', models.PositiveIntegerField(default=0)),
+                ('home_wins', models.PositiveIntegerField(default=0)),
+                ('draws', models.PositiveIntegerField(default=0)),
+                ('away_wins', models.PositiveIntegerField(default=0)),
+                ('avg_home', models.FloatField(blank=True, null=True)),
+                ('avg_away', models.FloatField(blank=True, null=True)),
+                ('top_scores', models.JSONField(default=list)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='crowd_stats', to='api.game')),
+            ],
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_game_schedule_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('game', 'Game'), ('guess', 'Guess'), ('bonus-answer', 'Bonus answer')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('competition_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('user_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='userbonusanswer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='userguess',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['updated_at'], name='game_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userbonusanswer',
+            index=models.Index(fields=['user', 'updated_at'], name='answer_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userguess',
+            index=models.Index(fields=['user', 'updated_at'], name='guess_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'deleted_at'], name='tombstone_kind_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Cast, Upper
+
+# Matches the SQL of `email__iexact` on Postgres, UPPER("email"::text),
+# so registration and password-reset lookups don't scan auth_user
+EMAIL_INDEX = models.Index(Upper(Cast("email", models.TextField())), name="user_email_upper_idx")
+
+
+def add_email_index(apps, schema_editor):
+    # Other backends compile iexact to LIKE, which this index can't serve
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("auth", "User"), EMAIL_INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("auth", "User"), EMAIL_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_delta_sync'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Added before the plain match_id index goes, which it replaces
+        migrations.AddIndex(
+            model_name='userguess',
+            index=models.Index(fields=['match', 'user'], include=('guess_home', 'guess_away'), name='guess_match_user_idx'),
+        ),
+        migrations.AlterField(
+            model_name='userguess',
+            name='match',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='guesses', to='api.game'),
+        ),
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
@@ -1,3 +1,5 @@
+import secrets
+
 from django.db import models
 from django.contrib.auth import get_user_model
 
@@ -71,9 +73,14 @@ class UserBonusAnswer(models.Model):
         blank=True,
         related_name="user_answers"
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("user", "question")  # only one guess per question
+        indexes = [
+            # ?since= delta sync (api.sync)
+            models.Index(fields=["user", "updated_at"], name="answer_user_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} → {self.question} : {self.answer}"
@@ -113,19 +120,38 @@ class Game(models.Model):
     group = models.CharField(max_length=2)
     venue = models.CharField(max_length=200, blank=True, null=True)
     competition = models.ForeignKey(Competition, on_delete=models.SET_NULL, null=True, blank=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination (api.pagination) with and without ?competition=
+            models.Index(fields=["match_date", "id"], name="game_schedule_idx"),
+            models.Index(fields=["competition", "match_date", "id"], name="game_competition_schedule_idx"),
+            # ?since= delta sync (api.sync)
+            models.Index(fields=["updated_at"], name="game_updated_idx"),
+        ]
 
     def __str__(self):
         return f"{self.team_home} vs {self.team_away} on {self.match_date}"
 
 class UserGuess(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='guesses')
-    match = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='guesses')
+    # Indexed by guess_match_user_idx below
+    match = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='guesses', db_index=False)
     guess_home = models.PositiveIntegerField(blank=True, null=True)
     guess_away = models.PositiveIntegerField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('user', 'match')
+        indexes = [
+            # ?since= delta sync (api.sync)
+            models.Index(fields=["user", "updated_at"], name="guess_user_updated_idx"),
+            # Scoring a competition or a single match (standings, crowd stats)
+            # reads the guesses from the index alone
+            models.Index(fields=["match", "user"], include=["guess_home", "guess_away"], name="guess_match_user_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s guess for {self.match}"
@@ -134,3 +160,139 @@ class UserGuess(models.Model):
     def lock_datetime(self):
         return self.match.match_date
 
+
+class Tombstone(models.Model):
+    """
+    Records a deleted game, guess or bonus answer so ?since= delta sync
+    (api.sync) can tell clients to drop it. A game moved to another
+    competition (and its guesses) gets one for the old competition too. Plain ids rather than foreign
+    keys, since the rows they point to are gone.
+    """
+    GAME = "game"
+    GUESS = "guess"
+    BONUS_ANSWER = "bonus-answer"
+    KIND_CHOICES = [
+        (GAME, "Game"),
+        (GUESS, "Guess"),
+        (BONUS_ANSWER, "Bonus answer"),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    competition_id = models.PositiveIntegerField(blank=True, null=True)
+    user_id = models.PositiveIntegerField(blank=True, null=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "deleted_at"], name="tombstone_kind_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
+
+
+class Standing(models.Model):
+    """
+    Persisted leaderboard row per user per competition.
+
+    Kept up to date by delta in api.signals whenever a result, a correct
+    bonus answer or a user's own guesses change. `rebuild_standings`
+    recomputes the table from scratch.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="standings")
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="standings")
+    points = models.IntegerField(default=0)
+    match_points = models.IntegerField(default=0)
+    bonus_points = models.IntegerField(default=0)
+    exact = models.IntegerField(default=0)
+    one_score = models.IntegerField(default=0)
+    correct_results = models.IntegerField(default=0)
+    total_guesses = models.IntegerField(default=0)
+    correct_bonus = models.IntegerField(default=0)
+    total_bonus = models.IntegerField(default=0)
+    # position of this user in the competition's StandingSnapshot arrays
+    snapshot_slot = models.PositiveIntegerField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "competition")
+        indexes = [
+            models.Index(fields=["competition", "-points", "-exact"], name="standing_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} @ {self.competition}: {self.points}"
+
+
+class StandingSnapshot(models.Model):
+    """
+    Points and ranks of a whole competition after a matchday is finalised.
+
+    Stored as packed int32 arrays indexed by Standing.snapshot_slot, so a
+    snapshot is a single row no matter how many users take part
+    (see api.history).
+    """
+    competition = models.ForeignKey(Competition, on_delete=models.CASCADE, related_name="snapshots")
+    matchday = models.DateField()
+    taken_at = models.DateTimeField(auto_now=True)
+    points = models.BinaryField()
+    ranks = models.BinaryField()
+
+    class Meta:
+        unique_together = ("competition", "matchday")
+
+    def __str__(self):
+        return f"{self.competition} after {self.matchday}"
+
+
+def generate_invite_code():
+    return secrets.token_urlsafe(6)
+
+
+class League(models.Model):
+    """
+    A private group of users (office, family, friends pool). Its table is
+    the competition standings filtered to the members.
+    """
+    name = models.CharField(max_length=100)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="owned_leagues")
+    members = models.ManyToManyField(User, related_name="leagues", blank=True)
+    invite_code = models.CharField(max_length=12, unique=True, default=generate_invite_code)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class GameCrowdStats(models.Model):
+    """
+    How everyone guessed a game, computed once after it locks (see api.crowd).
+    """
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, related_name="crowd_stats")
+    guess_count = models.PositiveIntegerField(default=0)
+    home_wins = models.PositiveIntegerField(default=0)
+    draws = models.PositiveIntegerField(default=0)
+    away_wins = models.PositiveIntegerField(default=0)
+    avg_home = models.FloatField(blank=True, null=True)
+    avg_away = models.FloatField(blank=True, null=True)
+    # [{"score_home": 28, "score_away": 26, "count": 12}, ...] most common first
+    top_scores = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Crowd stats for {self.game}"
+
+
+class BonusQuestionCrowdStats(models.Model):
+    """
+    Answer distribution of a bonus question, computed once after it locks.
+    """
+    question = models.OneToOneField(BonusQuestion, on_delete=models.CASCADE, related_name="crowd_stats")
+    answer_count = models.PositiveIntegerField(default=0)
+    # [{"id": <BonusQuestionChoices id>, "choice": "Iceland", "count": 40}, ...] most common first
+    distribution = models.JSONField(default=list)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Crowd stats for {self.question}"
@@ -0,0 +1,27 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ScheduleCursorPagination(CursorPagination):
+    """
+    Keyset pagination in kick-off order. The cursor stores the last
+    match_date seen (plus an offset among equal dates), so deep pages cost
+    the same as the first one and rows inserted meanwhile don't shift pages.
+
+    Opt-in: only requests with ?cursor= or ?page_size= are paginated, so
+    clients that expect a plain list keep getting one.
+    """
+    ordering = ("match_date", "id")
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def is_requested(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or self.page_size_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
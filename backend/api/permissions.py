@@ -1,6 +1,8 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 from django.utils import timezone
 
+from api.locks import lock_datetime_of
+
 class IsOwner(BasePermission):
     """
     Custom permission to only allow owners of an object to view/edit it.
@@ -8,7 +10,7 @@ class IsOwner(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # Read/write permissions only to the owner
-        return obj.user == request.user
+        return obj.user_id == request.user.id
 
 
 class IsStaffOrReadOnly(BasePermission):
@@ -32,7 +34,7 @@ class IsStaffOrReadOnly(BasePermission):
 class BeforeObjectDatePermission(BasePermission):
     """
     Allows SAFE_METHODS always.
-    Blocks write methods if obj.lock_datetime has passed.
+    Blocks write methods if obj's lock datetime has passed.
     """
 
     message = "The game or competition has already started."
@@ -41,10 +43,21 @@ class BeforeObjectDatePermission(BasePermission):
         if request.method in SAFE_METHODS:
             return True
 
-        # Expect the model to expose a datetime to check
-        lock_dt = getattr(obj, "lock_datetime", None)
+        # Guesses and answers are resolved from the in-memory lock index
+        lock_dt = lock_datetime_of(obj)
 
         if lock_dt is None:
             return True  # fail open if not configured
 
         return timezone.now() < lock_dt
+
+
+class IsLeagueOwnerOrReadOnly(BasePermission):
+    """
+    Members may read a league; only its owner may change or delete it.
+    """
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in SAFE_METHODS:
+            return True
+        return obj.owner_id == request.user.id
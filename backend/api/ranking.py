@@ -0,0 +1,107 @@
+"""
+In-memory rank index for paginated and "around me" leaderboards.
+
+Users are grouped into score buckets keyed by (points, exact), best bucket
+first. Everyone in a bucket shares a rank, so a user's rank is the number
+of users in better buckets plus one, and a page is found by bisecting the
+bucket start offsets. The index is built once per process per leaderboard
+version (see api.cache) and then answers requests without touching the
+database or sorting anything.
+"""
+import threading
+from bisect import bisect_left, bisect_right
+
+from api.cache import current_version
+from api.routers import primary_reads
+from api.standings import leaderboard_row, standing_rows
+
+
+class RankIndex:
+
+    def __init__(self, rows, version=None):
+        """
+        `rows` must already be ordered by (-points, -exact, user_id).
+        """
+        self.version = version
+        self.count = len(rows)
+        self.starts = []        # offset of the first user in each bucket
+        self.buckets = []       # rows per bucket, ordered by user_id
+        self.bucket_ids = []    # user ids per bucket, for bisecting
+        self.user_bucket = {}   # user_id -> bucket number
+
+        previous = None
+        for offset, row in enumerate(rows):
+            key = (row["points"], row["exact"])
+            if key != previous:
+                previous = key
+                self.starts.append(offset)
+                self.buckets.append([])
+                self.bucket_ids.append([])
+            self.buckets[-1].append(row)
+            self.bucket_ids[-1].append(row["user_id"])
+            self.user_bucket[row["user_id"]] = len(self.buckets) - 1
+
+    def rank_of(self, user_id):
+        bucket = self.user_bucket.get(user_id)
+        if bucket is None:
+            return None
+        return self.starts[bucket] + 1
+
+    def position_of(self, user_id):
+        bucket = self.user_bucket.get(user_id)
+        if bucket is None:
+            return None
+        return self.starts[bucket] + bisect_left(self.bucket_ids[bucket], user_id)
+
+    def slice(self, offset, limit):
+        """
+        Up to `limit` rows starting at `offset`, each with its shared rank.
+        """
+        results = []
+        if offset >= self.count or limit <= 0:
+            return results
+
+        bucket = bisect_right(self.starts, offset) - 1
+        index = offset - self.starts[bucket]
+        while bucket < len(self.buckets) and len(results) < limit:
+            rank = self.starts[bucket] + 1
+            for row in self.buckets[bucket][index:index + limit - len(results)]:
+                results.append({"rank": rank, **leaderboard_row(row)})
+            bucket, index = bucket + 1, 0
+        return results
+
+    def around(self, user_id, radius):
+        """
+        (my_row, neighbours): the user's row and `radius` rows either side.
+        """
+        position = self.position_of(user_id)
+        if position is None:
+            return None, []
+        start = max(0, position - radius)
+        neighbours = self.slice(start, position - start + radius + 1)
+        return neighbours[position - start], neighbours
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def get_rank_index(competition_id):
+    """
+    The process-local index for a competition, rebuilt when its
+    leaderboard version has moved on.
+    """
+    key = competition_id or None
+    version = current_version(key)
+
+    index = _indexes.get(key)
+    if index is not None and index.version == version:
+        return index
+
+    with _lock:
+        index = _indexes.get(key)
+        if index is None or index.version != version:
+            with primary_reads():
+                index = RankIndex(standing_rows(key), version)
+            _indexes[key] = index
+    return index
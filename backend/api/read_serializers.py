@@ -0,0 +1,99 @@
+"""
+Hand-written read serializers for the hot list paths.
+
+Each produces exactly the output of the ModelSerializer named in its
+docstring for the default field set (checked by `benchmark_serializers`)
+without per-request field introspection or nested serializer instances.
+They are read-only; writes keep going through api.serializers.
+"""
+from rest_framework import serializers
+
+_datetime = serializers.DateTimeField().to_representation
+
+
+def _expands(serializer, name):
+    fieldset = serializer.context.get("fieldset")
+    return fieldset is None or fieldset.expands(name)
+
+
+def team_row(team):
+    return {"name": team.name, "country_code": team.country_code, "flag_url": team.flag_url}
+
+
+def game_row(game):
+    return {
+        "id": game.id,
+        "team_home": team_row(game.team_home),
+        "team_away": team_row(game.team_away),
+        "match_date": _datetime(game.match_date),
+        "score_home": game.score_home,
+        "score_away": game.score_away,
+        "group": game.group,
+        "venue": game.venue,
+        "competition": game.competition_id,
+    }
+
+
+class TeamReadSerializer(serializers.BaseSerializer):
+    """
+    TeamSerializer.
+    """
+
+    def to_representation(self, team):
+        return team_row(team)
+
+
+class GameReadSerializer(serializers.BaseSerializer):
+    """
+    GameSerializer; expects team_home and team_away to be selected.
+    """
+
+    def to_representation(self, game):
+        return game_row(game)
+
+
+class GuessReadSerializer(serializers.BaseSerializer):
+    """
+    UserGuessSerializer. The nested match is looked up in
+    context["matches"] (id -> serialised game, e.g. the cached schedule)
+    and only serialised here if it's missing there.
+    """
+
+    def to_representation(self, guess):
+        match = guess.match_id
+        if _expands(self, "match"):
+            match = self.context.get("matches", {}).get(guess.match_id) or game_row(guess.match)
+        return {
+            "id": guess.id,
+            "match": match,
+            "guess_home": guess.guess_home,
+            "guess_away": guess.guess_away,
+            "created_at": _datetime(guess.created_at),
+            "user": guess.user_id,
+        }
+
+
+class BonusAnswerReadSerializer(serializers.BaseSerializer):
+    """
+    UserBonusAnswerSerializer.
+    """
+
+    def to_representation(self, answer):
+        return {
+            "id": answer.id,
+            "user": answer.user_id,
+            "question": answer.question_id,
+            "answer": answer.answer_id,
+        }
+
+
+class BonusQuestionChoiceReadSerializer(serializers.BaseSerializer):
+    """
+    BonusQuestionChoicesSerializer; expects choice to be selected when expanded.
+    """
+
+    def to_representation(self, option):
+        choice = option.choice_id
+        if _expands(self, "choice"):
+            choice = {"id": option.choice.id, "choice": option.choice.choice}
+        return {"id": option.id, "choice": choice, "question": option.question_id}
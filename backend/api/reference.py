@@ -0,0 +1,191 @@
+"""
+Reference-data cache for teams, competitions and the match schedule.
+
+These hardly change during a tournament, so each process keeps them
+pre-serialised (flag URLs and nested teams included) and rebuilds only
+when their versions move on:
+
+- teams:        "teams"
+- competitions: "competitions"
+- schedule:     "schedule" + "teams" for a rebuild; a change of "games"
+                alone means only scores changed, which are patched into
+                the existing payload with one narrow query.
+
+api.signals bumps "schedule" only when a game is added, removed or has
+anything other than its score changed. `warm()` fills everything up
+front (see gunicorn.conf.py) so a fresh worker doesn't pay for it on its
+first requests.
+"""
+import threading
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework.response import Response
+
+from api.cache import acurrent_version, acurrent_versions, current_version
+from api.catalog import bonus_catalog
+from api.locks import get_lock_index
+from api.models import Competition, Game, Team
+from api.read_serializers import GameReadSerializer, TeamReadSerializer
+from api.routers import primary_reads
+from api.serializers import CompetitionSerializer
+
+# Game fields whose change requires re-serialising the schedule
+SCHEDULE_FIELDS = ("team_home_id", "team_away_id", "match_date", "group", "venue", "competition_id")
+
+
+class Payload:
+    """
+    A serialised list plus an id -> item map for detail lookups.
+    """
+
+    def __init__(self, versions, ids, items):
+        self.versions = versions
+        self.items = items
+        self.by_id = dict(zip(ids, items))
+
+
+_payloads = {}
+_lock = threading.Lock()
+
+
+def _get(key, versions, build):
+    payload = _payloads.get(key)
+    if payload is not None and payload.versions == versions:
+        return payload
+
+    with _lock:
+        payload = _payloads.get(key)
+        if payload is None or payload.versions != versions:
+            with primary_reads():
+                payload = build(versions)
+            _payloads[key] = payload
+    return payload
+
+
+def _serialize(versions, queryset, serializer_class):
+    objects = list(queryset)
+    return Payload(versions, [obj.pk for obj in objects], list(serializer_class(objects, many=True).data))
+
+
+def team_payload():
+    versions = (current_version(None, "teams"),)
+    return _get("teams", versions, lambda v: _serialize(v, Team.objects.order_by("id"), TeamReadSerializer))
+
+
+def competition_payload():
+    versions = (current_version(None, "competitions"),)
+    return _get(
+        "competitions", versions, lambda v: _serialize(v, Competition.objects.order_by("id"), CompetitionSerializer)
+    )
+
+
+def _schedule_queryset(competition_id):
+    games = Game.objects.select_related("team_home", "team_away").order_by("match_date", "id")
+    if competition_id is not None:
+        games = games.filter(competition_id=competition_id)
+    return games
+
+
+def _patch_scores(payload, versions, competition_id):
+    games = Game.objects.all() if competition_id is None else Game.objects.filter(competition_id=competition_id)
+    scores = {game_id: (home, away) for game_id, home, away in games.values_list("id", "score_home", "score_away")}
+    if scores.keys() != payload.by_id.keys():
+        return None  # games were added or removed underneath us; rebuild
+
+    items = []
+    for game_id, item in payload.by_id.items():
+        home, away = scores[game_id]
+        if (item["score_home"], item["score_away"]) != (home, away):
+            item = {**item, "score_home": home, "score_away": away}
+        items.append(item)
+    return Payload(versions, list(payload.by_id), items)
+
+
+def schedule_payload(competition_id=None):
+    """
+    Serialised games of a competition (or all games), ordered by kick-off,
+    as `matches/` returns them.
+    """
+    key = ("schedule", competition_id)
+    versions = (
+        current_version(None, "schedule"),
+        current_version(None, "teams"),
+        current_version(None, "games"),
+    )
+
+    def build(versions):
+        previous = _payloads.get(key)
+        if previous is not None and previous.versions[:2] == versions[:2]:
+            patched = _patch_scores(previous, versions, competition_id)
+            if patched is not None:
+                return patched
+        return _serialize(versions, _schedule_queryset(competition_id), GameReadSerializer)
+
+    return _get(key, versions, build)
+
+
+# --------------------------
+# Async access (api.async_views)
+# --------------------------
+async def _aget(key, versions, load):
+    # Up-to-date payloads come straight from memory; (re)building runs the
+    # sync path, which serialises through the ORM
+    payload = _payloads.get(key)
+    if payload is not None and payload.versions == versions:
+        return payload
+    return await sync_to_async(load)()
+
+
+async def acompetition_payload():
+    versions = (await acurrent_version(None, "competitions"),)
+    return await _aget("competitions", versions, competition_payload)
+
+
+async def aschedule_payload(competition_id=None):
+    versions = tuple(await acurrent_versions(None, ("schedule", "teams", "games")))
+    return await _aget(("schedule", competition_id), versions, lambda: schedule_payload(competition_id))
+
+
+def warm():
+    """
+    Loads every reference payload (and the other per-process indexes)
+    so the first requests after a restart are served from memory.
+    """
+    team_payload()
+    schedule_payload()
+    get_lock_index()
+    for competition_id in competition_payload().by_id:
+        schedule_payload(competition_id)
+        bonus_catalog(competition_id)
+
+
+class ReferenceDataMixin:
+    """
+    Serves list and retrieve from a reference payload instead of the
+    queryset. Viewsets set `reference_payload` to the function returning
+    the full Payload (e.g. `staticmethod(team_payload)`), which serves
+    retrieve. `reference_data(request)` returns the Payload for a list
+    request, or None to fall back to the regular (filtered) list.
+    """
+
+    def reference_data(self, request):
+        return self.reference_payload()
+
+    def reference_detail_data(self):
+        return self.reference_payload()
+
+    def list(self, request, *args, **kwargs):
+        payload = self.reference_data(request)
+        if payload is None:
+            return super().list(request, *args, **kwargs)
+        return Response(payload.items)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = str(kwargs.get(self.lookup_url_kwarg or self.lookup_field, ""))
+        if not pk.isdigit():
+            return super().retrieve(request, *args, **kwargs)
+        item = self.reference_detail_data().by_id.get(int(pk))
+        if item is None:
+            raise Http404
+        return Response(item)
@@ -0,0 +1,46 @@
+"""
+Faster renderers for large payloads (matches/, scores/).
+
+ORJSONRenderer produces byte-for-byte the same output as DRF's
+JSONRenderer (compact separators, UTF-8, "Z" datetimes, Decimal as float,
+escaped U+2028/2029) but serialises in C. Types orjson doesn't handle the
+DRF way are handed to DRF's own JSONEncoder.default. Indented output
+(?format=json with an indent, the browsable API) falls back to DRF.
+
+MessagePackRenderer is an opt-in binary representation selected with
+`Accept: application/msgpack`; values are converted exactly as for JSON.
+"""
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
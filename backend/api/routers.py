@@ -0,0 +1,150 @@
+"""
+Read-replica routing.
+
+When settings.DATABASES has a "replica" alias, safe-method requests to
+the read-heavy endpoints (leaderboard, matches, teams, competitions,
+bonus questions) read from it; everything else uses "default".
+
+Reads stay on the primary when they might not see a user's own write:
+
+- within a request, once anything has been written;
+- for REPLICA_PIN_SECONDS after a request in which the user wrote
+  something, so a guess followed by a reload doesn't read a replica
+  that hasn't caught up yet.
+
+Payloads kept under a version counter (cached leaderboard, rank index,
+reference data, catalog, lock index) are built inside `primary_reads()`:
+the version is bumped on the primary's commit, and a lagging replica
+would otherwise get its old data cached under the new version.
+
+Outside a request (management commands, signals run from the shell)
+nothing is routed to the replica.
+"""
+import contextvars
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.decorators import sync_and_async_middleware
+from rest_framework import permissions
+
+PRIMARY = "default"
+REPLICA = "replica"
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+_state = contextvars.ContextVar("replica_routing", default=None)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.use_replica and not state.wrote:
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return db == PRIMARY
+
+
+def use_replica_for(request, user):
+    """
+    Sends the rest of this request's reads to the replica, if there is
+    one and it's safe for this request and user.
+    """
+    state = _state.get()
+    if state is None or state.wrote or not replica_configured():
+        return
+    if request.method not in permissions.SAFE_METHODS:
+        return
+    if user is not None and user.is_authenticated and cache.get(_pin_key(user.id)):
+        return
+    state.use_replica = True
+
+
+@contextmanager
+def primary_reads():
+    """
+    Reads inside the block go to the primary, whatever the request allows.
+    """
+    state = _state.get()
+    if state is None or not state.use_replica:
+        yield
+        return
+    state.use_replica = False
+    try:
+        yield
+    finally:
+        state.use_replica = True
+
+
+def _pin_if_wrote(request, state):
+    if not replica_configured():
+        return
+    user = getattr(request, "user", None)
+    if state.wrote and user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.id), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+@sync_and_async_middleware
+def ReplicaRoutingMiddleware(get_response):
+    """
+    Gives each request its own routing state and pins users who wrote
+    something to the primary for a while afterwards.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            state = RoutingState()
+            token = _state.set(state)
+            try:
+                response = await get_response(request)
+                await sync_to_async(_pin_if_wrote)(request, state)
+                return response
+            finally:
+                _state.reset(token)
+    else:
+        def middleware(request):
+            state = RoutingState()
+            token = _state.set(state)
+            try:
+                response = get_response(request)
+                _pin_if_wrote(request, state)
+                return response
+            finally:
+                _state.reset(token)
+    return middleware
+
+
+class ReplicaReadMixin:
+    """
+    Lets a viewset's safe-method requests read from the replica once the
+    user is authenticated (the user lookup itself stays on the primary).
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica_for(request, request.user)
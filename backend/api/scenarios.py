@@ -0,0 +1,211 @@
+"""
+What-if projections.
+
+The guesses for a competition's unplayed games are loaded per process
+into dense int32 arrays (users x games, -1 for a missing number)
+next to each user's current standing. A scenario is then scored for every
+user at once with the same 5/3/1 rules as api.scoring, without touching
+the database.
+"""
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from api.cache import current_version
+from api.models import (
+    BonusQuestion,
+    BonusQuestionChoices,
+    Game,
+    Standing,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.scoring import EXACT_POINTS, ONE_SCORE_POINTS, RESULT_POINTS
+
+MISSING = -1
+GUESS_REFRESH_SECONDS = 30  # how stale the guesses behind a projection may get
+
+
+def score_guesses(guess_home, guess_away, score_home, score_away):
+    """
+    Vectorised api.scoring.score_guess. Arguments broadcast against each
+    other (e.g. guesses (users, games) against scores (games,) or
+    (simulations, 1, games)); MISSING never matches.
+
+    Returns (points, exact) arrays of the broadcast shape.
+    """
+    home_correct = (guess_home != MISSING) & (guess_home == score_home)
+    away_correct = (guess_away != MISSING) & (guess_away == score_away)
+    result_correct = (
+        (guess_home != MISSING) & (guess_away != MISSING)
+        & (np.sign(guess_home - guess_away) == np.sign(score_home - score_away))
+    )
+    exact = home_correct & away_correct
+
+    points = np.where(
+        exact, EXACT_POINTS,
+        np.where(
+            result_correct & (home_correct | away_correct), ONE_SCORE_POINTS,
+            np.where(result_correct, RESULT_POINTS, 0),
+        ),
+    ).astype(np.int32)
+    return points, exact
+
+
+def rank(points, exact, user_ids):
+    """
+    Returns (order, ranks): indices best first by (-points, -exact, user_id)
+    and the shared rank ("1, 1, 3") of each position in that order.
+    """
+    order = np.lexsort((user_ids, -exact, -points))
+    sorted_points, sorted_exact = points[order], exact[order]
+
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = (sorted_points[1:] != sorted_points[:-1]) | (sorted_exact[1:] != sorted_exact[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(len(order)), 0))
+    return order, group_start + 1
+
+
+class CompetitionGuesses:
+    """
+    Current standings plus every user's guesses for the unplayed games and
+    answers to the bonus questions that have no correct choice yet.
+    """
+
+    def __init__(self, competition_id):
+        rows = list(
+            Standing.objects.filter(competition_id=competition_id)
+            .order_by("user_id")
+            .values_list("user_id", "user__username", "points", "exact")
+        )
+        self.user_ids = np.array([r[0] for r in rows], dtype=np.int64)
+        self.usernames = [r[1] for r in rows]
+        self.points = np.array([r[2] for r in rows], dtype=np.int32)
+        self.exact = np.array([r[3] for r in rows], dtype=np.int32)
+
+        self.game_ids = np.array(
+            sorted(
+                Game.objects.filter(competition_id=competition_id)
+                .exclude(score_home__isnull=False, score_away__isnull=False)
+                .values_list("id", flat=True)
+            ),
+            dtype=np.int64,
+        )
+
+        shape = (len(self.user_ids), len(self.game_ids))
+        self.guess_home = np.full(shape, MISSING, dtype=np.int32)
+        self.guess_away = np.full(shape, MISSING, dtype=np.int32)
+
+        user_index = {user_id: i for i, user_id in enumerate(self.user_ids.tolist())}
+        game_index = {game_id: j for j, game_id in enumerate(self.game_ids.tolist())}
+
+        guesses = UserGuess.objects.filter(match_id__in=game_index.keys()).values_list(
+            "user_id", "match_id", "guess_home", "guess_away"
+        )
+        for user_id, match_id, guess_home, guess_away in guesses.iterator(chunk_size=10_000):
+            i = user_index.get(user_id)
+            if i is None:
+                continue
+            j = game_index[match_id]
+            self.guess_home[i, j] = MISSING if guess_home is None else guess_home
+            self.guess_away[i, j] = MISSING if guess_away is None else guess_away
+
+        self.question_ids = np.array(
+            sorted(
+                BonusQuestion.objects.filter(competition_id=competition_id, correct_choice__isnull=True)
+                .values_list("id", flat=True)
+            ),
+            dtype=np.int64,
+        )
+        question_index = {question_id: k for k, question_id in enumerate(self.question_ids.tolist())}
+
+        self.question_choices = [[] for _ in question_index]
+        choices = BonusQuestionChoices.objects.filter(question_id__in=question_index.keys()).values_list(
+            "question_id", "id"
+        )
+        for question_id, choice_id in choices:
+            self.question_choices[question_index[question_id]].append(choice_id)
+
+        self.answers = np.full((len(self.user_ids), len(self.question_ids)), MISSING, dtype=np.int64)
+        answers = UserBonusAnswer.objects.filter(
+            question_id__in=question_index.keys(), answer__isnull=False
+        ).values_list("user_id", "question_id", "answer_id")
+        for user_id, question_id, answer_id in answers.iterator(chunk_size=10_000):
+            i = user_index.get(user_id)
+            if i is not None:
+                self.answers[i, question_index[question_id]] = answer_id
+
+    def game_columns(self, game_ids):
+        """
+        Column index of each game id; raises KeyError for played/unknown games.
+        """
+        positions = np.searchsorted(self.game_ids, game_ids)
+        for game_id, position in zip(game_ids, positions):
+            if position >= len(self.game_ids) or self.game_ids[position] != game_id:
+                raise KeyError(game_id)
+        return positions
+
+    def project(self, scores):
+        """
+        `scores` maps unplayed game id -> (score_home, score_away).
+        Returns (points, exact, gained) arrays aligned with self.user_ids.
+        """
+        game_ids = list(scores)
+        columns = self.game_columns(game_ids)
+        score_home = np.array([scores[g][0] for g in game_ids], dtype=np.int32)
+        score_away = np.array([scores[g][1] for g in game_ids], dtype=np.int32)
+
+        gained, exact = score_guesses(
+            self.guess_home[:, columns], self.guess_away[:, columns], score_home, score_away
+        )
+        gained = gained.sum(axis=1)
+        return self.points + gained, self.exact + exact.sum(axis=1), gained
+
+
+@dataclass(frozen=True)
+class Loaded:
+    versions: tuple  # (standings, guesses)
+    at: float        # time.monotonic() of the load
+    guesses: CompetitionGuesses
+
+    def is_current(self, versions):
+        if self.versions == versions:
+            return True
+        # Only guesses changed: fine until the refresh interval is up
+        return self.versions[0] == versions[0] and time.monotonic() - self.at < GUESS_REFRESH_SECONDS
+
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def get_competition_guesses(competition_id):
+    """
+    The process-local arrays for a competition. They are reloaded as soon
+    as its standings change, but changed guesses alone are picked up at
+    most every GUESS_REFRESH_SECONDS: before kick-off nearly every request
+    would otherwise find a new guess and reload the whole guess table.
+    While one thread reloads, the others keep using the previous arrays.
+    """
+    versions = (
+        current_version(competition_id),
+        current_version(competition_id, "guesses"),
+    )
+    entry = _loaded.get(competition_id)
+    if entry is not None and entry.is_current(versions):
+        return entry.guesses
+
+    if entry is None:
+        _lock.acquire()
+    elif not _lock.acquire(blocking=False):
+        return entry.guesses
+    try:
+        entry = _loaded.get(competition_id)
+        if entry is None or not entry.is_current(versions):
+            entry = Loaded(versions, time.monotonic(), CompetitionGuesses(competition_id))
+            _loaded[competition_id] = entry
+        return entry.guesses
+    finally:
+        _lock.release()
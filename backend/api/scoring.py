@@ -0,0 +1,59 @@
+"""
+Scoring rules for match guesses and bonus answers.
+
+These mirror the Case/When annotations used by the leaderboard so that
+standings can be updated in Python without re-aggregating every guess.
+"""
+
+EXACT_POINTS = 5
+ONE_SCORE_POINTS = 3
+RESULT_POINTS = 1
+BONUS_POINTS = 6
+
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+
+def score_guess(guess_home, guess_away, score_home, score_away):
+    """
+    Returns a dict with the contribution of one guess to a standing:
+      - match_points: 5 exact, 3 result + one number, 1 result, else 0
+      - exact / one_score / correct_results: 0 or 1
+
+    Missing values behave like SQL NULLs: they never match anything.
+    """
+    home_correct = guess_home is not None and guess_home == score_home
+    away_correct = guess_away is not None and guess_away == score_away
+
+    if None in (guess_home, guess_away, score_home, score_away):
+        result_correct = False
+    else:
+        result_correct = _sign(guess_home - guess_away) == _sign(score_home - score_away)
+
+    if home_correct and away_correct:
+        points = EXACT_POINTS
+    elif result_correct and (home_correct or away_correct):
+        points = ONE_SCORE_POINTS
+    elif result_correct:
+        points = RESULT_POINTS
+    else:
+        points = 0
+
+    return {
+        "match_points": points,
+        "exact": int(home_correct and away_correct),
+        "one_score": int(result_correct and home_correct != away_correct),
+        "correct_results": int(result_correct),
+    }
+
+
+def score_bonus(answer_id, correct_choice_id):
+    """
+    Returns the contribution of one bonus answer to a standing.
+    """
+    correct = answer_id is not None and answer_id == correct_choice_id
+    return {
+        "bonus_points": BONUS_POINTS if correct else 0,
+        "correct_bonus": int(correct),
+    }
@@ -4,8 +4,11 @@ from .models import (
     BonusChoices,
     BonusQuestion,
     BonusQuestionChoices,
+    BonusQuestionCrowdStats,
     Competition,
     Game,
+    GameCrowdStats,
+    League,
     Team,
     UserBonusAnswer,
     UserGuess,
@@ -71,17 +74,114 @@ class GameSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Game
-        fields = '__all__'
+        # updated_at only drives ?since= sync (api.sync); not part of the payload
+        exclude = ['updated_at']
 
 class UserGuessSerializer(serializers.ModelSerializer):
     match = GameSerializer(read_only=True)
 
     class Meta:
         model = UserGuess
-        fields = '__all__'
+        exclude = ['updated_at']
+
+# Upper bound on a guessed or hypothetical score
+MAX_SCORE = 999
+
 
 class UserGuessCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserGuess
         fields = ['id', 'match', 'guess_home', 'guess_away']
+        extra_kwargs = {
+            'guess_home': {'max_value': MAX_SCORE},
+            'guess_away': {'max_value': MAX_SCORE},
+        }
+
+
+
+class ScenarioScoreSerializer(serializers.Serializer):
+    match = serializers.IntegerField()
+    score_home = serializers.IntegerField(min_value=0, max_value=MAX_SCORE)
+    score_away = serializers.IntegerField(min_value=0, max_value=MAX_SCORE)
+
+
+class ScenarioSerializer(serializers.Serializer):
+    competition = serializers.IntegerField()
+    scores = ScenarioScoreSerializer(many=True, allow_empty=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+    def validate_scores(self, value):
+        matches = [item["match"] for item in value]
+        if len(matches) != len(set(matches)):
+            raise serializers.ValidationError("Each match may only appear once.")
+        return value
+
+
+MAX_BATCH_ITEMS = 500
+
+
+class GuessBatchItemSerializer(serializers.Serializer):
+    match = serializers.IntegerField()
+    guess_home = serializers.IntegerField(min_value=0, max_value=MAX_SCORE, allow_null=True)
+    guess_away = serializers.IntegerField(min_value=0, max_value=MAX_SCORE, allow_null=True)
+
+
+class GuessBatchSerializer(serializers.Serializer):
+    items = GuessBatchItemSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_ITEMS)
+
+    def validate_items(self, value):
+        matches = [item["match"] for item in value]
+        if len(matches) != len(set(matches)):
+            raise serializers.ValidationError("Each match may only appear once.")
+        return value
 
+
+class BonusAnswerBatchItemSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    answer = serializers.IntegerField(allow_null=True)
+
+
+class BonusAnswerBatchSerializer(serializers.Serializer):
+    items = BonusAnswerBatchItemSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_ITEMS)
+
+    def validate_items(self, value):
+        questions = [item["question"] for item in value]
+        if len(questions) != len(set(questions)):
+            raise serializers.ValidationError("Each question may only appear once.")
+        return value
+
+
+class LeagueSerializer(serializers.ModelSerializer):
+    owner = serializers.CharField(source="owner.username", read_only=True)
+    member_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = League
+        fields = ["id", "name", "owner", "invite_code", "member_count", "created_at"]
+        read_only_fields = ["invite_code", "created_at"]
+
+
+class JoinLeagueSerializer(serializers.Serializer):
+    invite_code = serializers.CharField(max_length=12)
+
+
+class GameCrowdStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GameCrowdStats
+        fields = [
+            "game",
+            "guess_count",
+            "home_wins",
+            "draws",
+            "away_wins",
+            "avg_home",
+            "avg_away",
+            "top_scores",
+            "computed_at",
+        ]
+
+
+class BonusQuestionCrowdStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BonusQuestionCrowdStats
+        fields = ["question", "answer_count", "distribution", "computed_at"]
@@ -0,0 +1,232 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from api.models import (
+    BonusChoices,
+    BonusQuestion,
+    BonusQuestionChoices,
+    Competition,
+    Game,
+    Standing,
+    Team,
+    Tombstone,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.cache import bump_version
+from api.history import matchday_of, snapshot_if_matchday_complete
+from api.locks import match_lock, question_lock
+from api.reference import SCHEDULE_FIELDS
+from api.standings import (
+    apply_correct_choice,
+    apply_game_result,
+    rebuild_standings,
+    refresh_user_standing,
+)
+
+
+def _rebuild_moved(previous_competition_id, competition_id):
+    # Moving a game or question between competitions is rare: recompute both
+    for cid in {previous_competition_id, competition_id} - {None}:
+        rebuild_standings(cid)
+        _bump_on_commit(cid)
+
+
+def _bump_on_commit(competition_id, scope="leaderboard"):
+    transaction.on_commit(lambda: bump_version(competition_id, scope))
+
+
+# --------------------------
+# Results
+# --------------------------
+@receiver(pre_save, sender=Game)
+def remember_game_result(sender, instance, raw=False, **kwargs):
+    instance._previous = None
+    if raw or instance.pk is None:
+        return
+    instance._previous = (
+        Game.objects.filter(pk=instance.pk)
+        .values("score_home", "score_away", *SCHEDULE_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Game)
+def update_standings_for_game(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    if raw or previous is None:
+        return
+
+    if previous["competition_id"] != instance.competition_id:
+        _rebuild_moved(previous["competition_id"], instance.competition_id)
+        return
+
+    apply_game_result(instance, previous["score_home"], previous["score_away"])
+    _bump_on_commit(instance.competition_id)
+
+    result_changed = (previous["score_home"], previous["score_away"]) != (instance.score_home, instance.score_away)
+    if result_changed and instance.score_home is not None and instance.score_away is not None:
+        competition_id, matchday = instance.competition_id, matchday_of(instance)
+        transaction.on_commit(lambda: snapshot_if_matchday_complete(competition_id, matchday))
+
+
+# --------------------------
+# Correct bonus answers
+# --------------------------
+@receiver(pre_save, sender=BonusQuestion)
+def remember_correct_choice(sender, instance, raw=False, **kwargs):
+    instance._previous = None
+    if raw or instance.pk is None:
+        return
+    instance._previous = (
+        BonusQuestion.objects.filter(pk=instance.pk)
+        .values("correct_choice_id", "competition_id")
+        .first()
+    )
+
+
+@receiver(post_save, sender=BonusQuestion)
+def update_standings_for_bonus_question(sender, instance, created, raw=False, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    if raw or previous is None:
+        return
+
+    if previous["competition_id"] != instance.competition_id:
+        _rebuild_moved(previous["competition_id"], instance.competition_id)
+        return
+
+    apply_correct_choice(instance, previous["correct_choice_id"])
+    _bump_on_commit(instance.competition_id)
+
+
+# --------------------------
+# A user's own guesses and answers
+# --------------------------
+@receiver(post_save, sender=UserGuess)
+@receiver(post_delete, sender=UserGuess)
+def update_standing_for_guess(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    competition_id = Game.objects.filter(pk=instance.match_id).values_list("competition_id", flat=True).first()
+    if refresh_user_standing(instance.user_id, competition_id):
+        _bump_on_commit(competition_id)
+    _bump_on_commit(competition_id, "guesses")
+
+
+@receiver(post_save, sender=UserBonusAnswer)
+@receiver(post_delete, sender=UserBonusAnswer)
+def update_standing_for_bonus_answer(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    competition_id = (
+        BonusQuestion.objects.filter(pk=instance.question_id)
+        .values_list("competition_id", flat=True)
+        .first()
+    )
+    if refresh_user_standing(instance.user_id, competition_id):
+        _bump_on_commit(competition_id)
+    _bump_on_commit(competition_id, "guesses")
+
+
+@receiver(post_delete, sender=Standing)
+def update_cache_for_removed_standing(sender, instance, **kwargs):
+    # e.g. a user account was deleted
+    _bump_on_commit(instance.competition_id)
+
+
+# --------------------------
+# Reference data (api.reference)
+# --------------------------
+@receiver(post_save, sender=Game)
+def update_schedule_version(sender, instance, created, raw=False, **kwargs):
+    # Score-only changes are patched into the cached schedule instead
+    previous = getattr(instance, "_previous", None)
+    if created or previous is None or any(previous[f] != getattr(instance, f) for f in SCHEDULE_FIELDS):
+        _bump_on_commit(None, "schedule")
+
+
+@receiver(post_delete, sender=Game)
+def update_schedule_version_for_removed_game(sender, instance, **kwargs):
+    _bump_on_commit(None, "schedule")
+
+
+# --------------------------
+# Delta sync (api.sync)
+# --------------------------
+@receiver(post_delete, sender=Game)
+def record_removed_game(sender, instance, **kwargs):
+    Tombstone.objects.create(kind=Tombstone.GAME, object_id=instance.pk, competition_id=instance.competition_id)
+
+
+@receiver(post_save, sender=Game)
+def record_moved_game(sender, instance, created, raw=False, **kwargs):
+    # Gone from the old competition's schedule as far as its clients go
+    previous = getattr(instance, "_previous", None)
+    if raw or previous is None or previous["competition_id"] == instance.competition_id:
+        return
+    Tombstone.objects.create(
+        kind=Tombstone.GAME, object_id=instance.pk, competition_id=previous["competition_id"]
+    )
+    # Its guesses leave the old competition's guesses/ with it
+    Tombstone.objects.bulk_create(
+        Tombstone(kind=Tombstone.GUESS, object_id=guess_id, competition_id=previous["competition_id"], user_id=user_id)
+        for guess_id, user_id in UserGuess.objects.filter(match=instance).values_list("id", "user_id")
+    )
+    UserGuess.objects.filter(match=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=UserGuess)
+def record_removed_guess(sender, instance, **kwargs):
+    lock = match_lock(instance.match_id)
+    Tombstone.objects.create(
+        kind=Tombstone.GUESS,
+        object_id=instance.pk,
+        competition_id=lock.competition_id if lock else None,
+        user_id=instance.user_id,
+    )
+
+
+@receiver(post_delete, sender=UserBonusAnswer)
+def record_removed_bonus_answer(sender, instance, **kwargs):
+    lock = question_lock(instance.question_id)
+    Tombstone.objects.create(
+        kind=Tombstone.BONUS_ANSWER,
+        object_id=instance.pk,
+        competition_id=lock.competition_id if lock else None,
+        user_id=instance.user_id,
+    )
+
+
+# SET_NULL is applied with a queryset update, which skips auto_now
+@receiver(pre_delete, sender=Competition)
+def touch_games_of_removed_competition(sender, instance, **kwargs):
+    Game.objects.filter(competition=instance).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=BonusQuestionChoices)
+def touch_answers_of_removed_choice(sender, instance, **kwargs):
+    UserBonusAnswer.objects.filter(answer=instance).update(updated_at=timezone.now())
+
+
+# --------------------------
+# Conditional GET versions (api.conditional)
+# --------------------------
+ETAG_SCOPES = {
+    Team: "teams",
+    Competition: "competitions",
+    Game: "games",
+    BonusQuestion: "bonus-questions",
+    BonusQuestionChoices: "bonus-questions",
+    BonusChoices: "bonus-questions",
+}
+
+
+def bump_etag_scope(sender, **kwargs):
+    _bump_on_commit(None, ETAG_SCOPES[sender])
+
+
+for model in ETAG_SCOPES:
+    post_save.connect(bump_etag_scope, sender=model, dispatch_uid=f"etag-save-{model.__name__}")
+    post_delete.connect(bump_etag_scope, sender=model, dispatch_uid=f"etag-delete-{model.__name__}")
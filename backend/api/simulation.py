@@ -0,0 +1,172 @@
+"""
+Monte Carlo win probabilities.
+
+Each simulation draws a score for every unplayed game and a correct choice
+for every open bonus question from the crowd's own predictions (a random
+user's guess for that game or question, falling back to the competition's
+played results / a uniform choice). All users are scored for a batch of
+simulations at once with api.scenarios.score_guesses, and batches are
+spread over a process pool. Simulating takes far longer than a request
+may, so only `simulate_competition` computes; the endpoint serves what it
+stored, the previous payload until a changed standing is simulated again.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.utils import timezone
+
+from api.cache import store_payload, stored_payload
+from api.models import Game
+from api.scenarios import MISSING, CompetitionGuesses, score_guesses
+from api.scoring import BONUS_POINTS
+
+BATCH_CELLS = 2_000_000  # simulations x users x games scored per numpy pass
+CACHE_SCOPE = "winprob"
+TOP_N = (1, 3, 10)
+FALLBACK_GOALS = 27  # handball-ish mean when nothing else is known
+
+
+def _score_pools(guesses, played):
+    """
+    Per game: the (home, away) pairs to sample a simulated score from.
+    """
+    pools = []
+    for j in range(len(guesses.game_ids)):
+        home, away = guesses.guess_home[:, j], guesses.guess_away[:, j]
+        valid = (home != MISSING) & (away != MISSING)
+        if valid.any():
+            pools.append(np.stack([home[valid], away[valid]], axis=1))
+        elif len(played):
+            pools.append(played)
+        else:
+            pools.append(np.array([[FALLBACK_GOALS, FALLBACK_GOALS]], dtype=np.int32))
+    return pools
+
+
+def _choice_pools(guesses):
+    """
+    Per open bonus question: the choice ids to sample the correct one from.
+    """
+    pools = []
+    for k in range(len(guesses.question_ids)):
+        answered = guesses.answers[:, k]
+        answered = answered[answered != MISSING]
+        if len(answered):
+            pools.append(answered)
+        elif guesses.question_choices[k]:
+            pools.append(np.array(guesses.question_choices[k], dtype=np.int64))
+        else:
+            pools.append(np.array([MISSING], dtype=np.int64))
+    return pools
+
+
+def simulate_chunk(args):
+    """
+    Runs `n` simulations and returns, per user, how often they finished
+    in each TOP_N bucket. Module-level so it can run in a worker process.
+    """
+    (n, seed, points, exact, guess_home, guess_away, answers, score_pools, choice_pools) = args
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((len(TOP_N), len(points)), dtype=np.int64)
+    width = max(guess_home.shape[1], answers.shape[1], 1)
+    batch_size = max(1, BATCH_CELLS // max(len(points) * width, 1))
+
+    for start in range(0, n, batch_size):
+        size = min(batch_size, n - start)
+
+        # (size, games) simulated scores
+        if score_pools:
+            picks = [pool[rng.integers(len(pool), size=size)] for pool in score_pools]
+            score_home = np.stack([p[:, 0] for p in picks], axis=1)[:, None, :]
+            score_away = np.stack([p[:, 1] for p in picks], axis=1)[:, None, :]
+            game_points, game_exact = score_guesses(guess_home[None], guess_away[None], score_home, score_away)
+            total = points[None] + game_points.sum(axis=2)
+            total_exact = exact[None] + game_exact.sum(axis=2)
+        else:
+            total = np.repeat(points[None], size, axis=0)
+            total_exact = np.repeat(exact[None], size, axis=0)
+
+        # (size, questions) simulated correct choices
+        if choice_pools:
+            correct = np.stack([pool[rng.integers(len(pool), size=size)] for pool in choice_pools], axis=1)
+            hits = (answers[None] != MISSING) & (answers[None] == correct[:, None, :])
+            total = total + BONUS_POINTS * hits.sum(axis=2)
+
+        # Shared rank = 1 + users strictly ahead on (points, exact)
+        keys = total.astype(np.int64) * 100_000 + total_exact
+        for s in range(size):
+            ordered = np.sort(keys[s])
+            ranks = len(ordered) - np.searchsorted(ordered, keys[s], side="right") + 1
+            for t, top in enumerate(TOP_N):
+                counts[t] += ranks <= top
+
+    return counts
+
+
+def simulate(competition_id, simulations, processes=1, seed=None, chunk_size=500):
+    """
+    Returns the win-probability payload for a competition.
+    """
+    started = time.perf_counter()
+    guesses = CompetitionGuesses(competition_id)
+
+    played = np.array(
+        Game.objects.filter(competition_id=competition_id, score_home__isnull=False, score_away__isnull=False)
+        .values_list("score_home", "score_away"),
+        dtype=np.int32,
+    ).reshape(-1, 2)
+
+    shared = (
+        guesses.points, guesses.exact, guesses.guess_home, guesses.guess_away, guesses.answers,
+        _score_pools(guesses, played), _choice_pools(guesses),
+    )
+    sizes = [min(chunk_size, simulations - start) for start in range(0, simulations, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    chunks = [(size, chunk_seed) + shared for size, chunk_seed in zip(sizes, seeds)]
+
+    counts = np.zeros((len(TOP_N), len(guesses.user_ids)), dtype=np.int64)
+    if processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for chunk_counts in pool.map(simulate_chunk, chunks):
+                counts += chunk_counts
+    else:
+        for chunk in chunks:
+            counts += simulate_chunk(chunk)
+
+    probabilities = counts / max(simulations, 1)
+    order = np.lexsort((-probabilities[2], -probabilities[1], -probabilities[0]))
+    results = [
+        {
+            "user": guesses.usernames[i],
+            "p_first": round(float(probabilities[0, i]), 4),
+            "p_top3": round(float(probabilities[1, i]), 4),
+            "p_top10": round(float(probabilities[2, i]), 4),
+        }
+        for i in order
+    ]
+
+    return {
+        "competition": int(competition_id),
+        "simulations": simulations,
+        "remaining_games": len(guesses.game_ids),
+        "open_bonus_questions": len(guesses.question_ids),
+        "computed_at": timezone.now().isoformat(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "results": results,
+    }
+
+
+def cached_probabilities(competition_id):
+    """
+    (payload or None, CacheStatus) of the competition's win probabilities
+    as `simulate_competition` last stored them: STALE once the standings
+    have changed since (a result or correct bonus answer), None before
+    the first run. Guesses on unplayed games don't make it stale; a
+    scheduled `simulate_competition --max-age` picks them up.
+    """
+    return stored_payload(competition_id, CACHE_SCOPE)
+
+
+def store_probabilities(competition_id, version, payload):
+    store_payload(competition_id, version, payload, CACHE_SCOPE)
@@ -0,0 +1,518 @@
+"""
+Incrementally maintained standings.
+
+The leaderboard reads `Standing` rows instead of aggregating every guess
+per request. Rows are shifted by delta when a result or a correct bonus
+answer changes, and recomputed per user when that user's guesses change.
+`compute_standings` is the from-scratch aggregation (a single ranked SQL
+query) used by the `rebuild_standings` command to verify and repair the
+stored rows.
+"""
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import (
+    F,
+    Case,
+    When,
+    IntegerField,
+    Value,
+    Count,
+    Sum,
+)
+
+from api.models import (
+    BonusQuestion,
+    Game,
+    Standing,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.scoring import (
+    BONUS_POINTS,
+    EXACT_POINTS,
+    ONE_SCORE_POINTS,
+    RESULT_POINTS,
+    score_bonus,
+    score_guess,
+)
+
+User = get_user_model()
+
+STAT_FIELDS = (
+    "match_points",
+    "bonus_points",
+    "exact",
+    "one_score",
+    "correct_results",
+    "total_guesses",
+    "correct_bonus",
+    "total_bonus",
+)
+
+LEADERBOARD_FIELDS = (
+    "points",
+    "match_points",
+    "bonus_points",
+    "exact",
+    "one_score",
+    "correct_bonus",
+)
+
+
+def annotate_guess_points(guesses):
+    """
+    Annotates a UserGuess queryset with home_correct, away_correct,
+    result_correct, points and one_score.
+    """
+    return guesses.annotate(
+        home_correct=Case(
+            When(guess_home=F('match__score_home'), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        ),
+        away_correct=Case(
+            When(guess_away=F('match__score_away'), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        ),
+        guess_diff=F('guess_home') - F('guess_away'),
+        real_diff=F('match__score_home') - F('match__score_away')
+    ).annotate(
+        result_correct=Case(
+            When(guess_diff__gt=0, real_diff__gt=0, then=Value(1)),
+            When(guess_diff__lt=0, real_diff__lt=0, then=Value(1)),
+            When(guess_diff=0, real_diff=0, then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    ).annotate(
+        points=Case(
+            When(home_correct=1, away_correct=1, then=Value(5)),        # exact
+            When(result_correct=1, home_correct=1, then=Value(3)),      # result + one number
+            When(result_correct=1, away_correct=1, then=Value(3)),      # result + one number
+            When(result_correct=1, then=Value(1)),                      # correct result
+            default=Value(0),
+            output_field=IntegerField()
+        ),
+        one_score=Case(
+            When(result_correct=1, then=Case(
+                When(home_correct=1, away_correct=0, then=Value(1)),
+                When(home_correct=0, away_correct=1, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField()
+            )),
+            default=Value(0),
+            output_field=IntegerField()
+        )
+    )
+
+
+def aggregate_guesses(guesses):
+    """
+    Per-user match totals for a UserGuess queryset.
+    """
+    return annotate_guess_points(guesses).values("user_id").annotate(
+        match_points=Sum("points"),
+        exact=Sum(Case(
+            When(home_correct=1, away_correct=1, then=1),
+            default=0,
+            output_field=IntegerField()
+        )),
+        one_score=Sum("one_score"),
+        total_guesses=Count("id"),
+        correct_results=Sum("result_correct"),
+    ).order_by()
+
+
+def aggregate_bonus_answers(answers):
+    """
+    Per-user bonus totals for a UserBonusAnswer queryset.
+    """
+    return answers.annotate(
+        is_correct=Case(
+            When(answer=F("question__correct_choice"), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField()
+        ),
+        bonus_points=F("is_correct") * 6
+    ).values("user_id").annotate(
+        total_bonus_points=Sum("bonus_points"),
+        correct_bonus=Sum("is_correct"),
+        total_bonus=Count("id")
+    ).order_by()
+
+
+def assign_ranks(rows):
+    """
+    Yields (rank, row) for rows already ordered by (-points, -exact).
+    Tied rows share a rank and the next rank is skipped ("1, 1, 3").
+    """
+    rank, previous = 0, None
+    for position, row in enumerate(rows, start=1):
+        key = (row["points"], row["exact"])
+        if key != previous:
+            rank, previous = position, key
+        yield rank, row
+
+
+def _standing_rows_query(competition_id, league_id):
+    # Returns the values() queryset and how to turn each row into a standing row
+    standings = Standing.objects.all()
+    if league_id:
+        standings = standings.filter(user__leagues=league_id)
+
+    if competition_id:
+        rows = standings.filter(competition_id=competition_id).order_by(
+            "-points", "-exact", "user_id"
+        ).values("user_id", "user__username", *LEADERBOARD_FIELDS)
+        return rows, None
+
+    rows = standings.values("user_id", "user__username").annotate(
+        **{f"total_{field}": Sum(field) for field in LEADERBOARD_FIELDS}
+    ).order_by("-total_points", "-total_exact", "user_id")
+    return rows, _summed_row
+
+
+def _summed_row(row):
+    return {
+        "user_id": row["user_id"],
+        "user__username": row["user__username"],
+        **{f: row[f"total_{f}"] for f in LEADERBOARD_FIELDS},
+    }
+
+
+def standing_rows(competition_id=None, league_id=None):
+    """
+    Leaderboard rows with user_id, best first. Without a competition each
+    user's rows are summed across competitions. With a league only its
+    members are read, via the membership table, so the cost depends on
+    the league size rather than the size of the whole pool.
+    """
+    rows, convert = _standing_rows_query(competition_id, league_id)
+    if convert is None:
+        return list(rows)
+    return [convert(row) for row in rows]
+
+
+async def astanding_rows(competition_id=None, league_id=None):
+    """
+    `standing_rows` through the async ORM.
+    """
+    rows, convert = _standing_rows_query(competition_id, league_id)
+    if convert is None:
+        return [row async for row in rows]
+    return [convert(row) async for row in rows]
+
+
+def leaderboard_row(row):
+    return {"user": row["user__username"], **{f: row[f] for f in LEADERBOARD_FIELDS}}
+
+
+def leaderboard_rows(competition_id=None):
+    """
+    The leaderboard payload, best first.
+    """
+    return [leaderboard_row(row) for row in standing_rows(competition_id)]
+
+
+async def aleaderboard_rows(competition_id=None):
+    return [leaderboard_row(row) for row in await astanding_rows(competition_id)]
+
+
+def _empty_stats():
+    return dict.fromkeys(STAT_FIELDS, 0)
+
+
+def _merge(guess_rows, bonus_rows):
+    stats = defaultdict(_empty_stats)
+
+    for row in guess_rows:
+        s = stats[row["user_id"]]
+        s["match_points"] = row["match_points"] or 0
+        s["exact"] = row["exact"] or 0
+        s["one_score"] = row["one_score"] or 0
+        s["correct_results"] = row["correct_results"] or 0
+        s["total_guesses"] = row["total_guesses"]
+
+    for row in bonus_rows:
+        s = stats[row["user_id"]]
+        s["bonus_points"] = row["total_bonus_points"] or 0
+        s["correct_bonus"] = row["correct_bonus"] or 0
+        s["total_bonus"] = row["total_bonus"]
+
+    return dict(stats)
+
+
+def compute_standings_orm(competition_id):
+    """
+    From-scratch totals using the two ORM aggregations merged in Python.
+    Kept as the reference implementation for `benchmark_leaderboard`.
+    """
+    return _merge(
+        aggregate_guesses(UserGuess.objects.filter(match__competition_id=competition_id)),
+        aggregate_bonus_answers(UserBonusAnswer.objects.filter(question__competition_id=competition_id)),
+    )
+
+
+RANKED_LEADERBOARD_SQL = """
+WITH guess_points AS (
+    SELECT g.user_id,
+           CASE WHEN g.guess_home = m.score_home THEN 1 ELSE 0 END AS home_correct,
+           CASE WHEN g.guess_away = m.score_away THEN 1 ELSE 0 END AS away_correct,
+           CASE
+               WHEN g.guess_home - g.guess_away > 0 AND m.score_home - m.score_away > 0 THEN 1
+               WHEN g.guess_home - g.guess_away < 0 AND m.score_home - m.score_away < 0 THEN 1
+               WHEN g.guess_home - g.guess_away = 0 AND m.score_home - m.score_away = 0 THEN 1
+               ELSE 0
+           END AS result_correct
+    FROM {guess} g
+    JOIN {game} m ON m.id = g.match_id
+    {guess_filter}
+),
+match_totals AS (
+    SELECT user_id,
+           SUM(CASE
+                   WHEN home_correct = 1 AND away_correct = 1 THEN %(exact_points)s
+                   WHEN result_correct = 1 AND (home_correct = 1 OR away_correct = 1) THEN %(one_score_points)s
+                   WHEN result_correct = 1 THEN %(result_points)s
+                   ELSE 0
+               END) AS match_points,
+           SUM(CASE WHEN home_correct = 1 AND away_correct = 1 THEN 1 ELSE 0 END) AS exact,
+           SUM(CASE WHEN result_correct = 1 AND home_correct <> away_correct THEN 1 ELSE 0 END) AS one_score,
+           SUM(result_correct) AS correct_results,
+           COUNT(*) AS total_guesses
+    FROM guess_points
+    GROUP BY user_id
+),
+bonus_totals AS (
+    SELECT a.user_id,
+           SUM(CASE WHEN a.answer_id = q.correct_choice_id THEN 1 ELSE 0 END) AS correct_bonus,
+           COUNT(*) AS total_bonus
+    FROM {answer} a
+    JOIN {question} q ON q.id = a.question_id
+    {answer_filter}
+    GROUP BY a.user_id
+),
+merged AS (
+    SELECT COALESCE(mt.user_id, bt.user_id) AS user_id,
+           COALESCE(mt.match_points, 0) AS match_points,
+           COALESCE(bt.correct_bonus, 0) * %(bonus_points)s AS bonus_points,
+           COALESCE(mt.exact, 0) AS exact,
+           COALESCE(mt.one_score, 0) AS one_score,
+           COALESCE(mt.correct_results, 0) AS correct_results,
+           COALESCE(mt.total_guesses, 0) AS total_guesses,
+           COALESCE(bt.correct_bonus, 0) AS correct_bonus,
+           COALESCE(bt.total_bonus, 0) AS total_bonus
+    FROM match_totals mt
+    FULL OUTER JOIN bonus_totals bt ON bt.user_id = mt.user_id
+)
+SELECT merged.*,
+       u.{username} AS username,
+       merged.match_points + merged.bonus_points AS points,
+       RANK() OVER (
+           ORDER BY merged.match_points + merged.bonus_points DESC, merged.exact DESC
+       ) AS rank
+FROM merged
+JOIN {user} u ON u.id = merged.user_id
+ORDER BY rank, merged.user_id
+"""
+
+
+def ranked_leaderboard_query(competition_id=None):
+    """
+    (sql, params) of `ranked_leaderboard`.
+    """
+    qn = connection.ops.quote_name
+    sql = RANKED_LEADERBOARD_SQL.format(
+        guess=qn(UserGuess._meta.db_table),
+        game=qn(Game._meta.db_table),
+        answer=qn(UserBonusAnswer._meta.db_table),
+        question=qn(BonusQuestion._meta.db_table),
+        user=qn(User._meta.db_table),
+        username=qn(User.USERNAME_FIELD),
+        guess_filter="WHERE m.competition_id = %(competition_id)s" if competition_id else "",
+        answer_filter="WHERE q.competition_id = %(competition_id)s" if competition_id else "",
+    )
+    params = {
+        "competition_id": competition_id,
+        "exact_points": EXACT_POINTS,
+        "one_score_points": ONE_SCORE_POINTS,
+        "result_points": RESULT_POINTS,
+        "bonus_points": BONUS_POINTS,
+    }
+    return sql, params
+
+
+def ranked_leaderboard(competition_id=None):
+    """
+    The whole ranked table in a single query: CTEs score guesses and bonus
+    answers, a FULL OUTER JOIN merges them (so bonus-only users are kept)
+    and RANK() assigns shared ranks by (-points, -exact).
+    """
+    sql, params = ranked_leaderboard_query(competition_id)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def compute_standings(competition_id):
+    """
+    Recomputes every user's totals for a competition from scratch.
+    Returns {user_id: {stat: value}}.
+    """
+    return {
+        row["user_id"]: {field: row[field] for field in STAT_FIELDS}
+        for row in ranked_leaderboard(competition_id)
+    }
+
+
+def _set_stats(standing, stats):
+    for field in STAT_FIELDS:
+        setattr(standing, field, stats[field])
+    standing.points = standing.match_points + standing.bonus_points
+
+
+@transaction.atomic
+def rebuild_standings(competition_id, computed=None):
+    """
+    Replaces the stored standings of a competition with a fresh computation.
+    Returns (created, updated, deleted) counts.
+    """
+    if computed is None:
+        computed = compute_standings(competition_id)
+
+    existing = {
+        s.user_id: s
+        for s in Standing.objects.select_for_update().filter(competition_id=competition_id)
+    }
+
+    to_create, to_update = [], []
+    for user_id, stats in computed.items():
+        standing = existing.pop(user_id, None)
+        if standing is None:
+            standing = Standing(user_id=user_id, competition_id=competition_id)
+            to_create.append(standing)
+        else:
+            to_update.append(standing)
+        _set_stats(standing, stats)
+
+    Standing.objects.bulk_create(to_create)
+    Standing.objects.bulk_update(to_update, ("points",) + STAT_FIELDS)
+    Standing.objects.filter(id__in=[s.id for s in existing.values()]).delete()
+
+    return len(to_create), len(to_update), len(existing)
+
+
+def diff_standings(competition_id, computed):
+    """
+    Compares stored rows against `computed`.
+    Returns a list of (user_id, stored_stats_or_None, computed_stats_or_None).
+    """
+    stored = {
+        row.pop("user_id"): row
+        for row in Standing.objects.filter(competition_id=competition_id).values("user_id", *STAT_FIELDS)
+    }
+
+    mismatches = []
+    for user_id in sorted(stored.keys() | computed.keys()):
+        if stored.get(user_id) != computed.get(user_id):
+            mismatches.append((user_id, stored.get(user_id), computed.get(user_id)))
+    return mismatches
+
+
+@transaction.atomic
+def apply_deltas(competition_id, deltas):
+    """
+    Adds per-user stat deltas ({user_id: Counter}) to the stored standings.
+    """
+    deltas = {user_id: d for user_id, d in deltas.items() if any(d.values())}
+    if not deltas:
+        return
+
+    standings = {
+        s.user_id: s
+        for s in Standing.objects.select_for_update().filter(
+            competition_id=competition_id, user_id__in=deltas.keys()
+        )
+    }
+
+    to_create, to_update = [], []
+    for user_id, delta in deltas.items():
+        standing = standings.get(user_id)
+        if standing is None:
+            standing = Standing(user_id=user_id, competition_id=competition_id)
+            to_create.append(standing)
+        else:
+            to_update.append(standing)
+        for field, value in delta.items():
+            setattr(standing, field, getattr(standing, field) + value)
+        standing.points = standing.match_points + standing.bonus_points
+
+    Standing.objects.bulk_create(to_create)
+    Standing.objects.bulk_update(to_update, ("points",) + STAT_FIELDS)
+
+
+def apply_game_result(game, old_home, old_away):
+    """
+    Moves every guesser of `game` from the old score to the game's current score.
+    """
+    if game.competition_id is None:
+        return
+    if (old_home, old_away) == (game.score_home, game.score_away):
+        return
+
+    deltas = {}
+    for user_id, guess_home, guess_away in game.guesses.values_list("user_id", "guess_home", "guess_away"):
+        delta = Counter(score_guess(guess_home, guess_away, game.score_home, game.score_away))
+        delta.subtract(score_guess(guess_home, guess_away, old_home, old_away))
+        deltas[user_id] = delta
+
+    apply_deltas(game.competition_id, deltas)
+
+
+def apply_correct_choice(question, old_choice_id):
+    """
+    Moves bonus points from the previous correct choice to the current one.
+    """
+    if question.competition_id is None:
+        return
+    if old_choice_id == question.correct_choice_id:
+        return
+
+    deltas = {}
+    for user_id, answer_id in question.answers.values_list("user_id", "answer_id"):
+        delta = Counter(score_bonus(answer_id, question.correct_choice_id))
+        delta.subtract(score_bonus(answer_id, old_choice_id))
+        deltas[user_id] = delta
+
+    apply_deltas(question.competition_id, deltas)
+
+
+@transaction.atomic
+def refresh_user_standing(user_id, competition_id):
+    """
+    Recomputes a single user's row, e.g. after one of their guesses changed.
+    Returns True if the row as shown on the leaderboard changed.
+    """
+    if competition_id is None:
+        return False
+
+    stats = _merge(
+        aggregate_guesses(UserGuess.objects.filter(user_id=user_id, match__competition_id=competition_id)),
+        aggregate_bonus_answers(UserBonusAnswer.objects.filter(user_id=user_id, question__competition_id=competition_id)),
+    ).get(user_id)
+
+    if stats is None:
+        deleted, _ = Standing.objects.filter(user_id=user_id, competition_id=competition_id).delete()
+        return bool(deleted)
+
+    standing, created = Standing.objects.select_for_update().get_or_create(
+        user_id=user_id, competition_id=competition_id
+    )
+    before = [getattr(standing, field) for field in LEADERBOARD_FIELDS]
+    _set_stats(standing, stats)
+    standing.save()
+    return created or before != [getattr(standing, field) for field in LEADERBOARD_FIELDS]
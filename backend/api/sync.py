@@ -0,0 +1,95 @@
+"""
+Delta sync for polling clients.
+
+`GET matches/?since=<token>` (likewise guesses/ and bonus-answers/)
+returns only the rows whose `updated_at` moved on since the token, the
+ids deleted (or, for games, moved to another competition) since then
+(from Tombstone, written by api.signals) and a new token to send next
+time:
+
+    {"token": "...", "results": [...], "deleted": [12, 40]}
+
+`?since=0` returns everything and is how a client gets its first token.
+
+The token is the server time at the start of the previous sync. Rows
+are stamped when they're saved, not when their transaction commits, so
+each sync looks back SYNC_OVERLAP further than the token; a client may
+see the same row twice but never misses one. Tombstones are kept for
+SYNC_RETENTION (see `prune_tombstones`); older tokens get a 410 and the
+client reloads the full list.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.models import Tombstone
+
+SYNC_OVERLAP = timedelta(seconds=5)
+SYNC_RETENTION = timedelta(days=30)
+
+
+def make_token(at):
+    return str(int(at.timestamp() * 1_000_000))
+
+
+def parse_token(value):
+    if not value.isdigit():
+        raise ValidationError({"since": "Invalid sync token"})
+    try:
+        return datetime.fromtimestamp(int(value) / 1_000_000, tz=dt_timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        raise ValidationError({"since": "Invalid sync token"})
+
+
+def is_full_sync(token):
+    return token == "0"
+
+
+class DeltaSyncMixin:
+    """
+    Adds ?since= to a viewset's list. `tombstone_kind` names the deleted
+    rows to report; `get_tombstones(request)` narrows them to what this
+    client can see. Goes before ConditionalGetMixin in the bases: ?since=
+    responses carry a new token and may be a 410, so they never get a 304.
+    """
+    tombstone_kind = None
+
+    def get_tombstones(self, request):
+        tombstones = Tombstone.objects.filter(kind=self.tombstone_kind)
+        competition_id = request.query_params.get("competition", "")
+        if competition_id.isdigit():
+            tombstones = tombstones.filter(competition_id=int(competition_id))
+        return tombstones
+
+    def list(self, request, *args, **kwargs):
+        token = request.query_params.get("since")
+        if token is None:
+            return super().list(request, *args, **kwargs)
+
+        now = timezone.now()
+        rows = self.filter_queryset(self.get_queryset())
+        deleted = []
+        if not is_full_sync(token):
+            since = parse_token(token)
+            if since < now - SYNC_RETENTION:
+                return Response(
+                    {"error": "Sync token expired; reload the full list"}, status=status.HTTP_410_GONE
+                )
+            rows = rows.filter(updated_at__gte=since - SYNC_OVERLAP)
+            # A row that left this list and came back (a game moved
+            # between competitions and back) is in the results, not deleted
+            deleted = list(
+                self.get_tombstones(request)
+                .filter(deleted_at__gte=since - SYNC_OVERLAP)
+                .exclude(object_id__in=rows.values("id"))
+                .values_list("object_id", flat=True)
+                .distinct()
+            )
+
+        results = self.get_serializer(rows, many=True).data
+        if hasattr(self, "select_fields"):
+            results = self.select_fields(results)
+        return Response({"token": make_token(now), "results": results, "deleted": deleted})
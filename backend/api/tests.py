@@ -0,0 +1,1211 @@
+import asyncio
+import random
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
+
+import msgpack
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api import reference
+from api.cache import current_version
+from api.crowd import compute_game_stats, is_locked
+from api.events import SUBSCRIBER_BUFFER, Broker
+from api.models import (
+    BonusChoices,
+    BonusQuestion,
+    BonusQuestionChoices,
+    Competition,
+    Game,
+    League,
+    Team,
+    UserBonusAnswer,
+    UserGuess,
+)
+from api.ranking import RankIndex
+from api.reference import warm
+from api.routers import PRIMARY, REPLICA, ReplicaRouter, replica_configured
+from api.simulation import simulate, store_probabilities
+from api.standings import (
+    LEADERBOARD_FIELDS,
+    STAT_FIELDS,
+    assign_ranks,
+    compute_standings,
+    compute_standings_orm,
+    diff_standings,
+    ranked_leaderboard,
+    rebuild_standings,
+)
+from api.sync import make_token
+
+User = get_user_model()
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "api-tests"}}
+
+# Tests other than ReplicaRoutingTests run as if no replica were configured
+# (api.routers.replica_configured): the mirror's own connection can't see
+# the rows of their uncommitted transaction
+NO_REPLICA = {PRIMARY: settings.DATABASES[PRIMARY]}
+
+
+def client_for(user):
+    client = APIClient()
+    if user is not None:
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    return client
+
+
+# --------------------------
+# Data
+# --------------------------
+def seed_competition(num_users):
+    """
+    A competition half played, with guesses, bonus answers, standings,
+    stored crowd stats and a league. Returns the objects tests need.
+    """
+    now = timezone.now()
+    competition = Competition.objects.create(
+        short_name="Budget", name="Query budget", start_date=now + timedelta(days=1)
+    )
+    teams = Team.objects.bulk_create(
+        [Team(name=f"budget-team-{i}", country_code="IS") for i in range(24)]
+    )
+    games = Game.objects.bulk_create([
+        Game(
+            team_home=teams[i % 24],
+            team_away=teams[(i + 5) % 24],
+            match_date=now + timedelta(hours=i - 30),
+            score_home=random.randint(20, 35) if i < 30 else None,
+            score_away=random.randint(20, 35) if i < 30 else None,
+            group="A",
+            venue="Arena",
+            competition=competition,
+        )
+        for i in range(60)
+    ])
+
+    choices = BonusChoices.objects.bulk_create([BonusChoices(choice=f"budget-choice-{i}") for i in range(24)])
+    questions = []
+    for i in range(7):
+        question = BonusQuestion.objects.create(question=f"budget-question-{i}", competition=competition)
+        options = BonusQuestionChoices.objects.bulk_create(
+            [BonusQuestionChoices(question=question, choice=choice) for choice in choices]
+        )
+        question.correct_choice = options[0]
+        question.save()
+        questions.append((question, options))
+
+    users = User.objects.bulk_create(
+        [User(username=f"budget-user-{i}", email=f"budget-user-{i}@example.com") for i in range(num_users)]
+    )
+    staff = User.objects.create(username="budget-staff", is_staff=True)
+
+    UserGuess.objects.bulk_create(
+        (
+            UserGuess(user=user, match=game, guess_home=random.randint(20, 35), guess_away=random.randint(20, 35))
+            for user in users
+            for game in games[:-1]
+        ),
+        batch_size=5000,
+    )
+    UserBonusAnswer.objects.bulk_create(
+        (
+            UserBonusAnswer(user=user, question=question, answer=random.choice(options))
+            for user in users
+            for question, options in questions[:-1]
+        ),
+        batch_size=5000,
+    )
+    rebuild_standings(competition.id)
+
+    # Stored as compute_crowd_stats would; games[0] is left for the crowd endpoint's first-request path
+    for game in games[1:]:
+        if is_locked(game.match_date):
+            compute_game_stats(game)
+
+    league = League.objects.create(name="budget-league", owner=users[0])
+    league.members.add(*users[:20])
+
+    me = users[0]
+    return {
+        "competition": competition,
+        "team": teams[0],
+        "games": games,
+        "choice": choices[0],
+        "questions": questions,
+        "me": me,
+        "staff": staff,
+        "league": league,
+        "guess": UserGuess.objects.filter(user=me, match=games[-2]).first(),
+        "answer": UserBonusAnswer.objects.filter(user=me).first(),
+    }
+
+
+# --------------------------
+# Query budgets
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class QueryBudgetTests(TestCase):
+    """
+    A fixed number of SQL queries for every endpoint in api/urls.py and
+    accounts/urls.py, so a serializer or view change that brings back
+    per-row queries fails the build. Requests run in order against one
+    seeded competition, as a warmed worker would serve them; the counts
+    include the savepoints of the views' atomic blocks.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(50)
+
+    def setUp(self):
+        cache.clear()
+        # A running worker has already been warmed (gunicorn.conf.py) and
+        # simulate_competition has stored the win probabilities
+        warm()
+        c = self.data["competition"].id
+        store_probabilities(c, current_version(c), simulate(c, 20, seed=1))
+
+    def test_endpoints_stay_within_budget(self):
+        for name, method, url, payload, user, budget in self.endpoints(self.data):
+            with self.subTest(name):
+                client = client_for(user)
+                with self.assertNumQueries(budget):
+                    response = getattr(client, method.lower())(url, payload, format="json")
+                self.assertLess(response.status_code, 400, response.content[:200])
+
+    def endpoints(self, d):
+        c = d["competition"].id
+        me, staff = d["me"], d["staff"]
+        open_game, played_game = d["games"][-1], d["games"][0]
+        since = make_token(timezone.now() - timedelta(minutes=10))
+        question, options = d["questions"][0]
+        open_question, open_options = d["questions"][-1]
+
+        # (name, method, url, payload, user, queries)
+        return [
+            # api/urls.py
+            ("api-root", "GET", "/api/", None, me, 1),
+            ("dashboard", "GET", f"/api/dashboard/?competition={c}", None, me, 3),
+            ("teams list", "GET", "/api/teams/", None, None, 0),
+            ("teams detail", "GET", f"/api/teams/{d['team'].id}/", None, None, 0),
+            ("matches list", "GET", f"/api/matches/?competition={c}", None, me, 1),
+            ("matches page", "GET", f"/api/matches/?competition={c}&page_size=20", None, me, 2),
+            ("matches sync", "GET", f"/api/matches/?competition={c}&since={since}", None, me, 3),
+            ("matches detail", "GET", f"/api/matches/{open_game.id}/", None, me, 1),
+            ("matches crowd", "GET", f"/api/matches/{played_game.id}/crowd/", None, me, 14),
+            ("matches crowd list", "GET", f"/api/matches/crowd/?competition={c}", None, me, 2),
+            ("matches update (result)", "PATCH", f"/api/matches/{open_game.id}/",
+             {"score_home": 30, "score_away": 28}, staff, 7),
+            ("guesses list", "GET", f"/api/guesses/?competition={c}", None, me, 2),
+            ("guesses list (sparse)", "GET", f"/api/guesses/?competition={c}&fields=id,match,guess_home,guess_away",
+             None, me, 2),
+            ("guesses page", "GET", f"/api/guesses/?competition={c}&page_size=20", None, me, 2),
+            ("guesses sync", "GET", f"/api/guesses/?competition={c}&since={since}", None, me, 3),
+            ("guesses detail", "GET", f"/api/guesses/{d['guess'].id}/", None, me, 2),
+            ("guesses create", "POST", "/api/guesses/",
+             {"match": open_game.id, "guess_home": 30, "guess_away": 29}, me, 10),
+            ("guesses update", "PATCH", f"/api/guesses/{d['guess'].id}/", {"guess_home": 31}, me, 10),
+            ("guesses batch", "POST", "/api/guesses/batch/",
+             {"items": [{"match": g.id, "guess_home": 28, "guess_away": 27} for g in d["games"][:50]]}, me, 10),
+            ("bonus-choices list", "GET", "/api/bonus-choices/", None, me, 2),
+            ("bonus-questions list", "GET", f"/api/bonus-questions/?competition={c}", None, me, 1),
+            ("bonus-questions detail", "GET", f"/api/bonus-questions/{question.id}/", None, me, 4),
+            ("bonus-questions set_correct", "POST", f"/api/bonus-questions/{open_question.id}/set_correct/",
+             {"choice_id": open_options[1].id}, staff, 10),
+            ("bonus-question-choices list", "GET", "/api/bonus-question-choices/", None, me, 2),
+            ("bonus-answers list", "GET", f"/api/bonus-answers/?competition={c}", None, me, 2),
+            ("bonus-answers detail", "GET", f"/api/bonus-answers/{d['answer'].id}/", None, me, 2),
+            ("bonus-answers create", "POST", "/api/bonus-answers/",
+             {"question": open_question.id, "answer": open_options[2].id}, me, 11),
+            ("bonus-answers batch", "POST", "/api/bonus-answers/batch/",
+             {"items": [{"question": q.id, "answer": o[3].id} for q, o in d["questions"]]}, me, 11),
+            ("competitions list", "GET", "/api/competitions/", None, me, 1),
+            ("competitions detail", "GET", f"/api/competitions/{c}/", None, me, 1),
+            ("leagues list", "GET", "/api/leagues/", None, me, 2),
+            ("leagues detail", "GET", f"/api/leagues/{d['league'].id}/", None, me, 2),
+            ("leagues join", "POST", "/api/leagues/join/", {"invite_code": d["league"].invite_code}, staff, 4),
+            ("scores", "GET", f"/api/scores/?competition={c}", None, me, 2),
+            ("scores page", "GET", f"/api/scores/?competition={c}&page=2&limit=20", None, me, 2),
+            ("scores around me", "GET", f"/api/scores/?competition={c}&around=me&radius=5", None, me, 1),
+            ("scores league", "GET", f"/api/scores/?competition={c}&league={d['league'].id}", None, me, 3),
+            ("scores history", "GET", f"/api/scores/history/?competition={c}", None, me, 2),
+            ("scores movement", "GET", f"/api/scores/movement/?competition={c}", None, me, 4),
+            ("scores what-if", "POST", "/api/scores/what-if/",
+             {"competition": c, "scores": [{"match": d["games"][-3].id, "score_home": 30, "score_away": 25}]}, me, 5),
+            ("scores win-probability", "GET", f"/api/scores/win-probability/?competition={c}", None, me, 1),
+            ("scores cache-stats", "GET", "/api/scores/cache-stats/", None, staff, 1),
+            # accounts/urls.py
+            ("auth me", "GET", "/api/auth/me/", None, me, 1),
+            ("auth register", "POST", "/api/auth/register/",
+             {"username": "budget-new", "email": "budget-new@example.com", "password": "a-Long-passw0rd"}, None, 3),
+            ("auth login", "POST", "/api/auth/login/",
+             {"username": "budget-new", "password": "a-Long-passw0rd"}, None, 1),
+            ("auth refresh", "POST", "/api/auth/refresh/",
+             {"refresh": str(RefreshToken.for_user(me))}, None, 1),
+            ("auth password-reset", "POST", "/api/auth/password-reset/",
+             {"email": me.email}, None, 4),
+        ]
+
+
+# --------------------------
+# Standings
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class StandingsTests(TestCase):
+    """
+    The stored standings are kept up to date with deltas by the signals in
+    api/signals.py; after any change they must match a full recomputation.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(10)
+
+    def assertInSync(self, competition):
+        self.assertEqual(diff_standings(competition.id, compute_standings(competition.id)), [])
+
+    def test_results(self):
+        games = self.data["games"]
+        played, unplayed = games[0], games[40]
+
+        unplayed.score_home, unplayed.score_away = 30, 28
+        unplayed.save()
+        self.assertInSync(self.data["competition"])
+
+        played.score_home, played.score_away = played.score_away, played.score_home + 1
+        played.save()
+        self.assertInSync(self.data["competition"])
+
+        played.score_home = played.score_away = None
+        played.save()
+        self.assertInSync(self.data["competition"])
+
+    def test_correct_choices(self):
+        question, options = self.data["questions"][0]
+
+        question.correct_choice = options[1]
+        question.save()
+        self.assertInSync(self.data["competition"])
+
+        question.correct_choice = None
+        question.save()
+        self.assertInSync(self.data["competition"])
+
+    def test_guesses_and_answers(self):
+        me, games = self.data["me"], self.data["games"]
+        played = games[0]
+        question, options = self.data["questions"][-1]
+
+        UserGuess.objects.create(user=me, match=games[-1], guess_home=30, guess_away=29)
+        guess = UserGuess.objects.get(user=me, match=played)
+        guess.guess_home, guess.guess_away = played.score_home, played.score_away
+        guess.save()
+        self.assertInSync(self.data["competition"])
+
+        UserBonusAnswer.objects.create(user=me, question=question, answer=options[0])
+        self.assertInSync(self.data["competition"])
+
+        guess.delete()
+        UserBonusAnswer.objects.filter(user=me).delete()
+        self.assertInSync(self.data["competition"])
+
+    def test_moved_game(self):
+        other = Competition.objects.create(short_name="Other", name="Other", start_date=timezone.now())
+        game = self.data["games"][0]
+
+        game.competition = other
+        game.save()
+        self.assertInSync(self.data["competition"])
+        self.assertInSync(other)
+
+
+# --------------------------
+# Ranked leaderboard
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class RankedLeaderboardTests(TestCase):
+    """
+    The raw-SQL ranked leaderboard must agree with the ORM aggregation it
+    replaced (compute_standings_orm) on every stat and on the shared ranks.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(40)
+        # Bonus answers only: kept by the FULL OUTER JOIN
+        question, options = cls.data["questions"][0]
+        cls.bonus_only = User.objects.create(username="bonus-only")
+        UserBonusAnswer.objects.create(user=cls.bonus_only, question=question, answer=options[0])
+
+    def test_matches_orm_aggregation(self):
+        c = self.data["competition"].id
+        expected = [
+            {"user_id": user_id, "points": s["match_points"] + s["bonus_points"], **s}
+            for user_id, s in compute_standings_orm(c).items()
+        ]
+        expected.sort(key=lambda row: (-row["points"], -row["exact"], row["user_id"]))
+        actual = ranked_leaderboard(c)
+
+        self.assertEqual(len(actual), len(expected))
+        self.assertIn(self.bonus_only.id, {row["user_id"] for row in actual})
+        for (rank, want), got in zip(assign_ranks(expected), actual):
+            with self.subTest(user=want["user_id"]):
+                for field in ("user_id", "points") + STAT_FIELDS:
+                    self.assertEqual(got[field], want[field], field)
+                self.assertEqual(got["rank"], rank)
+
+    def test_ties_share_a_rank(self):
+        rows = [
+            {"points": 10, "exact": 2},
+            {"points": 10, "exact": 2},
+            {"points": 10, "exact": 1},
+            {"points": 4, "exact": 0},
+        ]
+        self.assertEqual([rank for rank, _ in assign_ranks(rows)], [1, 1, 3, 4])
+
+
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class RankIndexTests(TestCase):
+    """
+    ?page/?limit and ?around=me are sliced from the rank index; together
+    the pages must be the full leaderboard, tied users share a rank, and
+    the index follows the standings when they change.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(25)
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.data["me"])
+        self.url = f"/api/scores/?competition={self.data['competition'].id}"
+
+    def pages(self, limit):
+        rows, page = [], 1
+        while True:
+            body = self.client.get(f"{self.url}&page={page}&limit={limit}").json()
+            if not body["results"]:
+                return body["count"], rows
+            rows += body["results"]
+            page += 1
+
+    def test_pages_make_up_the_leaderboard(self):
+        full = self.client.get(self.url).json()
+        count, rows = self.pages(7)
+
+        self.assertEqual(count, len(full))
+        self.assertEqual([{k: v for k, v in row.items() if k != "rank"} for row in rows], full)
+        self.assertEqual([row["rank"] for row in rows], [rank for rank, _ in assign_ranks(full)])
+
+    def test_around_me(self):
+        _, rows = self.pages(100)
+        position = next(i for i, row in enumerate(rows) if row["user"] == self.data["me"].username)
+
+        body = self.client.get(f"{self.url}&around=me&radius=3").json()
+        self.assertEqual(body["me"], rows[position])
+        self.assertEqual(body["results"], rows[max(0, position - 3):position + 4])
+
+    def test_ties_share_a_rank(self):
+        def row(user_id, points, exact):
+            return {"user_id": user_id, "user__username": f"user-{user_id}",
+                    **dict.fromkeys(LEADERBOARD_FIELDS, 0), "points": points, "exact": exact}
+
+        index = RankIndex([row(1, 10, 2), row(4, 10, 2), row(7, 10, 2), row(2, 10, 1), row(3, 4, 0)])
+        self.assertEqual([r["rank"] for r in index.slice(0, 10)], [1, 1, 1, 4, 5])
+        # A page starting inside a bucket keeps the bucket's rank
+        self.assertEqual([(r["user"], r["rank"]) for r in index.slice(2, 2)], [("user-7", 1), ("user-2", 4)])
+        self.assertEqual(index.rank_of(7), 1)
+        me, neighbours = index.around(2, 1)
+        self.assertEqual((me["user"], me["rank"]), ("user-2", 4))
+        self.assertEqual([r["user"] for r in neighbours], ["user-7", "user-2", "user-3"])
+
+    def test_follows_standings_changes(self):
+        me = self.data["me"]
+        before = self.client.get(f"{self.url}&around=me&radius=0").json()["me"]
+
+        guess = self.data["guess"]
+        game = guess.match
+        with self.captureOnCommitCallbacks(execute=True):
+            game.score_home, game.score_away = guess.guess_home, guess.guess_away
+            game.save()
+
+        after = self.client.get(f"{self.url}&around=me&radius=0").json()["me"]
+        self.assertEqual(after["exact"], before["exact"] + 1)
+        self.assertGreater(after["points"], before["points"])
+        _, rows = self.pages(100)
+        self.assertEqual(after, next(row for row in rows if row["user"] == me.username))
+
+
+# --------------------------
+# Batch upserts
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class BatchUpsertTests(TestCase):
+    """
+    /api/guesses/batch/ and /api/bonus-answers/batch/ create new rows,
+    update existing ones in place, report locked, unknown and invalid
+    items, and refresh the user's standing like the per-item signals.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(5)
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.data["me"])
+
+    def post(self, url, items):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {"items": items}, format="json")
+        self.assertEqual(response.status_code, 200, response.content[:200])
+        return {
+            result.get("match", result.get("question")): result
+            for result in response.json()["results"]
+        }
+
+    def test_guesses(self):
+        me, games = self.data["me"], self.data["games"]
+        played, open_game, new_game = games[0], games[-2], games[-1]
+        existing = UserGuess.objects.get(user=me, match=open_game)
+        locked = UserGuess.objects.get(user=me, match=played)
+
+        results = self.post("/api/guesses/batch/", [
+            {"match": open_game.id, "guess_home": 31, "guess_away": 30},
+            {"match": new_game.id, "guess_home": 25, "guess_away": 24},
+            {"match": played.id, "guess_home": 20, "guess_away": 20},
+            {"match": 0, "guess_home": 20, "guess_away": 20},
+        ])
+
+        self.assertEqual(results[open_game.id]["status"], "saved")
+        self.assertEqual(results[new_game.id]["status"], "saved")
+        self.assertEqual(results[played.id]["status"], "locked")
+        self.assertEqual(results[0]["status"], "not_found")
+
+        updated = UserGuess.objects.get(user=me, match=open_game)
+        self.assertEqual(updated.id, existing.id)
+        self.assertEqual((updated.guess_home, updated.guess_away), (31, 30))
+        self.assertTrue(UserGuess.objects.filter(user=me, match=new_game, guess_home=25, guess_away=24).exists())
+        self.assertEqual(UserGuess.objects.get(user=me, match=played).updated_at, locked.updated_at)
+        self.assertEqual(
+            diff_standings(self.data["competition"].id, compute_standings(self.data["competition"].id)), []
+        )
+
+    def test_duplicate_matches_are_rejected(self):
+        game = self.data["games"][-1]
+        item = {"match": game.id, "guess_home": 25, "guess_away": 24}
+        response = self.client.post("/api/guesses/batch/", {"items": [item, item]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_bonus_answers(self):
+        me = self.data["me"]
+        (answered, answered_options), (new, new_options) = self.data["questions"][0], self.data["questions"][-1]
+        existing = UserBonusAnswer.objects.get(user=me, question=answered)
+
+        results = self.post("/api/bonus-answers/batch/", [
+            {"question": answered.id, "answer": answered_options[5].id},
+            {"question": new.id, "answer": new_options[6].id},
+            {"question": self.data["questions"][1][0].id, "answer": new_options[0].id},
+        ])
+
+        self.assertEqual(results[answered.id]["status"], "saved")
+        self.assertEqual(results[new.id]["status"], "saved")
+        self.assertEqual(results[self.data["questions"][1][0].id]["status"], "invalid")
+
+        updated = UserBonusAnswer.objects.get(user=me, question=answered)
+        self.assertEqual(updated.id, existing.id)
+        self.assertEqual(updated.answer_id, answered_options[5].id)
+        self.assertEqual(UserBonusAnswer.objects.get(user=me, question=new).answer_id, new_options[6].id)
+        self.assertEqual(
+            diff_standings(self.data["competition"].id, compute_standings(self.data["competition"].id)), []
+        )
+
+
+# --------------------------
+# Locks
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class LockTests(TestCase):
+    """
+    Guesses lock at kick-off and bonus answers at the competition's start,
+    checked against the process-local lock index (api/locks.py), which
+    must follow schedule changes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(5)
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.data["me"])
+
+    def test_guesses_lock_at_kick_off(self):
+        me, games = self.data["me"], self.data["games"]
+        played, open_game = games[0], games[-1]
+        guess = UserGuess.objects.get(user=me, match=played)
+
+        response = self.client.post("/api/guesses/", {"match": played.id, "guess_home": 1, "guess_away": 0})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.patch(f"/api/guesses/{guess.id}/", {"guess_home": 1}, format="json")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.delete(f"/api/guesses/{guess.id}/")
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post("/api/guesses/", {"match": open_game.id, "guess_home": 1, "guess_away": 0})
+        self.assertEqual(response.status_code, 201)
+
+    def test_bonus_answers_lock_at_competition_start(self):
+        me, competition = self.data["me"], self.data["competition"]
+        question, options = self.data["questions"][-1]
+        answer = UserBonusAnswer.objects.filter(user=me).first()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            competition.start_date = timezone.now() - timedelta(minutes=1)
+            competition.save()
+
+        response = self.client.post("/api/bonus-answers/", {"question": question.id, "answer": options[0].id})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.patch(f"/api/bonus-answers/{answer.id}/", {"answer": None}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+    def test_moved_kick_off_locks_immediately(self):
+        game = self.data["games"][-1]
+        item = {"match": game.id, "guess_home": 1, "guess_away": 0}
+        response = self.client.post("/api/guesses/", item)
+        self.assertEqual(response.status_code, 201)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            game.match_date = timezone.now() - timedelta(minutes=1)
+            game.save()
+
+        guess = UserGuess.objects.get(user=self.data["me"], match=game)
+        response = self.client.patch(f"/api/guesses/{guess.id}/", {"guess_home": 2}, format="json")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post("/api/guesses/batch/", {"items": [item]}, format="json")
+        self.assertEqual(response.json()["results"][0]["status"], "locked")
+
+
+# --------------------------
+# Read replica
+# --------------------------
+@skipUnless(replica_configured(), 'Needs a "replica" alias (POSTGRES_REPLICA_HOST), mirrored to default in tests')
+@override_settings(CACHES=LOCMEM_CACHE, SECURE_SSL_REDIRECT=False)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Requests through the full middleware stack read from the replica when
+    it's safe and from the primary after a write. A TransactionTestCase,
+    so the mirror's own connection sees the seeded rows.
+    """
+
+    # Includes the replica when configured; the runner rejects unknown aliases even on skipped tests
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        random.seed(2026)
+        self.data = seed_competition(3)
+        c = self.data["competition"].id
+        # The plain leaderboard, schedule and catalog come from version-keyed
+        # caches that are always built on the primary
+        self.reads = [f"/api/matches/?competition={c}&page_size=20", "/api/bonus-questions/"]
+
+    def queries(self, method, url, user, payload=None):
+        """
+        (primary, replica) query counts of one request, savepoints aside.
+        """
+        with CaptureQueriesContext(connections[PRIMARY]) as primary, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(client_for(user), method.lower())(url, payload, format="json")
+        self.assertLess(response.status_code, 400, response.content[:200])
+        return tuple(
+            sum(not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT")) for query in captured)
+            for captured in (primary, replica)
+        )
+
+    def test_reads_use_the_replica(self):
+        for user in (None, self.data["me"]):
+            for url in self.reads:
+                with self.subTest(url, user=user):
+                    _, replica = self.queries("GET", url, user)
+                    self.assertGreater(replica, 0)
+
+    def test_writes_pin_the_user_to_the_primary(self):
+        me = self.data["me"]
+        _, replica = self.queries("POST", "/api/leagues/", me, {"name": "Replica check"})
+        self.assertEqual(replica, 0)
+
+        for url in self.reads:
+            with self.subTest(url):
+                _, replica = self.queries("GET", url, me)
+                self.assertEqual(replica, 0)
+                _, replica = self.queries("GET", url, None)
+                self.assertGreater(replica, 0)
+
+    def test_outside_requests_use_the_primary(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Game), PRIMARY)
+        self.assertEqual(router.db_for_write(Game), PRIMARY)
+        self.assertFalse(router.allow_migrate(REPLICA, "api"))
+
+
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class ReplicaPinTests(TestCase):
+    """
+    Without a replica there is nothing to pin a writer away from, so no
+    pin keys are written to the shared cache.
+    """
+
+    def test_no_pin_without_replica(self):
+        me = User.objects.create(username="pin-user")
+        response = client_for(me).post("/api/leagues/", {"name": "No pin"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(cache.get(f"replica-pin:{me.id}"))
+
+
+# --------------------------
+# Query parameters
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class LeaderboardParamTests(TestCase):
+    """
+    A malformed ?competition= is a 400, not a 500, on every leaderboard endpoint.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = User.objects.create(username="param-user")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_non_numeric_competition(self):
+        client = client_for(self.me)
+        for url in (
+            "/api/scores/?competition=abc",
+            "/api/scores/?competition=abc&page=1&limit=20",
+            "/api/scores/?competition=abc&around=me",
+            "/api/scores/history/?competition=abc",
+            "/api/scores/movement/?competition=abc",
+            "/api/scores/win-probability/?competition=abc",
+        ):
+            with self.subTest(url):
+                self.assertEqual(client.get(url).status_code, 400)
+
+    def test_unknown_competition(self):
+        client = client_for(self.me)
+        for url in ("/api/scores/?competition=999999", "/api/scores/?competition=999999&page=1"):
+            with self.subTest(url):
+                self.assertEqual(client.get(url).status_code, 404)
+
+
+# --------------------------
+# Parsers
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class MessagePackParserTests(TestCase):
+    """
+    Malformed MessagePack bodies are a 400, whatever msgpack raises.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me = User.objects.create(username="msgpack-user")
+
+    def test_malformed_bodies(self):
+        client = client_for(self.me)
+        for name, body in (
+            ("truncated", b"\x82\xa4name"),
+            ("extra data", msgpack.packb({"name": "x"}) + b"\x01"),
+            ("reserved type", b"\xc1"),
+            ("unhashable key", b"\x81\x91\x01\x01"),
+        ):
+            with self.subTest(name):
+                response = client.post("/api/leagues/", body, content_type="application/msgpack")
+                self.assertEqual(response.status_code, 400)
+
+    def test_valid_body(self):
+        response = client_for(self.me).post(
+            "/api/leagues/", msgpack.packb({"name": "Packed"}), content_type="application/msgpack"
+        )
+        self.assertEqual(response.status_code, 201)
+
+
+# --------------------------
+# What-if and win probabilities
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class ScenarioTests(TestCase):
+    """
+    The what-if projection and the simulation score guesses from the
+    in-memory arrays of api/scenarios.py; any stored guess must fit them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(5)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_what_if_matches_the_scoring_rules(self):
+        me, game = self.data["me"], self.data["games"][-2]
+        guess = UserGuess.objects.get(user=me, match=game)
+        response = client_for(me).post("/api/scores/what-if/", {
+            "competition": self.data["competition"].id,
+            "scores": [{"match": game.id, "score_home": guess.guess_home, "score_away": guess.guess_away}],
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["me"]["gained"], 5)
+
+    def test_out_of_range_guesses(self):
+        me, game = self.data["me"], self.data["games"][-2]
+        # Stored before guesses were capped
+        UserGuess.objects.filter(user=me, match=game).update(guess_home=40000, guess_away=0)
+
+        response = client_for(me).post("/api/scores/what-if/", {
+            "competition": self.data["competition"].id,
+            "scores": [{"match": game.id, "score_home": 30, "score_away": 25}],
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        payload = simulate(self.data["competition"].id, 20, seed=1)
+        self.assertEqual(len(payload["results"]), 5)
+
+    def test_guesses_are_capped(self):
+        client, game = client_for(self.data["me"]), self.data["games"][-1]
+        response = client.post("/api/guesses/", {"match": game.id, "guess_home": 40000, "guess_away": 0})
+        self.assertEqual(response.status_code, 400)
+        response = client.post("/api/guesses/batch/", {
+            "items": [{"match": game.id, "guess_home": 40000, "guess_away": 0}],
+        }, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+# --------------------------
+# Read serializers
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class GamePayloadTests(TestCase):
+    """
+    A match reads the same from the read path (api.read_serializers) as it
+    does in the response to a staff write.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(2)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_write_response_matches_read(self):
+        game = self.data["games"][-1]
+        client = client_for(self.data["staff"])
+        written = client.patch(f"/api/matches/{game.id}/", {"score_home": 30, "score_away": 28}, format="json")
+        read = client.get(f"/api/matches/{game.id}/")
+        self.assertEqual(written.status_code, 200)
+        self.assertEqual(written.json(), read.json())
+
+
+# --------------------------
+# Conditional GET
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class ConditionalGetTests(TestCase):
+    """
+    A repeat GET with the ETag it was given gets a 304 without touching the
+    database; once the data behind it changes, the old ETag gets a 200
+    with a new one.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(3)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def assert_revalidates(self, url, change):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"stale", {etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return first, response
+
+    def score(self, game):
+        def change():
+            game.score_home, game.score_away = 30, 28
+            game.save()
+        return change
+
+    def test_leaderboard(self):
+        url = f"/api/scores/?competition={self.data['competition'].id}"
+        before, after = self.assert_revalidates(url, self.score(self.data["games"][-2]))
+        self.assertNotEqual(before.json(), after.json())
+
+    def test_leaderboard_page(self):
+        url = f"/api/scores/?competition={self.data['competition'].id}&page=1&limit=2"
+        self.assert_revalidates(url, self.score(self.data["games"][-2]))
+
+    def test_matches(self):
+        game = self.data["games"][-1]
+        url = f"/api/matches/{game.id}/"
+        _, after = self.assert_revalidates(url, self.score(game))
+        self.assertEqual((after.json()["score_home"], after.json()["score_away"]), (30, 28))
+
+    def test_etag_is_per_url(self):
+        competition = self.data["competition"].id
+        one = self.client.get(f"/api/scores/?competition={competition}&page=1&limit=2")
+        two = self.client.get(f"/api/scores/?competition={competition}&page=2&limit=2")
+        self.assertNotEqual(one["ETag"], two["ETag"])
+        response = self.client.get(
+            f"/api/scores/?competition={competition}&page=2&limit=2", HTTP_IF_NONE_MATCH=one["ETag"]
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+# --------------------------
+# Cursor pagination
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class CursorPaginationTests(TestCase):
+    """
+    Following `next` links visits every match and guess exactly once, in
+    the order of the unpaginated list, also across runs of games sharing a
+    kick-off and when games are added before the cursor mid-walk.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(2)
+        # Same kick-off as another game: the cursor needs its offset
+        games = cls.data["games"]
+        cls.same_time = Game.objects.bulk_create([
+            Game(team_home=cls.data["team"], team_away=games[i].team_away, match_date=games[20].match_date,
+                 group="A", venue="Arena", competition=cls.data["competition"])
+            for i in range(6)
+        ])
+        UserGuess.objects.bulk_create(
+            [UserGuess(user=cls.data["me"], match=game, guess_home=1, guess_away=0) for game in cls.same_time]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.data["me"])
+
+    def walk(self, url, during=None):
+        ids, page = [], self.client.get(url).json()
+        while True:
+            self.assertLessEqual(len(page["results"]), 7)
+            ids += [row["id"] for row in page["results"]]
+            if page["next"] is None:
+                return ids
+            if during is not None:
+                during()
+                during = None
+            page = self.client.get(page["next"]).json()
+
+    def test_matches(self):
+        url = f"/api/matches/?competition={self.data['competition'].id}"
+        expected = sorted(Game.objects.filter(competition=self.data["competition"]), key=lambda g: (g.match_date, g.id))
+        ids = self.walk(f"{url}&page_size=7")
+        self.assertEqual(ids, [game.id for game in expected])
+        self.assertEqual(sorted(ids), sorted(game["id"] for game in self.client.get(url).json()))
+
+    def test_guesses(self):
+        url = f"/api/guesses/?competition={self.data['competition'].id}"
+        expected = sorted(
+            UserGuess.objects.filter(user=self.data["me"]).select_related("match"),
+            key=lambda guess: (guess.match.match_date, guess.id),
+        )
+        ids = self.walk(f"{url}&page_size=7")
+        self.assertEqual(ids, [guess.id for guess in expected])
+        self.assertEqual(sorted(ids), sorted(guess["id"] for guess in self.client.get(url).json()))
+
+    def test_inserts_before_the_cursor_do_not_shift_pages(self):
+        url = f"/api/matches/?competition={self.data['competition'].id}"
+        expected = self.walk(f"{url}&page_size=7")
+
+        def insert():
+            Game.objects.create(
+                team_home=self.data["team"], team_away=self.data["team"],
+                match_date=self.data["games"][0].match_date - timedelta(days=1),
+                group="A", venue="Arena", competition=self.data["competition"],
+            )
+
+        self.assertEqual(self.walk(f"{url}&page_size=7", during=insert), expected)
+
+
+# --------------------------
+# ASGI profile
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class AsyncParityTests(TestCase):
+    """
+    The async views of the ASGI profile (api/async_views.py) answer exactly
+    as the DRF views they stand in for.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(3)
+
+    def setUp(self):
+        cache.clear()
+
+    async def test_same_responses(self):
+        c = self.data["competition"].id
+        for url in (
+            f"/api/scores/?competition={c}",
+            "/api/scores/?competition=abc",
+            "/api/scores/?competition=999999",
+            "/api/scores/?competition=",
+            f"/api/matches/?competition={c}",
+            "/api/matches/?competition=abc",
+            "/api/matches/?competition=999999",
+        ):
+            with self.subTest(url):
+                drf = await self.async_client.get(url)
+                with override_settings(ROOT_URLCONF="peyjabankinn.asgi_urls"):
+                    asgi = await self.async_client.get(url)
+                self.assertEqual(asgi.status_code, drf.status_code)
+                self.assertEqual(asgi.content, drf.content)
+
+
+# --------------------------
+# Reference data
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class ReferenceDataTests(TestCase):
+    """
+    Per-competition payloads are only kept in process memory for
+    competitions that exist, so clients can't grow them with made-up ids.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(2)
+
+    def setUp(self):
+        cache.clear()
+        warm()
+
+    def test_unknown_competitions_are_not_kept(self):
+        client = client_for(self.data["me"])
+        kept = set(reference._payloads)
+        for competition_id in range(900000, 900010):
+            with self.subTest(competition_id):
+                response = client.get(f"/api/matches/?competition={competition_id}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), [])
+        self.assertEqual(set(reference._payloads), kept)
+
+    def test_unknown_competitions_get_no_catalog(self):
+        client = client_for(self.data["me"])
+        for competition_id in range(900000, 900010):
+            with self.subTest(competition_id):
+                response = client.get(f"/api/bonus-questions/?competition={competition_id}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), [])
+                version = current_version(None, "bonus-questions")
+                self.assertIsNone(cache.get(f"bonus-catalog:{competition_id}:{version}"))
+
+    def test_known_competition(self):
+        c = self.data["competition"].id
+        response = client_for(self.data["me"]).get(f"/api/matches/?competition={c}")
+        self.assertEqual([game["id"] for game in response.json()], [game.id for game in self.data["games"]])
+
+
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class WinProbabilityTests(TestCase):
+    """
+    The endpoint never simulates: it serves what simulate_competition
+    stored, marked stale once a result has come in since.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(3)
+
+    def setUp(self):
+        cache.clear()
+        self.url = f"/api/scores/win-probability/?competition={self.data['competition'].id}"
+
+    def simulate(self, *args):
+        call_command(
+            "simulate_competition", *args, "--simulations", "20", "--processes", "1", "--seed", "1",
+            stdout=StringIO(),
+        )
+
+    def test_served_from_the_command(self):
+        client = client_for(self.data["me"])
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response)
+
+        self.simulate("--competition_id", str(self.data["competition"].id))
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(response.json()["simulations"], 20)
+
+        game = self.data["games"][-1]
+        with self.captureOnCommitCallbacks(execute=True):
+            game.score_home, game.score_away = 30, 28
+            game.save()
+        self.assertEqual(client.get(self.url)["X-Cache"], "STALE")
+
+    def test_max_age_skips_fresh_payloads(self):
+        self.simulate("--all", "--max-age", "600")
+        computed_at = client_for(None).get(self.url).json()["computed_at"]
+
+        self.simulate("--all", "--max-age", "600")
+        self.assertEqual(client_for(None).get(self.url).json()["computed_at"], computed_at)
+        self.simulate("--all")
+        self.assertNotEqual(client_for(None).get(self.url).json()["computed_at"], computed_at)
+
+
+# --------------------------
+# Live events
+# --------------------------
+class BrokerTests(SimpleTestCase):
+    """
+    One watcher per process fans each event out to every subscriber of
+    the competition (api/events.py).
+    """
+
+    async def test_fan_out(self):
+        broker = Broker()
+        with patch("api.events._changes", return_value=[]), patch("api.events.POLL_INTERVAL", 0.01):
+            first, second, other = broker.subscribe(1), broker.subscribe(1), broker.subscribe(2)
+            self.assertEqual(broker.publish(1, b"event"), 2)
+            self.assertEqual(first.queue.get_nowait(), b"event")
+            self.assertEqual(second.queue.get_nowait(), b"event")
+            self.assertTrue(other.queue.empty())
+
+            for _ in range(SUBSCRIBER_BUFFER + 1):
+                broker.publish(2, b"event")
+            self.assertTrue(other.overflowed)
+
+            for subscription in (first, second, other):
+                broker.unsubscribe(subscription)
+            self.assertEqual(dict(broker.subscriptions), {})
+            # The watcher ends with the last subscriber
+            await asyncio.wait_for(broker._watcher, 2)
+
+    async def test_watcher_survives_errors(self):
+        broker = Broker()
+        changes = [RuntimeError("cache down"), [b"event"]]
+
+        def _changes(competition_id, seen):
+            result = changes.pop(0) if changes else []
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with patch("api.events._changes", _changes), patch("api.events.POLL_INTERVAL", 0.01), \
+                self.assertLogs("api.events", level="ERROR"):
+            subscription = broker.subscribe(1)
+            try:
+                self.assertEqual(await asyncio.wait_for(subscription.queue.get(), 2), b"event")
+                self.assertFalse(broker._watcher.done())
+            finally:
+                broker.unsubscribe(subscription)
+                await asyncio.wait_for(broker._watcher, 2)
+
+
+# --------------------------
+# Delta sync
+# --------------------------
+@override_settings(CACHES=LOCMEM_CACHE, DATABASES=NO_REPLICA, SECURE_SSL_REDIRECT=False)
+class DeltaSyncTests(TestCase):
+    """
+    ?since= returns what changed and what left the list since a token,
+    and 410 for tokens older than the tombstones are kept.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        random.seed(2026)
+        cls.data = seed_competition(2)
+        cls.other = Competition.objects.create(short_name="Other", name="Other", start_date=timezone.now())
+
+    def setUp(self):
+        cache.clear()
+        self.client = client_for(self.data["me"])
+        self.since = make_token(timezone.now() - timedelta(minutes=1))
+
+    def sync(self, url):
+        response = self.client.get(f"{url}&since={self.since}" if "?" in url else f"{url}?since={self.since}")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        return {row["id"] for row in body["results"]}, set(body["deleted"])
+
+    def test_deleted_game(self):
+        game = self.data["games"][-1]
+        game_id = game.id
+        game.delete()
+        results, deleted = self.sync(f"/api/matches/?competition={self.data['competition'].id}")
+        self.assertIn(game_id, deleted)
+        self.assertNotIn(game_id, results)
+
+    def test_moved_game(self):
+        game = self.data["games"][-2]
+        guess = UserGuess.objects.get(user=self.data["me"], match=game)
+        game.competition = self.other
+        game.save()
+
+        results, deleted = self.sync(f"/api/matches/?competition={self.data['competition'].id}")
+        self.assertIn(game.id, deleted)
+        results, deleted = self.sync(f"/api/matches/?competition={self.other.id}")
+        self.assertEqual((results, deleted), ({game.id}, set()))
+        results, deleted = self.sync("/api/matches/")
+        self.assertIn(game.id, results)
+        self.assertNotIn(game.id, deleted)
+
+        results, deleted = self.sync(f"/api/guesses/?competition={self.data['competition'].id}")
+        self.assertIn(guess.id, deleted)
+        results, deleted = self.sync(f"/api/guesses/?competition={self.other.id}")
+        self.assertEqual((results, deleted), ({guess.id}, set()))
+
+    def test_expired_token_beats_the_etag(self):
+        expired = make_token(timezone.now() - timedelta(days=31))
+        for url in (f"/api/matches/?since={expired}", f"/api/guesses/?since={expired}"):
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH="*").status_code, 410)
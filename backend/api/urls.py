@@ -1,12 +1,21 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+
+from .events import competition_events
 from .views import (
     BonusChoicesViewSet,
     BonusQuestionViewSet,
     BonusQuestionChoicesViewSet,
     CompetitionViewSet,
     GameViewSet,
+    LeagueViewSet,
+    matchday_dashboard,
     leaderboard,
+    leaderboard_cache_stats,
+    leaderboard_history,
+    leaderboard_movement,
+    leaderboard_what_if,
+    leaderboard_win_probability,
     TeamViewSet,
     UserBonusAnswerViewSet,
     UserGuessViewSet,
@@ -21,9 +30,17 @@ router.register("bonus-questions", BonusQuestionViewSet)
 router.register("bonus-question-choices", BonusQuestionChoicesViewSet)
 router.register("bonus-answers", UserBonusAnswerViewSet, basename="bonus-answers")
 router.register(r"competitions", CompetitionViewSet, basename="competition")
+router.register(r"leagues", LeagueViewSet, basename="league")
 
 urlpatterns = [
     path('', include(router.urls)),
+    path("competitions/<int:competition_id>/events/", competition_events),
+    path("dashboard/", matchday_dashboard),
     path("scores/", leaderboard),
+    path("scores/cache-stats/", leaderboard_cache_stats),
+    path("scores/history/", leaderboard_history),
+    path("scores/movement/", leaderboard_movement),
+    path("scores/what-if/", leaderboard_what_if),
+    path("scores/win-probability/", leaderboard_win_probability),
 ]
 
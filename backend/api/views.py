@@ -1,14 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.db.models import (
-    F,
-    Case,
-    When,
-    IntegerField,
-    Value,
-    Count,
-    Sum
-)
+from django.db.models import Count, F
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 from django_filters.rest_framework import DjangoFilterBackend
 
@@ -17,7 +10,11 @@ from rest_framework.decorators import (
     api_view,
     permission_classes,
 )
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import (
+    NotAuthenticated,
+    PermissionDenied,
+    ValidationError,
+)
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import (
@@ -25,55 +22,154 @@ from rest_framework import (
     permissions,
 )
 
+from accounts.serializers import UserSerializer
 from api.filters import (
     BonusQuestionFilter,
     GameFilter,
     UserBonusAnswerFilter,
     UserGuessFilter,
 )
+from api.batch import upsert_bonus_answers, upsert_guesses
+from api.cache import cache_stats, cached_leaderboard, current_version
+from api.catalog import bonus_catalog
+from api.conditional import ConditionalGetMixin, conditional_response, make_etag
+from api.crowd import game_stats, question_stats
+from api.fieldsets import SparseFieldsetMixin
+from api.history import movement, user_timeline
+from api.locks import match_lock, question_lock
+from api.pagination import ScheduleCursorPagination
 from api.models import (
     BonusChoices,
     BonusQuestion,
     BonusQuestionChoices,
     Competition,
     Game,
+    GameCrowdStats,
+    League,
     Team,
+    Tombstone,
     UserBonusAnswer,
     UserGuess,
 )
 from api.serializers import (
+    BonusAnswerBatchSerializer,
     BonusChoicesSerializer,
+    BonusQuestionCrowdStatsSerializer,
     BonusQuestionSerializer,
     BonusQuestionChoicesSerializer,
     CompetitionSerializer,
+    GameCrowdStatsSerializer,
     GameSerializer,
+    GuessBatchSerializer,
+    JoinLeagueSerializer,
+    LeagueSerializer,
+    ScenarioSerializer,
     TeamSerializer,
     UserBonusAnswerSerializer,
-    UserGuessSerializer,
     UserGuessCreateSerializer,
 )
+from api.ranking import get_rank_index
+from api.read_serializers import (
+    BonusAnswerReadSerializer,
+    BonusQuestionChoiceReadSerializer,
+    GameReadSerializer,
+    GuessReadSerializer,
+)
+from api.reference import (
+    ReferenceDataMixin,
+    competition_payload,
+    schedule_payload,
+    team_payload,
+)
+from api.routers import ReplicaReadMixin, use_replica_for
+from api.scenarios import get_competition_guesses, rank
+from api.simulation import cached_probabilities
+from api.standings import leaderboard_row, leaderboard_rows, standing_rows
+from api.sync import DeltaSyncMixin, make_token
 from api.permissions import (
     BeforeObjectDatePermission,
+    IsLeagueOwnerOrReadOnly,
     IsOwner,
     IsStaffOrReadOnly,
 )
 
 User = get_user_model()
 
-class TeamViewSet(viewsets.ReadOnlyModelViewSet):
+LEADERBOARD_PAGE_SIZE = 50
+LEADERBOARD_MAX_PAGE_SIZE = 200
+LEADERBOARD_MAX_RADIUS = 50
+
+class TeamViewSet(
+    ReplicaReadMixin, SparseFieldsetMixin, ConditionalGetMixin, ReferenceDataMixin, viewsets.ReadOnlyModelViewSet
+):
+    etag_scopes = ("teams",)
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
     permission_classes = [permissions.AllowAny]
-
-class GameViewSet(viewsets.ModelViewSet):
-    queryset = Game.objects.all().order_by('match_date')
+    reference_payload = staticmethod(team_payload)
+
+class GameViewSet(
+    ReplicaReadMixin,
+    SparseFieldsetMixin,
+    DeltaSyncMixin,
+    ConditionalGetMixin,
+    ReferenceDataMixin,
+    viewsets.ModelViewSet,
+):
+    etag_scopes = ("games", "teams")
+    tombstone_kind = Tombstone.GAME
+    queryset = Game.objects.select_related('team_home', 'team_away').order_by('match_date')
     serializer_class = GameSerializer
     permission_classes = [IsStaffOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_class = GameFilter
+    pagination_class = ScheduleCursorPagination
+    reference_payload = staticmethod(schedule_payload)
 
-class UserGuessViewSet(viewsets.ModelViewSet):
+    def get_serializer_class(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return GameReadSerializer
+        return GameSerializer
+
+    def reference_data(self, request):
+        if self.paginator.is_requested(request):
+            return None  # pages come straight from the database
+        competition_id = request.query_params.get("competition")
+        if competition_id is None:
+            return schedule_payload()
+        # Only known competitions get a payload kept in memory; the filter
+        # reports bad values and finds no games for unknown ids
+        if competition_id.isdigit() and int(competition_id) in competition_payload().by_id:
+            return schedule_payload(int(competition_id))
+        return None
+
+    @action(detail=True, methods=["get"], url_path="crowd")
+    def crowd(self, request, pk=None):
+        stats = game_stats(self.get_object())
+        if stats is None:
+            return Response({"error": "Guesses are hidden until the match starts"}, status=403)
+        return Response(GameCrowdStatsSerializer(stats).data)
+
+    @action(detail=False, methods=["get"], url_path="crowd")
+    def crowd_list(self, request):
+        """
+        Stats for every locked game matching the filters (e.g. ?competition=N).
+        """
+        games = self.filter_queryset(self.get_queryset()).filter(
+            match_date__lte=timezone.now()
+        ).select_related("crowd_stats")
+
+        stats = []
+        for game in games:
+            try:
+                stats.append(game.crowd_stats)
+            except GameCrowdStats.DoesNotExist:
+                stats.append(game_stats(game))
+        return Response(GameCrowdStatsSerializer(stats, many=True).data)
+
+class UserGuessViewSet(SparseFieldsetMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     queryset = UserGuess.objects.all()
+    tombstone_kind = Tombstone.GUESS
     permission_classes = [
         BeforeObjectDatePermission,
         permissions.IsAuthenticated,
@@ -81,29 +177,68 @@ class UserGuessViewSet(viewsets.ModelViewSet):
     ]
     filter_backends = [DjangoFilterBackend]
     filterset_class = UserGuessFilter
+    pagination_class = ScheduleCursorPagination
 
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return UserGuessCreateSerializer
-        return UserGuessSerializer
+        return GuessReadSerializer
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.fieldset.expands("match"):
+            context["matches"] = schedule_payload().by_id
+        return context
 
     def get_queryset(self):
-        return super().get_queryset().filter(user=self.request.user)
+        guesses = super().get_queryset().filter(user=self.request.user)
+        if self.paginator.is_requested(self.request):
+            guesses = guesses.annotate(match_date=F("match__match_date"))
+        return guesses
+
+    def get_tombstones(self, request):
+        return super().get_tombstones(request).filter(user_id=request.user.id)
 
     def perform_create(self, serializer):
         match = serializer.validated_data.get('match')
-        if timezone.now() > match.match_date:
+        lock = match_lock(match.id)
+        if timezone.now() > (lock.at if lock else match.match_date):
             raise PermissionDenied("Guesses are locked for this match")
         serializer.save(user=self.request.user)
 
-
-class BonusQuestionViewSet(viewsets.ModelViewSet):
-    queryset = BonusQuestion.objects.all().order_by("id").distinct()
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch(self, request):
+        """
+        Create or update many guesses at once: {"items": [{match, guess_home, guess_away}, ...]}.
+        Locked or unknown matches are reported per item; the rest are saved.
+        """
+        serializer = GuessBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({"results": upsert_guesses(request.user, serializer.validated_data["items"])})
+
+
+class BonusQuestionViewSet(ReplicaReadMixin, SparseFieldsetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    etag_scopes = ("bonus-questions",)
+    queryset = (
+        BonusQuestion.objects.select_related("correct_choice__choice")
+        .prefetch_related("available_question_choices__choice")
+        .order_by("id")
+    )
     serializer_class = BonusQuestionSerializer
     permission_classes = [IsStaffOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_class = BonusQuestionFilter
 
+    def list(self, request, *args, **kwargs):
+        # The per-competition list is served from the compiled catalog, for
+        # known competitions only so made-up ids don't fill the cache
+        competition_id = request.query_params.get("competition", "")
+        if not competition_id.isdigit() or int(competition_id) not in competition_payload().by_id:
+            return super().list(request, *args, **kwargs)
+        return conditional_response(
+            request, self.get_etag(request), lambda: Response(bonus_catalog(int(competition_id)))
+        )
+
     @action(detail=True, methods=["post"], permission_classes=[IsStaffOrReadOnly])
     def set_correct(self, request, pk=None):
         question = self.get_object()
@@ -119,14 +254,26 @@ class BonusQuestionViewSet(viewsets.ModelViewSet):
 
         return Response({"status": "correct answer saved"})
 
+    @action(detail=True, methods=["get"], url_path="crowd")
+    def crowd(self, request, pk=None):
+        stats = question_stats(self.get_object())
+        if stats is None:
+            return Response({"error": "Answers are hidden until the competition starts"}, status=403)
+        return Response(BonusQuestionCrowdStatsSerializer(stats).data)
+
 
-class CompetitionViewSet(viewsets.ReadOnlyModelViewSet):
+class CompetitionViewSet(
+    ReplicaReadMixin, SparseFieldsetMixin, ConditionalGetMixin, ReferenceDataMixin, viewsets.ReadOnlyModelViewSet
+):
+    etag_scopes = ("competitions",)
     queryset = Competition.objects.all()
     serializer_class = CompetitionSerializer
+    reference_payload = staticmethod(competition_payload)
 
 
-class UserBonusAnswerViewSet(viewsets.ModelViewSet):
+class UserBonusAnswerViewSet(SparseFieldsetMixin, DeltaSyncMixin, viewsets.ModelViewSet):
     serializer_class = UserBonusAnswerSerializer
+    tombstone_kind = Tombstone.BONUS_ANSWER
     filter_backends = [DjangoFilterBackend]
     filterset_class = UserBonusAnswerFilter
     permission_classes = [
@@ -135,13 +282,22 @@ class UserBonusAnswerViewSet(viewsets.ModelViewSet):
         BeforeObjectDatePermission,
     ]
 
+    def get_serializer_class(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return BonusAnswerReadSerializer
+        return UserBonusAnswerSerializer
+
     def get_queryset(self):
         return UserBonusAnswer.objects.filter(user=self.request.user)
 
+    def get_tombstones(self, request):
+        return super().get_tombstones(request).filter(user_id=request.user.id)
+
     def perform_create(self, serializer):
-        competition = serializer.validated_data["question"].competition
+        lock = question_lock(serializer.validated_data["question"].id)
+        lock_datetime = lock.at if lock else serializer.validated_data["question"].lock_datetime
 
-        if timezone.now() > competition.start_date:
+        if lock_datetime is not None and timezone.now() > lock_datetime:
             raise PermissionDenied("Bonus answers are locked once the competition starts.")
 
         serializer.save(user=self.request.user)
@@ -149,153 +305,342 @@ class UserBonusAnswerViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         serializer.save(user=self.request.user)  # ensure user doesn't change
 
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch(self, request):
+        """
+        Create or update many answers at once: {"items": [{question, answer}, ...]}.
+        Locked questions and invalid choices are reported per item; the rest are saved.
+        """
+        serializer = BonusAnswerBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response({"results": upsert_bonus_answers(request.user, serializer.validated_data["items"])})
+
 
-class BonusChoicesViewSet(viewsets.ModelViewSet):
+class LeagueViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    serializer_class = LeagueSerializer
+    permission_classes = [
+        permissions.IsAuthenticated,
+        IsLeagueOwnerOrReadOnly,
+    ]
+
+    def get_queryset(self):
+        return (
+            League.objects.annotate(member_count=Count("members"))
+            .filter(members=self.request.user)
+            .select_related("owner")
+            .order_by("id")
+        )
+
+    def perform_create(self, serializer):
+        league = serializer.save(owner=self.request.user)
+        league.members.add(self.request.user)
+
+    @action(detail=False, methods=["post"])
+    def join(self, request):
+        serializer = JoinLeagueSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            league = League.objects.get(invite_code=serializer.validated_data["invite_code"])
+        except League.DoesNotExist:
+            return Response({"error": "Invalid invite code"}, status=400)
+
+        league.members.add(request.user)
+        return Response(LeagueSerializer(self.get_queryset().get(pk=league.pk)).data)
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def leave(self, request, pk=None):
+        league = self.get_object()
+        if league.owner_id == request.user.id:
+            return Response({"error": "The owner can't leave; delete the league instead"}, status=400)
+
+        league.members.remove(request.user)
+        return Response({"status": "left league"})
+
+
+class BonusChoicesViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = BonusChoices.objects.all()
     serializer_class = BonusChoicesSerializer
     permission_classes = [IsStaffOrReadOnly]
 
 
-class BonusQuestionChoicesViewSet(viewsets.ModelViewSet):
-    queryset = BonusQuestionChoices.objects.all()
+class BonusQuestionChoicesViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = BonusQuestionChoices.objects.select_related("choice")
     serializer_class = BonusQuestionChoicesSerializer
     permission_classes = [IsStaffOrReadOnly]
 
+    def get_serializer_class(self):
+        if self.request.method in permissions.SAFE_METHODS:
+            return BonusQuestionChoiceReadSerializer
+        return BonusQuestionChoicesSerializer
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedOrReadOnly])
 def leaderboard(request):
     """
     Leaderboard including:
       - Match guessing points (0–5)
-      - Bonus questions (5 points per correct answer)
+      - Bonus questions (6 points per correct answer)
+
+    Served from the persisted Standing rows (see api.standings).
+
+    Optional modes, answered from the in-memory rank index (api.ranking):
+      - ?page=N&limit=M   one page of ranked rows
+      - ?around=me&radius=N   the caller's row and N neighbours either side
+
+    ?league=ID restricts the table to the members of one of the caller's leagues.
     """
 
+    use_replica_for(request, request.user)
     competition_id = request.query_params.get("competition")
+    if competition_id is not None:
+        if not competition_id.isdigit():
+            return Response({"error": "competition must be an id"}, status=400)
+        competition_id = int(competition_id)
+        # Keeps unknown ids out of the rank indexes and the cache
+        if competition_id not in competition_payload().by_id:
+            return Response({"error": "Unknown competition"}, status=404)
 
-    # --------------------------
-    # 1) MATCH GUESS SCORING (FILTERED)
-    # --------------------------
-    guesses = UserGuess.objects.all()
-
-    if competition_id:
-        guesses = guesses.filter(match__competition_id=competition_id)
-
-    guesses_with_points = guesses.annotate(
-        home_correct=Case(
-            When(guess_home=F('match__score_home'), then=Value(1)),
-            default=Value(0),
-            output_field=IntegerField()
-        ),
-        away_correct=Case(
-            When(guess_away=F('match__score_away'), then=Value(1)),
-            default=Value(0),
-            output_field=IntegerField()
-        ),
-        guess_diff=F('guess_home') - F('guess_away'),
-        real_diff=F('match__score_home') - F('match__score_away')
-    ).annotate(
-        result_correct=Case(
-            When(guess_diff__gt=0, real_diff__gt=0, then=Value(1)),
-            When(guess_diff__lt=0, real_diff__lt=0, then=Value(1)),
-            When(guess_diff=0, real_diff=0, then=Value(1)),
-            default=Value(0),
-            output_field=IntegerField()
-        )
-    ).annotate(
-        points=Case(
-            When(home_correct=1, away_correct=1, then=Value(5)),        # exact
-            When(result_correct=1, home_correct=1, then=Value(3)),      # result + one number
-            When(result_correct=1, away_correct=1, then=Value(3)),      # result + one number
-            When(result_correct=1, then=Value(1)),                      # correct result
-            default=Value(0),
-            output_field=IntegerField()
-        ),
-        one_score=Case(
-            When(result_correct=1, then=Case(
-                When(home_correct=1, away_correct=0, then=Value(1)),
-                When(home_correct=0, away_correct=1, then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField()
-            )),
-            default=Value(0),
-            output_field=IntegerField()
-        )
-    )
+    if "league" in request.query_params:
+        return _leaderboard_league(request, competition_id)
+    if "around" in request.query_params:
+        return _leaderboard_around(request, competition_id)
 
-    # --------------------------
-    # 2) AGGREGATE MATCH SCORES PER USER
-    # --------------------------
-    match_scores = guesses_with_points.values(
-        "user_id", "user__username"
-    ).annotate(
-        match_points=Sum("points"),
-        exact=Sum(Case(
-            When(home_correct=1, away_correct=1, then=1),
-            default=0,
-            output_field=IntegerField()
-        )),
-        one_score=Sum("one_score"),
-        total_guesses=Count("id"),
-        correct_results=Sum("result_correct"),
-    )
+    etag = make_etag(request, current_version(competition_id))
+    if "page" in request.query_params or "limit" in request.query_params:
+        return conditional_response(request, etag, lambda: _leaderboard_page(request, competition_id))
 
-    match_by_user = {row["user_id"]: row for row in match_scores}
+    def build():
+        data, status = cached_leaderboard(competition_id, leaderboard_rows)
+        response = Response(data)
+        response["X-Cache"] = status.name
+        response["Server-Timing"] = status.server_timing()
+        return response
 
-    # --------------------------
-    # 3) BONUS QUESTION SCORING (FILTERED)
-    # --------------------------
-    bonus_answers = UserBonusAnswer.objects.all()
+    return conditional_response(request, etag, build)
 
-    if competition_id:
-        bonus_answers = bonus_answers.filter(
-            question__competition_id=competition_id
-        )
 
-    bonus_scores = bonus_answers.annotate(
-        is_correct=Case(
-            When(answer=F("question__correct_choice"), then=Value(1)),
-            default=Value(0),
-            output_field=IntegerField()
-        ),
-        bonus_points=F("is_correct") * 6
-    ).values("user_id").annotate(
-        total_bonus_points=Sum("bonus_points"),
-        correct_bonus=Sum("is_correct"),
-        total_bonus=Count("id")
-    )
+def _int_param(request, name, default, minimum, maximum):
+    try:
+        value = int(request.query_params.get(name, default))
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+    return max(minimum, min(value, maximum))
 
-    bonus_by_user = {row["user_id"]: row for row in bonus_scores}
-
-    # --------------------------
-    # 4) MERGE MATCH + BONUS SCORES
-    # --------------------------
-    leaderboard_data = []
-
-    for user_id, m in match_by_user.items():
-
-        b = bonus_by_user.get(user_id, {
-            "total_bonus_points": 0,
-            "correct_bonus": 0,
-            "total_bonus": 0
-        })
-
-        total_points = m["match_points"] + b["total_bonus_points"]
-        leaderboard_data.append({
-            "user": m["user__username"],
-            "points": total_points,
-            "match_points": m["match_points"],
-            "bonus_points": b["total_bonus_points"],
-            "exact": m["exact"],
-            "one_score": m["one_score"],
-            "correct_bonus": b["correct_bonus"]
-        })
-
-    # --------------------------
-    # 5) SORT LEADERBOARD
-    # --------------------------
-    leaderboard_data.sort(
-        key=lambda x: (-x["points"], -x["exact"])
-    )
 
-    return Response(leaderboard_data)
+def _leaderboard_page(request, competition_id):
+    page = _int_param(request, "page", 1, 1, 10**6)
+    limit = _int_param(request, "limit", LEADERBOARD_PAGE_SIZE, 1, LEADERBOARD_MAX_PAGE_SIZE)
+
+    index = get_rank_index(competition_id)
+    return Response({
+        "count": index.count,
+        "page": page,
+        "limit": limit,
+        "results": index.slice((page - 1) * limit, limit),
+    })
 
+
+def _leaderboard_league(request, competition_id):
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+
+    league_id = request.query_params["league"]
+    leagues = League.objects.filter(id=league_id) if league_id.isdigit() else League.objects.none()
+    if not request.user.is_staff:
+        leagues = leagues.filter(members=request.user)
+    if not leagues.exists():
+        return Response({"error": "Unknown league"}, status=404)
+
+    return Response([leaderboard_row(row) for row in standing_rows(competition_id, league_id)])
+
+
+def _leaderboard_around(request, competition_id):
+    if request.query_params["around"] != "me":
+        raise ValidationError({"around": "Only 'me' is supported."})
+    if not request.user.is_authenticated:
+        raise NotAuthenticated()
+
+    radius = _int_param(request, "radius", 5, 0, LEADERBOARD_MAX_RADIUS)
+
+    index = get_rank_index(competition_id)
+    me, neighbours = index.around(request.user.id, radius)
+    return Response({
+        "count": index.count,
+        "me": me,
+        "results": neighbours,
+    })
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def leaderboard_cache_stats(request):
+    """
+    Hit/stale/miss counters and recompute timings of the leaderboard cache.
+    """
+    return Response(cache_stats())
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def leaderboard_history(request):
+    """
+    Points and rank after every finalised matchday for one user
+    (the caller, or ?user=<username>), read from StandingSnapshot.
+    """
+    competition_id = request.query_params.get("competition")
+    if not competition_id:
+        return Response({"error": "competition is required"}, status=400)
+    if not competition_id.isdigit():
+        return Response({"error": "competition must be an id"}, status=400)
+    competition_id = int(competition_id)
+
+    username = request.query_params.get("user")
+    if username:
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            return Response({"error": "Unknown user"}, status=404)
+    elif request.user.is_authenticated:
+        user = request.user
+    else:
+        return Response({"error": "user is required"}, status=400)
+
+    return Response({
+        "user": user.username,
+        "timeline": user_timeline(competition_id, user.id),
+    })
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def leaderboard_movement(request):
+    """
+    Current ranks with up/down movement since the previous matchday snapshot.
+    """
+    competition_id = request.query_params.get("competition")
+    if not competition_id:
+        return Response({"error": "competition is required"}, status=400)
+    if not competition_id.isdigit():
+        return Response({"error": "competition must be an id"}, status=400)
+    competition_id = int(competition_id)
+
+    return Response(movement(competition_id))
+
+
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+def leaderboard_what_if(request):
+    """
+    Projected leaderboard for hypothetical scores of unplayed games.
+    Nothing is written to the database.
+    """
+    serializer = ScenarioSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+
+    guesses = get_competition_guesses(data["competition"])
+    scores = {item["match"]: (item["score_home"], item["score_away"]) for item in data["scores"]}
+
+    try:
+        points, exact, gained = guesses.project(scores)
+    except KeyError as e:
+        raise ValidationError({"scores": f"Match {e.args[0]} is not an unplayed game of this competition."})
+
+    order, ranks = rank(points, exact, guesses.user_ids)
+
+    def row(position):
+        i = order[position]
+        return {
+            "rank": int(ranks[position]),
+            "user": guesses.usernames[i],
+            "points": int(points[i]),
+            "exact": int(exact[i]),
+            "gained": int(gained[i]),
+        }
+
+    me = None
+    positions = (guesses.user_ids[order] == request.user.id).nonzero()[0]
+    if len(positions):
+        me = row(positions[0])
+
+    return Response({
+        "count": len(order),
+        "me": me,
+        "results": [row(p) for p in range(min(data["limit"], len(order)))],
+    })
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def leaderboard_win_probability(request):
+    """
+    Each user's chance of finishing 1st / top 3 / top 10, from a Monte Carlo
+    simulation of the remaining games. Only served from what
+    `simulate_competition` stored (X-Cache: STALE once a result has come in
+    since); simulating takes far longer than a request may.
+    """
+    competition_id = request.query_params.get("competition")
+    if not competition_id:
+        return Response({"error": "competition is required"}, status=400)
+    if not competition_id.isdigit():
+        return Response({"error": "competition must be an id"}, status=400)
+    competition_id = int(competition_id)
+    if competition_id not in competition_payload().by_id:
+        return Response({"error": "Unknown competition"}, status=404)
+
+    payload, cache_status = cached_probabilities(competition_id)
+    if payload is None:
+        response = Response({"error": "Win probabilities haven't been computed yet, try again shortly"}, status=503)
+        response["Retry-After"] = "60"
+        return response
+
+    me = None
+    if request.user.is_authenticated:
+        me = next((row for row in payload["results"] if row["user"] == request.user.username), None)
+
+    response = Response({**payload, "me": me})
+    response["X-Cache"] = cache_status.name
+    return response
+
+
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def matchday_dashboard(request):
+    """
+    Everything the matches and bonus pages need for one competition in a
+    single response: the caller, all competitions, the schedule with teams,
+    the caller's guesses keyed by match id, the bonus questions with their
+    choices, the caller's answers keyed by question id and lock timestamps.
+    `sync_token` is the first ?since= token for polling matches/ and guesses/.
+    Runs a fixed number of queries regardless of the number of games.
+    """
+    competition_id = request.query_params.get("competition")
+    if not competition_id:
+        return Response({"error": "competition is required"}, status=400)
+
+    competitions = competition_payload()
+    competition = competitions.by_id.get(int(competition_id)) if competition_id.isdigit() else None
+    if competition is None:
+        return Response({"error": "Unknown competition"}, status=404)
+
+    guesses = UserGuess.objects.filter(user=request.user, match__competition_id=competition["id"])
+    answers = UserBonusAnswer.objects.filter(user=request.user, question__competition_id=competition["id"])
+
+    now = timezone.now()
+    return Response({
+        "me": UserSerializer(request.user).data,
+        "competitions": competitions.items,
+        "competition": competition,
+        "server_time": now,
+        "sync_token": make_token(now),
+        "bonus_lock": competition["start_date"],
+        "bonus_locked": now >= parse_datetime(competition["start_date"]),
+        "matches": schedule_payload(competition["id"]).items,
+        "guesses": {
+            guess["match"]: guess for guess in UserGuessCreateSerializer(guesses, many=True).data
+        },
+        "bonus_questions": bonus_catalog(competition["id"]),
+        "bonus_answers": {
+            answer["question"]: answer for answer in UserBonusAnswerSerializer(answers, many=True).data
+        },
+    })
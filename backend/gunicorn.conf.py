@@ -0,0 +1,33 @@
+"""
+Gunicorn settings, picked up automatically from the working directory.
+
+Two profiles serve the same API:
+
+- wsgi (default): sync workers running peyjabankinn.wsgi.
+- asgi: GUNICORN_PROFILE=asgi runs peyjabankinn.asgi under uvicorn
+  workers, with the async read views of api.async_views.
+
+`manage.py benchmark_server_profiles` compares them.
+"""
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "3"))
+
+if os.getenv("GUNICORN_PROFILE", "wsgi") == "asgi":
+    wsgi_app = "peyjabankinn.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "peyjabankinn.wsgi:application"
+
+
+def post_worker_init(worker):
+    # Fill the per-process reference data before the worker takes traffic
+    if os.getenv("WARM_REFERENCE_DATA", "1") != "1":
+        return
+    try:
+        from api.reference import warm
+
+        warm()
+    except Exception:
+        worker.log.exception("Reference data warmup failed; continuing cold")
@@ -3,6 +3,15 @@ ASGI config for peyjabankinn project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+It serves the long-lived Server-Sent Events streams (api.events), which
+would otherwise tie up a sync worker per client:
+
+    uvicorn peyjabankinn.asgi:application --host 0.0.0.0 --port 8001
+
+and the whole API in the ASGI profile (GUNICORN_PROFILE=asgi, see
+gunicorn.conf.py), where the busiest read endpoints are answered by the
+async views in api.async_views (routed by peyjabankinn.asgi_urls).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +21,6 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'peyjabankinn.settings')
+os.environ.setdefault('DJANGO_ROOT_URLCONF', 'peyjabankinn.asgi_urls')
 
 application = get_asgi_application()
@@ -0,0 +1,15 @@
+"""
+URLs for the ASGI profile: the async read views (api.async_views) in
+front of the regular URLconf, which serves everything else.
+"""
+from django.urls import path
+
+from api import async_views
+from peyjabankinn import urls
+
+urlpatterns = [
+    path('api/auth/me/', async_views.me),
+    path('api/scores/', async_views.leaderboard),
+    path('api/matches/', async_views.matches),
+    path('api/competitions/', async_views.competitions),
+] + urls.urlpatterns
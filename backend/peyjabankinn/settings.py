@@ -2,6 +2,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # --------------------
@@ -42,9 +44,11 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.routers.ReplicaRoutingMiddleware',
 ]
 
-ROOT_URLCONF = 'peyjabankinn.urls'
+# peyjabankinn/asgi.py switches to peyjabankinn.asgi_urls
+ROOT_URLCONF = os.getenv('DJANGO_ROOT_URLCONF', 'peyjabankinn.urls')
 
 TEMPLATES = [
     {
@@ -77,6 +81,59 @@ DATABASES = {
     }
 }
 
+# Optional streaming replica. Safe-method reads of the leaderboard,
+# matches, teams, competitions and bonus questions go to it (see
+# api.routers); a user who wrote something reads from the primary for
+# REPLICA_PIN_SECONDS afterwards.
+if os.getenv('POSTGRES_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('POSTGRES_REPLICA_HOST'),
+        'PORT': os.getenv('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', '10'))
+
+# --------------------
+# Cache
+# --------------------
+# locmem is per process; set CACHE_BACKEND to a shared backend (e.g.
+# django.core.cache.backends.redis.RedisCache with
+# CACHE_LOCATION=redis://redis:6379/0) so all gunicorn workers see the
+# same leaderboard payloads and versions.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'peyjabankinn'),
+    }
+}
+
+# Outside DEBUG the cache must be shared by all workers and have atomic
+# incr and add: the version counters (api.cache) are bumped with incr and
+# the recompute lock is taken with add. locmem is per process, and the
+# file backend reads, modifies and rewrites a file, so concurrent bumps
+# can be lost and two workers can both take the lock.
+ATOMIC_SHARED_CACHES = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+)
+if not DEBUG and CACHES['default']['BACKEND'] not in ATOMIC_SHARED_CACHES:
+    raise ImproperlyConfigured(
+        'CACHE_BACKEND must be redis or memcached when DEBUG is off, not %s' % CACHES['default']['BACKEND']
+    )
+
+# The file and locmem backends cull a third of their entries once they
+# hold MAX_ENTRIES (300 by default), version counters included. Other
+# backends pass OPTIONS to their client, so only set it for these two.
+if CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '100000'))}
+
 # --------------------
 # Password validation
 # --------------------
@@ -113,7 +170,18 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.ORJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.ORJSONParser',
+        'api.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -182,3 +250,39 @@ SECURE_HSTS_PRELOAD = True
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'SAMEORIGIN'
+
+
+# --------------------
+# Worker profile
+# --------------------
+# DJANGO_PROFILE=api is for worker pools that only serve /api/ to the
+# React app over JWT: no admin, import-export, sessions, messages, CSRF
+# or browsable API. The admin runs from a separate pool on the default
+# "full" profile. `manage.py report_worker_footprint` compares the two.
+DJANGO_PROFILE = os.getenv('DJANGO_PROFILE', 'full')
+
+if DJANGO_PROFILE == 'api':
+    ADMIN_ONLY_APPS = {
+        'django.contrib.admin',
+        'django.contrib.sessions',
+        'django.contrib.messages',
+        'django.contrib.staticfiles',
+        'import_export',
+    }
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS]
+
+    MIDDLEWARE = [
+        'corsheaders.middleware.CorsMiddleware',
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.common.CommonMiddleware',
+        'api.routers.ReplicaRoutingMiddleware',
+    ]
+
+    TEMPLATES[0]['OPTIONS']['context_processors'] = [
+        'django.template.context_processors.request',
+    ]
+
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'api.renderers.ORJSONRenderer',
+        'api.renderers.MessagePackRenderer',
+    )
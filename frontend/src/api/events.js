@@ -0,0 +1,17 @@
+// src/api/events.js
+import api from "./client";
+
+// Live score and standings events for a competition (Server-Sent Events).
+// `handlers` maps event names ("score", "standings") to callbacks that get
+// the parsed payload. Returns a function that closes the stream.
+export function subscribeToCompetition(competitionId, handlers) {
+  const source = new EventSource(
+    `${api.defaults.baseURL}competitions/${competitionId}/events/`
+  );
+
+  Object.entries(handlers).forEach(([name, handler]) => {
+    source.addEventListener(name, (event) => handler(JSON.parse(event.data)));
+  });
+
+  return () => source.close();
+}
@@ -4,6 +4,8 @@ import api from '../api/client';
 
 export default function AdminScores() {
   const [matches, setMatches] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [saving, setSaving] = useState({});
   const [loading, setLoading] = useState(true);
   const [authorized, setAuthorized] = useState(false);
@@ -35,8 +37,9 @@ export default function AdminScores() {
 
     const fetchMatches = async () => {
       try {
-        const res = await api.get('matches/');
-        setMatches(res.data);
+        const res = await api.get('matches/', { params: { page_size: 100 } });
+        setMatches(res.data.results);
+        setNextPage(res.data.next);
       } catch (err) {
         console.error(err.response?.data || err.message);
       }
@@ -45,6 +48,20 @@ export default function AdminScores() {
     fetchMatches();
   }, [authorized]);
 
+  const loadMore = async () => {
+    if (!nextPage) return;
+    setLoadingMore(true);
+    try {
+      const res = await api.get(nextPage);
+      setMatches(prev => [...prev, ...res.data.results]);
+      setNextPage(res.data.next);
+    } catch (err) {
+      console.error(err.response?.data || err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleChange = (matchId, field, value) => {
     setMatches(prev =>
       prev.map(m =>
@@ -165,6 +182,18 @@ export default function AdminScores() {
           </div>
         </div>
       ))}
+
+      {nextPage && (
+        <div className="text-center mt-4">
+          <button
+            onClick={loadMore}
+            disabled={loadingMore}
+            className="px-3 py-1 text-sm bg-gray-200 rounded disabled:text-gray-400"
+          >
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
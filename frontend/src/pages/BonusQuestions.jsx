@@ -14,34 +14,21 @@ export default function BonusQuestions() {
   const [error, setError] = useState(null);
   const [competitionStartDate, setCompetitionStartDate] = useState(null);
 
-  // Load competition start date
-  const loadCompetitionInfo = async () => {
-    if (!selectedCompetition) return;
-    try {
-      const res = await api.get(`competitions/${selectedCompetition}/`);
-      setCompetitionStartDate(parseISO(res.data.start_date));
-    } catch (err) {
-      console.error(err);
-    }
-  };
-
   const loadQuestions = async () => {
     if (!selectedCompetition) return;
     setLoading(true);
     setError(null);
 
     try {
-      const [questionsRes, answersRes] = await Promise.all([
-        api.get(`bonus-questions/?competition=${selectedCompetition}`),
-        api.get(`bonus-answers/?competition=${selectedCompetition}`)
-      ]);
+      const res = await api.get(`dashboard/?competition=${selectedCompetition}`);
 
       const answerMap = {};
-      answersRes.data.forEach(ans => {
+      Object.values(res.data.bonus_answers).forEach(ans => {
         answerMap[ans.question] = { answerId: ans.id, choiceId: ans.answer };
       });
 
-      setQuestions(questionsRes.data);
+      setCompetitionStartDate(parseISO(res.data.bonus_lock));
+      setQuestions(res.data.bonus_questions);
       setAnswers(answerMap);
     } catch (err) {
       setError(t("bonus.submitError"));
@@ -54,7 +41,6 @@ export default function BonusQuestions() {
     setQuestions([]);
     setAnswers({});
     setError(null);
-    loadCompetitionInfo();
     loadQuestions();
   }, [selectedCompetition]);
 
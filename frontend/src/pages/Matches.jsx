@@ -1,5 +1,6 @@
 import { useEffect, useState, useRef } from "react";
 import api from "../api/client";
+import { subscribeToCompetition } from "../api/events";
 import debounce from "lodash.debounce";
 import { useCompetition } from "../context/CompetitionContext";
 import { useTranslation } from "react-i18next";
@@ -15,6 +16,7 @@ export default function Matches() {
   const [saved, setSaved] = useState({});
   const debouncedRefs = useRef({});
   const guessesByMatchId = useRef({});
+  const syncToken = useRef(null);
   const randomScore = () => Math.floor(Math.random() * (35 - 25 + 1)) + 25;
 
   const isAfterKickoff = (match) => new Date(match.match_date) <= new Date();
@@ -57,19 +59,15 @@ export default function Matches() {
 
   const fetchMatchesAndGuesses = async (competitionId) => {
     try {
-      const [matchesRes, guessesRes] = await Promise.all([
-        api.get(`matches/?competition=${competitionId}`),
-        api.get(`guesses/?competition=${competitionId}`),
-      ]);
+      const res = await api.get(`dashboard/?competition=${competitionId}`);
+      syncToken.current = res.data.sync_token;
 
       guessesByMatchId.current = {};
-      guessesRes.data.forEach((guess) => {
-        const matchId =
-          typeof guess.match === "object" ? guess.match.id : guess.match;
-        guessesByMatchId.current[matchId] = guess;
+      Object.values(res.data.guesses).forEach((guess) => {
+        guessesByMatchId.current[guess.match] = guess;
       });
 
-      const merged = matchesRes.data.map((match) => {
+      const merged = res.data.matches.map((match) => {
         const guess = guessesByMatchId.current[match.id];
         return {
           ...match,
@@ -94,19 +92,30 @@ export default function Matches() {
     fetchMatchesAndGuesses(selectedCompetition);
 
     const interval = setInterval(async () => {
+      if (!syncToken.current) return;
       try {
         const res = await api.get(
-          `matches/?competition=${selectedCompetition}`
+          `matches/?competition=${selectedCompetition}&since=${syncToken.current}`
         );
+        syncToken.current = res.data.token;
+        if (res.data.results.length === 0 && res.data.deleted.length === 0) return;
+
+        const updates = {};
+        res.data.results.forEach((m) => {
+          updates[m.id] = m;
+        });
+        const deleted = new Set(res.data.deleted);
         setMatches((prev) =>
           prev
+            .filter((match) => !deleted.has(match.id))
             .map((match) => {
-              const updated = res.data.find((m) => m.id === match.id);
+              const updated = updates[match.id];
               if (!updated) return match;
               return {
                 ...match,
-                home_score: updated.home_score,
-                away_score: updated.away_score,
+                score_home: updated.score_home,
+                score_away: updated.score_away,
+                match_date: updated.match_date,
               };
             })
             .sort((a, b) =>
@@ -114,11 +123,31 @@ export default function Matches() {
             )
         );
       } catch (err) {
+        if (err.response?.status === 410) {
+          fetchMatchesAndGuesses(selectedCompetition);
+          return;
+        }
         console.error(err.response?.data || err.message);
       }
-    }, 15000);
+    }, 60000);
+
+    // Results arrive live; the poll above only catches what the stream missed
+    const unsubscribe = subscribeToCompetition(selectedCompetition, {
+      score: (event) => {
+        setMatches((prev) =>
+          prev.map((match) =>
+            match.id === event.match
+              ? { ...match, score_home: event.score_home, score_away: event.score_away }
+              : match
+          )
+        );
+      },
+    });
 
-    return () => clearInterval(interval);
+    return () => {
+      clearInterval(interval);
+      unsubscribe();
+    };
   }, [selectedCompetition]);
 
   useEffect(() => {
@@ -162,30 +191,52 @@ export default function Matches() {
     }, 1500);
   };
 
-  const fillRandomGuesses = () => {
+  const fillRandomGuesses = async () => {
     if (!window.confirm(t("matches.confirmFillRandom"))) return;
-    matches.forEach((match) => {
-      const homeEmpty = match.guess_home === "" || match.guess_home === null;
-      const awayEmpty = match.guess_away === "" || match.guess_away === null;
 
-      if (!homeEmpty && !awayEmpty) return;
+    const updates = matches
+      .filter((match) => !isAfterKickoff(match))
+      .filter((match) => match.guess_home === "" || match.guess_home === null ||
+        match.guess_away === "" || match.guess_away === null)
+      .map((match) => ({
+        match: match.id,
+        guess_home: match.guess_home === "" || match.guess_home === null
+          ? randomScore() : Number(match.guess_home),
+        guess_away: match.guess_away === "" || match.guess_away === null
+          ? randomScore() : Number(match.guess_away),
+      }));
+    if (updates.length === 0) return;
 
-      const updated = {
-        ...match,
-        guess_home: homeEmpty ? randomScore() : match.guess_home,
-        guess_away: awayEmpty ? randomScore() : match.guess_away,
-      };
+    try {
+      const res = await api.post("guesses/batch/", { items: updates });
+      const saved = {};
+      const failed = {};
+      res.data.results.forEach((result) => {
+        if (result.status === "saved") {
+          guessesByMatchId.current[result.match] = result.guess;
+          saved[result.match] = result.guess;
+        } else {
+          failed[result.match] = result.error || t("matches.errorSave");
+        }
+      });
 
       setMatches((prev) =>
-        prev.map((m) => (m.id === match.id ? updated : m))
+        prev.map((m) =>
+          saved[m.id]
+            ? {
+                ...m,
+                user_guess: saved[m.id],
+                guess_home: saved[m.id].guess_home,
+                guess_away: saved[m.id].guess_away,
+              }
+            : m
+        )
       );
-
-      if (!debouncedRefs.current[match.id]) {
-        debouncedRefs.current[match.id] = debounce(saveGuess, 500);
-      }
-
-      debouncedRefs.current[match.id](updated);
-    });
+      Object.keys(saved).forEach((matchId) => markSaved(Number(matchId)));
+      setErrors((prev) => ({ ...prev, ...failed }));
+    } catch (err) {
+      console.error(err.response?.data || err.message);
+    }
   };
 
   const saveGuess = async (match) => {
@@ -1,6 +1,7 @@
 import { useState, useRef, useEffect } from "react";
 import { useTranslation } from "react-i18next";
 import api from "../api/client";
+import { subscribeToCompetition } from "../api/events";
 import { useCompetition } from "../context/CompetitionContext";
 import { useAuth } from "../context/AuthContext";
 
@@ -25,9 +26,9 @@ export default function Scores() {
   };
 
   // Load scores
-  const loadScores = async () => {
+  const loadScores = async ({ quiet = false } = {}) => {
     if (!selectedCompetition) return;
-    setLoading(true);
+    if (!quiet) setLoading(true);
     try {
       const res = await api.get(`scores/?competition=${selectedCompetition}`);
       setScores(res.data);
@@ -43,6 +44,14 @@ export default function Scores() {
     loadScores();
   }, [selectedCompetition]);
 
+  // Reload the table in place whenever the standings change
+  useEffect(() => {
+    if (!selectedCompetition) return;
+    return subscribeToCompetition(selectedCompetition, {
+      standings: () => loadScores({ quiet: true }),
+    });
+  }, [selectedCompetition]);
+
   const myIndex = scores.findIndex((s) => s.user === currentUser);
 
   const scrollToMyCard = () => {